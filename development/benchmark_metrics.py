@@ -0,0 +1,129 @@
+"""Benchmark the collection of the hardware end of support metrics over a synthetic dataset.
+
+The dataset is created in a transaction rolled back at the end, so the benchmark can run against a development
+database without leaving objects behind.
+
+    python development/benchmark_metrics.py --inventory-items 200000 --runs 5
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import date
+
+import nautobot
+
+nautobot.setup()
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.contrib.contenttypes.models import ContentType  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, LocationType, Manufacturer  # noqa: E402
+from nautobot.extras.models import Role, Status  # noqa: E402
+
+from nautobot_device_lifecycle_mgmt.metrics import metrics_lcm_hw_end_of_support  # noqa: E402
+from nautobot_device_lifecycle_mgmt.models import HardwareLCM  # noqa: E402
+
+BATCH_SIZE = 5000
+
+
+class Rollback(Exception):
+    """Raised to roll back the synthetic dataset."""
+
+
+def create_dataset(inventory_item_count):
+    """Create the devices, inventory items and hardware notices of the synthetic dataset."""
+    device_ct = ContentType.objects.get_for_model(Device)
+    status, _ = Status.objects.get_or_create(name="Active")
+    status.content_types.add(device_ct, ContentType.objects.get_for_model(Location))
+    role = Role.objects.create(name="Benchmark Role")
+    role.content_types.add(device_ct)
+    location_type = LocationType.objects.create(name="Benchmark Location Type")
+    location_type.content_types.add(device_ct)
+    locations = Location.objects.bulk_create(
+        [
+            Location(name=f"benchmark-location-{index}", location_type=location_type, status=status)
+            for index in range(100)
+        ]
+    )
+    manufacturer = Manufacturer.objects.create(name="Benchmark Manufacturer")
+    device_types = DeviceType.objects.bulk_create(
+        [
+            DeviceType(manufacturer=manufacturer, model=f"benchmark-model-{index}", part_number=f"BM-{index}")
+            for index in range(50)
+        ]
+    )
+    devices = Device.objects.bulk_create(
+        [
+            Device(
+                name=f"benchmark-device-{index}",
+                device_type=device_types[index % len(device_types)],
+                location=locations[index % len(locations)],
+                role=role,
+                status=status,
+            )
+            for index in range(max(inventory_item_count // 100, 1))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    InventoryItem.objects.bulk_create(
+        (
+            InventoryItem(
+                device=devices[index % len(devices)],
+                name=f"benchmark-item-{index % 200}",
+                # One in ten inventory items has no part ID
+                part_id="" if index % 10 == 0 else f"benchmark-part-{index % 500}",
+            )
+            for index in range(inventory_item_count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    end_of_support = date(2020, 1, 1)
+    HardwareLCM.objects.bulk_create(
+        [HardwareLCM(device_type=device_type, end_of_support=end_of_support) for device_type in device_types[:10]]
+        + [HardwareLCM(inventory_item=f"benchmark-part-{index}", end_of_support=end_of_support) for index in range(50)]
+    )
+
+
+def collect():
+    """Collect the hardware end of support metrics, from the database even when the metrics snapshots are enabled."""
+    collector = getattr(metrics_lcm_hw_end_of_support, "__wrapped__", metrics_lcm_hw_end_of_support)
+    return sum(len(family.samples) for family in collector())
+
+
+def main():
+    """Create the dataset, run the benchmark and report the median of the measurements."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inventory-items", type=int, default=200000, help="Number of inventory items created.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of collections measured.")
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            start = time.perf_counter()
+            create_dataset(args.inventory_items)
+            print(f"Created {args.inventory_items} inventory items in {time.perf_counter() - start:.1f} s")
+
+            durations = []
+            for _ in range(args.runs):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    sample_count = collect()
+                    durations.append(time.perf_counter() - start)
+            print(f"Collection:  {statistics.median(durations):.3f} s (median of {args.runs} runs)")
+            print(f"Queries:     {len(queries)}")
+            print(f"Samples:     {sample_count}")
+            raise Rollback
+    except Rollback:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Benchmark the import time and resident memory of the Device Lifecycle Management app on startup.
+
+Every run starts a fresh Python process, which sets up Nautobot and imports the modules of the app loaded by the web
+server, the workers and the shell. Exits with status 1 if a threshold is exceeded or the plotting stack is imported.
+
+    python development/benchmark_startup.py --runs 5 --max-import-seconds 1 --max-rss-mb 400
+"""
+import argparse
+import json
+import statistics
+import subprocess  # nosec
+import sys
+
+APP_MODULE = "nautobot_device_lifecycle_mgmt"
+# Executed by every benchmarked process, prints the measurements as JSON
+MEASURE_STARTUP = f"""
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import nautobot
+
+nautobot.setup()
+import django
+
+django.setup()
+import {APP_MODULE}.api.urls
+import {APP_MODULE}.jobs
+import {APP_MODULE}.urls
+
+print(
+    json.dumps(
+        {{
+            "startup_seconds": time.perf_counter() - start,
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "plotting_modules": sorted(name for name in ("matplotlib", "numpy") if name in sys.modules),
+        }}
+    )
+)
+"""
+
+
+def get_app_import_seconds(importtime_output):
+    """Return the time spent importing the modules of the app and their dependencies, from `-X importtime` output.
+
+    The output lists every module after the modules it imports, indented by their import depth, so it's read in
+    reverse to know if a module is imported by a module of the app, whose time already includes it.
+    """
+    total_us = 0
+    # (depth, inside a module of the app) of the modules enclosing the current one
+    stack = []
+    for line in reversed(importtime_output.splitlines()):
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        inside_app = bool(stack) and stack[-1][1]
+        is_app = name == APP_MODULE or name.startswith(f"{APP_MODULE}.")
+        if is_app and not inside_app:
+            total_us += int(cumulative_us)
+        stack.append((depth, inside_app or is_app))
+
+    return total_us / 1_000_000
+
+
+def measure_startup():
+    """Return the measurements of the startup of a fresh Python process."""
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", MEASURE_STARTUP], capture_output=True, check=True, text=True
+    )
+    # Nautobot may log to stdout on setup, the measurements are printed last
+    measurements = json.loads(process.stdout.strip().splitlines()[-1])
+    measurements["app_import_seconds"] = get_app_import_seconds(process.stderr)
+
+    return measurements
+
+
+def main():
+    """Run the benchmark and report the median of the measurements."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of processes measured.")
+    parser.add_argument("--max-import-seconds", type=float, help="Fail if the median app import time is higher.")
+    parser.add_argument("--max-rss-mb", type=float, help="Fail if the median resident memory is higher.")
+    args = parser.parse_args()
+
+    runs = [measure_startup() for _ in range(args.runs)]
+    startup_seconds = statistics.median(run["startup_seconds"] for run in runs)
+    app_import_seconds = statistics.median(run["app_import_seconds"] for run in runs)
+    max_rss_mb = statistics.median(run["max_rss_mb"] for run in runs)
+    plotting_modules = sorted({name for run in runs for name in run["plotting_modules"]})
+    print(f"Startup:           {startup_seconds:.3f} s (median of {args.runs} runs)")
+    print(f"App import:        {app_import_seconds:.3f} s")
+    print(f"Resident memory:   {max_rss_mb:.1f} MB")
+    print(f"Plotting modules:  {', '.join(plotting_modules) or 'not imported'}")
+
+    failures = []
+    if plotting_modules:
+        failures.append(f"{', '.join(plotting_modules)} imported on startup")
+    if args.max_import_seconds is not None and app_import_seconds > args.max_import_seconds:
+        failures.append(f"app import time above {args.max_import_seconds} s")
+    if args.max_rss_mb is not None and max_rss_mb > args.max_rss_mb:
+        failures.append(f"resident memory above {args.max_rss_mb} MB")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
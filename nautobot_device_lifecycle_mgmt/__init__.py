@@ -25,6 +25,10 @@ class NautobotDeviceLifecycleManagementConfig(NautobotAppConfig):
         "barchart_bar_width": 0.1,
         "barchart_width": 12,
         "barchart_height": 5,
+        "chart_cache_size": 128,
+        "client_side_charts": True,
+        "lazy_load_panels": False,
+        "panel_cache_timeout": 60,
     }
     caching_config = {}
 
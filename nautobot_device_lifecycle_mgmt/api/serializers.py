@@ -1,5 +1,6 @@
 """API serializers implementation for the LifeCycle Management app."""
-from nautobot.apps.api import NautobotModelSerializer
+from nautobot.apps.api import BaseModelSerializer, NautobotModelSerializer
+from rest_framework import serializers
 
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
@@ -11,6 +12,7 @@ from nautobot_device_lifecycle_mgmt.models import (
     ProviderLCM,
     SoftwareImageLCM,
     SoftwareLCM,
+    SoftwareValidationSnapshot,
     ValidatedSoftwareLCM,
     VulnerabilityLCM,
 )
@@ -133,3 +135,22 @@ class InventoryItemSoftwareValidationResultSerializer(NautobotModelSerializer):
 
         model = InventoryItemSoftwareValidationResult
         fields = "__all__"
+
+
+class SoftwareValidationSnapshotSerializer(BaseModelSerializer):
+    """REST API serializer for SoftwareValidationSnapshot records."""
+
+    valid_percent = serializers.FloatField(read_only=True)
+
+    class Meta:
+        """Meta attributes."""
+
+        model = SoftwareValidationSnapshot
+        fields = "__all__"
+
+
+class SoftwareImageResolutionSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """REST API serializer for the batch resolution of software images."""
+
+    devices = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+    inventory_items = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
@@ -12,6 +12,7 @@ from nautobot_device_lifecycle_mgmt.api.views import (
     ProviderLCMView,
     SoftwareImageLCMViewSet,
     SoftwareLCMViewSet,
+    SoftwareValidationSnapshotViewSet,
     ValidatedSoftwareLCMViewSet,
     VulnerabilityLCMViewSet,
 )
@@ -29,6 +30,7 @@ router.register("cve", CVELCMViewSet)
 router.register("vulnerability", VulnerabilityLCMViewSet)
 router.register("device-validated-software-result", DeviceSoftwareValidationResultListViewSet)
 router.register("inventory-item-validated-software-result", InventoryItemSoftwareValidationResultListViewSet)
+router.register("software-validation-snapshot", SoftwareValidationSnapshotViewSet)
 
 app_name = "nautobot_device_lifecycle_mgmt"  # pylint: disable=invalid-name
 
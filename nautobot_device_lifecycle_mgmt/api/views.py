@@ -1,6 +1,20 @@
 """API Views implementation for the Lifecycle Management app."""
-from nautobot.apps.api import NautobotModelViewSet
-
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from nautobot.apps.api import NautobotModelViewSet, ReadOnlyModelViewSet
+from nautobot.dcim.models import Device, InventoryItem
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from nautobot_device_lifecycle_mgmt.charts import (
+    DEVICE_BAR_CHART_ATTRS,
+    INVENTORY_ITEM_BAR_CHART_ATTRS,
+    PIE_CHART_ATTRS,
+    get_barchart_data,
+    get_piechart_data,
+)
+from nautobot_device_lifecycle_mgmt.compliance_history import get_trend
 from nautobot_device_lifecycle_mgmt.filters import (
     ContactLCMFilterSet,
     ContractLCMFilterSet,
@@ -11,6 +25,7 @@ from nautobot_device_lifecycle_mgmt.filters import (
     ProviderLCMFilterSet,
     SoftwareImageLCMFilterSet,
     SoftwareLCMFilterSet,
+    SoftwareValidationSnapshotFilterSet,
     ValidatedSoftwareLCMFilterSet,
     VulnerabilityLCMFilterSet,
 )
@@ -24,9 +39,11 @@ from nautobot_device_lifecycle_mgmt.models import (
     ProviderLCM,
     SoftwareImageLCM,
     SoftwareLCM,
+    SoftwareValidationSnapshot,
     ValidatedSoftwareLCM,
     VulnerabilityLCM,
 )
+from nautobot_device_lifecycle_mgmt.report_aggregation import aggregate_validation_results
 
 from .serializers import (
     ContactLCMSerializer,
@@ -37,12 +54,28 @@ from .serializers import (
     InventoryItemSoftwareValidationResultSerializer,
     ProviderLCMSerializer,
     SoftwareImageLCMSerializer,
+    SoftwareImageResolutionSerializer,
     SoftwareLCMSerializer,
+    SoftwareValidationSnapshotSerializer,
     ValidatedSoftwareLCMSerializer,
     VulnerabilityLCMSerializer,
 )
 
 
+def get_chart_data(results_qs, group_field, bar_chart_attrs, name):
+    """Return the report aggregation, bar chart and pie chart data of the `results_qs` validation results."""
+    aggregation = aggregate_validation_results(results_qs, {"group": (group_field,)})
+    aggr = dict(aggregation["all"], name=name)
+    aggr["valid_percent"] = round(aggr["valid"] / aggr["total"] * 100, 2) if aggr["total"] else 0
+    group_aggr = sorted(aggregation["group"], key=lambda group: (-group["total"], str(group[group_field])))
+
+    return {
+        "aggregation": aggr,
+        "bar_chart": get_barchart_data(group_aggr, bar_chart_attrs),
+        "pie_chart": get_piechart_data(aggr, PIE_CHART_ATTRS),
+    }
+
+
 class HardwareLCMView(NautobotModelViewSet):
     """CRUD operations set for the Hardware Lifecycle Management view."""
 
@@ -90,6 +123,33 @@ class SoftwareImageLCMViewSet(NautobotModelViewSet):
     serializer_class = SoftwareImageLCMSerializer
     filterset_class = SoftwareImageLCMFilterSet
 
+    @extend_schema(request=SoftwareImageResolutionSerializer, responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["post"], url_path="resolve", permission_classes=[IsAuthenticated])
+    def resolve(self, request):  # pylint: disable=no-self-use
+        """Resolve software images for many devices and inventory items in one request.
+
+        Returns mapping of object ID to the list of software images resolved for it, for each of the object types.
+        Objects and images the user is not permitted to view are left out.
+        """
+        resolution = SoftwareImageResolutionSerializer(data=request.data)
+        resolution.is_valid(raise_exception=True)
+        software_images = SoftwareImageLCM.objects.restrict(request.user, "view")
+        serialized_images = {}
+
+        data = {}
+        for field_name, model in (("devices", Device), ("inventory_items", InventoryItem)):
+            items_qs = model.objects.restrict(request.user, "view").filter(pk__in=resolution.validated_data[field_name])
+            data[field_name] = {}
+            for item_pk, images in software_images.get_for_objects(items_qs).items():
+                for image in images:
+                    if image.pk not in serialized_images:
+                        serialized_images[image.pk] = SoftwareImageLCMSerializer(
+                            image, context={"request": request}
+                        ).data
+                data[field_name][str(item_pk)] = [serialized_images[image.pk] for image in images]
+
+        return Response(data)
+
 
 class ValidatedSoftwareLCMViewSet(NautobotModelViewSet):
     """REST API viewset for ValidatedSoftwareLCM records."""
@@ -128,6 +188,19 @@ class DeviceSoftwareValidationResultListViewSet(NautobotModelViewSet):
     # Disabling POST as these should only be created via Job.
     http_method_names = ["get", "head", "options"]
 
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["get"], url_path="chart-data")
+    def chart_data(self, request):
+        """Return the data of the software validation report charts, for the filtered results."""
+        return Response(
+            get_chart_data(
+                self.filter_queryset(self.get_queryset()),
+                "device__platform__name",
+                DEVICE_BAR_CHART_ATTRS,
+                "Devices",
+            )
+        )
+
 
 class InventoryItemSoftwareValidationResultListViewSet(NautobotModelViewSet):
     """REST API viewset for DeviceSoftwareValidationResult records."""
@@ -138,3 +211,30 @@ class InventoryItemSoftwareValidationResultListViewSet(NautobotModelViewSet):
 
     # Disabling POST as these should only be created via Job.
     http_method_names = ["get", "head", "options"]
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["get"], url_path="chart-data")
+    def chart_data(self, request):
+        """Return the data of the software validation report charts, for the filtered results."""
+        return Response(
+            get_chart_data(
+                self.filter_queryset(self.get_queryset()),
+                "inventory_item__manufacturer__name",
+                INVENTORY_ITEM_BAR_CHART_ATTRS,
+                "Inventory Items",
+            )
+        )
+
+
+class SoftwareValidationSnapshotViewSet(ReadOnlyModelViewSet):
+    """REST API viewset for SoftwareValidationSnapshot records."""
+
+    queryset = SoftwareValidationSnapshot.objects.select_related("content_type")
+    serializer_class = SoftwareValidationSnapshotSerializer
+    filterset_class = SoftwareValidationSnapshotFilterSet
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["get"], url_path="trend")
+    def trend(self, request):
+        """Return the compliance trend of the filtered snapshots, as a series of points per group."""
+        return Response(get_trend(self.filter_queryset(self.get_queryset())))
@@ -0,0 +1,265 @@
+"""Charts of the software validation reports and the in-process cache of the rendered charts.
+
+matplotlib and numpy are only imported when a chart is rendered by the server, so importing the app doesn't load
+the plotting stack in every web server, worker and shell process.
+"""
+import base64
+import io
+import threading
+import urllib
+from collections import OrderedDict
+
+from django.conf import settings
+
+from nautobot_device_lifecycle_mgmt.choices import SnapshotResolutionChoices
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+GREEN, RED, GREY = ("#D5E8D4", "#F8CECC", "#808080")
+TREND_COLOR = "#82B366"
+
+PIE_CHART_ATTRS = {
+    "aggr_labels": ["valid", "invalid", "no_software"],
+    "chart_labels": ["Valid", "Invalid", "No Software"],
+}
+VALIDATION_CHART_BARS = [
+    {"label": "Valid", "data_attr": "valid", "color": GREEN},
+    {"label": "Invalid", "data_attr": "invalid", "color": RED},
+    {"label": "No Software", "data_attr": "no_software", "color": GREY},
+]
+DEVICE_BAR_CHART_ATTRS = {
+    "label_accessor": "device__platform__name",
+    "ylabel": "Device",
+    "title": "Valid per Platform",
+    "chart_bars": VALIDATION_CHART_BARS,
+}
+INVENTORY_ITEM_BAR_CHART_ATTRS = {
+    "label_accessor": "inventory_item__manufacturer__name",
+    "ylabel": "Inventory Item",
+    "title": "Valid per Manufacturer",
+    "chart_bars": VALIDATION_CHART_BARS,
+}
+
+
+def get_barchart_data(qs, chart_attrs):  # pylint: disable=invalid-name
+    """Return the labels and series of a bar chart, rendered by the browser."""
+    return {
+        "title": chart_attrs["title"],
+        "ylabel": chart_attrs["ylabel"],
+        "labels": [item[chart_attrs["label_accessor"]] for item in qs],
+        "series": [
+            {
+                "label": chart_bar["label"],
+                "color": chart_bar["color"],
+                "data": [item[chart_bar["data_attr"]] for item in qs],
+            }
+            for chart_bar in chart_attrs["chart_bars"]
+        ],
+    }
+
+
+def get_piechart_data(aggr, pie_chart_attrs):
+    """Return the labels and values of a pie chart, rendered by the browser. None if there are no results."""
+    if aggr.get(pie_chart_attrs["aggr_labels"][0]) is None:
+        return None
+
+    return {
+        "title": aggr["name"],
+        "labels": pie_chart_attrs["chart_labels"],
+        "colors": [GREEN, RED, GREY][: len(pie_chart_attrs["aggr_labels"])],
+        "data": [aggr[aggr_label] for aggr_label in pie_chart_attrs["aggr_labels"]],
+    }
+
+
+def get_trend_chart_data(trend, label):
+    """Return the labels and series of the compliance trend line chart of a `get_trend` series, rendered by the browser.
+
+    None if there are no snapshots.
+    """
+    if not trend or not trend[0]["points"]:
+        return None
+
+    points = trend[0]["points"]
+    return {
+        "title": "Compliance over Time",
+        "ylabel": "Compliance (%)",
+        "labels": [
+            point["period_start"].strftime(
+                "%Y-%m-%d %H:%M" if point["resolution"] == SnapshotResolutionChoices.RUN else "%Y-%m-%d"
+            )
+            for point in points
+        ],
+        "series": [{"label": label, "color": TREND_COLOR, "data": [point["valid_percent"] for point in points]}],
+    }
+
+
+def url_encode_figure(figure):
+    """Save graph into string buffer and convert 64 bit code into image."""
+    buf = io.BytesIO()
+    figure.savefig(buf, format="png")
+    buf.seek(0)
+    string = base64.b64encode(buf.read())
+
+    return urllib.parse.quote(string)
+
+
+def plot_piechart_visual(aggr, pie_chart_attrs):
+    """Plot pie chart aggregation visual."""
+    if aggr[pie_chart_attrs["aggr_labels"][0]] is None:
+        return None
+
+    colors = [GREEN, RED, GREY]
+    sizes = []
+    pie_chart_labels = []
+    pie_chart_colors = []
+    for aggr_label, chart_label, color in zip(pie_chart_attrs["aggr_labels"], pie_chart_attrs["chart_labels"], colors):
+        if aggr[aggr_label] == 0:
+            continue
+        sizes.append(aggr[aggr_label])
+        pie_chart_labels.append(chart_label)
+        pie_chart_colors.append(color)
+
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+
+    explode = len(sizes) * (0.1,)
+    fig, axis = plt.subplots()
+    try:
+        axis.pie(
+            sizes,
+            explode=explode,
+            labels=pie_chart_labels,
+            autopct="%1.1f%%",
+            colors=pie_chart_colors,
+            shadow=True,
+            startangle=90,
+            normalize=True,
+        )
+        axis.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle.
+        axis.set_title(aggr["name"], y=-0.1)
+
+        return url_encode_figure(fig)
+    finally:
+        # Figures are kept by pyplot until closed
+        plt.close(fig)
+
+
+def plot_barchart_visual(qs, chart_attrs):  # pylint: disable=too-many-locals, invalid-name
+    """Construct report visual from queryset."""
+    # pylint: disable=import-outside-toplevel
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from matplotlib.ticker import MaxNLocator
+
+    labels = [item[chart_attrs["label_accessor"]] for item in qs]
+
+    label_locations = np.arange(len(labels))  # the label locations
+
+    barchart_bar_width = PLUGIN_CFG["barchart_bar_width"]
+    barchart_width = PLUGIN_CFG["barchart_width"]
+    barchart_height = PLUGIN_CFG["barchart_height"]
+
+    width = barchart_bar_width  # the width of the bars
+
+    fig, axis = plt.subplots(figsize=(barchart_width, barchart_height))
+    try:
+        rects = []
+        for bar_pos, chart_bar in enumerate(chart_attrs["chart_bars"]):
+            bar_label_item = [item[chart_bar["data_attr"]] for item in qs]
+            rects.append(
+                axis.bar(
+                    label_locations - width + (bar_pos * width),
+                    bar_label_item,
+                    width,
+                    label=chart_bar["label"],
+                    color=chart_bar["color"],
+                )
+            )
+
+        # Add some text for labels, title and custom x-axis tick labels, etc.
+        axis.set_ylabel(chart_attrs["ylabel"])
+        axis.set_title(chart_attrs["title"])
+        axis.set_xticks(label_locations)
+        axis.set_xticklabels(labels, rotation=0)
+        # Force integer y-axis labels
+        axis.yaxis.set_major_locator(MaxNLocator(integer=True))
+        axis.margins(0.2, 0.2)
+        axis.legend()
+
+        for bar_rects in rects:
+            # Attach a text label above each bar, displaying its height
+            for rect in bar_rects:
+                axis.annotate(
+                    f"{rect.get_height()}",
+                    xy=(rect.get_x() + rect.get_width() / 2, 0.5),
+                    xytext=(0, 3),  # 3 points vertical offset
+                    textcoords="offset points",
+                    ha="center",
+                    va="bottom",
+                    rotation=90,
+                )
+
+        return url_encode_figure(fig)
+    finally:
+        plt.close(fig)
+
+
+def get_chart_key(chart_name, filter_params, last_run):
+    """Return the cache key of a chart, the same for any order of the filter parameters and their values.
+
+    Args:
+        chart_name (str): Name of the chart
+        filter_params (dict): Filter parameters of the report, mapping of names to a value or a list of values
+        last_run (datetime): Last run of the report
+    """
+    normalized_params = []
+    for name, values in filter_params.items():
+        values = sorted(str(value) for value in (values if isinstance(values, (list, tuple)) else [values]) if value)
+        if values:
+            normalized_params.append((name, tuple(values)))
+
+    return (chart_name, tuple(sorted(normalized_params)), last_run.isoformat() if last_run else None)
+
+
+class ChartCache:
+    """Bounded least recently used cache of the rendered charts, shared by all requests served by the process.
+
+    Charts are keyed by `get_chart_key`, so a new report run or different filters render new charts while the least
+    recently used charts are evicted once `max_size` charts are cached. A `max_size` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size):
+        """Initialize ChartCache object."""
+        self.max_size = max_size
+        self._charts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached charts."""
+        return len(self._charts)
+
+    def get_or_render(self, key, render):
+        """Return the cached chart of `key`, calling `render` to render and cache it if it's not cached."""
+        with self._lock:
+            if key in self._charts:
+                self._charts.move_to_end(key)
+                return self._charts[key]
+
+        chart = render()
+        if self.max_size <= 0:
+            return chart
+
+        with self._lock:
+            self._charts[key] = chart
+            self._charts.move_to_end(key)
+            while len(self._charts) > self.max_size:
+                self._charts.popitem(last=False)
+
+        return chart
+
+    def clear(self):
+        """Remove all cached charts."""
+        with self._lock:
+            self._charts.clear()
+
+
+chart_cache = ChartCache(max_size=PLUGIN_CFG.get("chart_cache_size", 128))
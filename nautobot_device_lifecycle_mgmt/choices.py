@@ -74,10 +74,78 @@ class ReportRunTypeChoices(ChoiceSet):
 
     REPORT_SINGLE_OBJECT_RUN = "single-object-run"
     REPORT_FULL_RUN = "full-report-run"
+    REPORT_DELTA_RUN = "delta-report-run"
 
     CHOICES = (
         (REPORT_SINGLE_OBJECT_RUN, "Single Object Run"),
         (REPORT_FULL_RUN, "Full Report Run"),
+        (REPORT_DELTA_RUN, "Delta Report Run"),
+    )
+
+
+class ValidationSummaryGroupChoices(ChoiceSet):
+    """Choices for the attributes software validation results are summarized by."""
+
+    ALL = "all"
+    DEVICE_TYPE = "device_type"
+    PLATFORM = "platform"
+    LOCATION = "location"
+    ROLE = "role"
+    MANUFACTURER = "manufacturer"
+
+    CHOICES = (
+        (ALL, "All"),
+        (DEVICE_TYPE, "Device Type"),
+        (PLATFORM, "Platform"),
+        (LOCATION, "Location"),
+        (ROLE, "Role"),
+        (MANUFACTURER, "Manufacturer"),
+    )
+
+
+class SnapshotResolutionChoices(ChoiceSet):
+    """Choices for the resolution of the software validation snapshots, from the finest to the coarsest."""
+
+    RUN = "run"
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+    CHOICES = (
+        (RUN, "Run"),
+        (DAILY, "Daily"),
+        (WEEKLY, "Weekly"),
+        (MONTHLY, "Monthly"),
+    )
+
+
+class UpgradePlanStatusChoices(ChoiceSet):
+    """Choices for the status of the devices of the upgrade plans."""
+
+    UPGRADE = "upgrade"
+    DOWNGRADE = "downgrade"
+    NO_SOFTWARE = "no-software"
+    CURRENT = "current"
+    NO_TARGET = "no-target"
+
+    CHOICES = (
+        (UPGRADE, "Upgrade"),
+        (DOWNGRADE, "Downgrade"),
+        (NO_SOFTWARE, "No Current Software"),
+        (CURRENT, "Up to Date"),
+        (NO_TARGET, "No Validated Software"),
+    )
+
+
+class UpgradePlanFormatChoices(ChoiceSet):
+    """Choices for the output formats of the upgrade plans."""
+
+    JSON = "json"
+    CSV = "csv"
+
+    CHOICES = (
+        (JSON, "JSON"),
+        (CSV, "CSV"),
     )
 
 
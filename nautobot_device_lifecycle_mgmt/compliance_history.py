@@ -0,0 +1,180 @@
+"""Historical snapshots of the software validation summaries, downsampled and pruned as they age."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.models import SoftwareValidationSnapshot
+from nautobot_device_lifecycle_mgmt.report_aggregation import COUNT_NAMES
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+# Groups of the summaries recorded in the snapshots
+SNAPSHOT_GROUPS = (
+    choices.ValidationSummaryGroupChoices.ALL,
+    choices.ValidationSummaryGroupChoices.DEVICE_TYPE,
+    choices.ValidationSummaryGroupChoices.PLATFORM,
+    choices.ValidationSummaryGroupChoices.LOCATION,
+)
+# Resolutions from the finest to the coarsest, snapshots expiring from one are downsampled to the next
+RESOLUTIONS = (
+    choices.SnapshotResolutionChoices.RUN,
+    choices.SnapshotResolutionChoices.DAILY,
+    choices.SnapshotResolutionChoices.WEEKLY,
+    choices.SnapshotResolutionChoices.MONTHLY,
+)
+# Number of days the snapshots of each resolution are kept, None keeps them forever
+DEFAULT_SNAPSHOT_RETENTION = {
+    choices.SnapshotResolutionChoices.RUN: 7,
+    choices.SnapshotResolutionChoices.DAILY: 90,
+    choices.SnapshotResolutionChoices.WEEKLY: 730,
+    choices.SnapshotResolutionChoices.MONTHLY: None,
+}
+SNAPSHOT_BATCH_SIZE = 1000
+
+
+def get_snapshot_retention():
+    """Return the number of days the snapshots of each resolution are kept, from the `snapshot_retention` setting."""
+    return {**DEFAULT_SNAPSHOT_RETENTION, **PLUGIN_CFG.get("snapshot_retention", {})}
+
+
+def get_period_start(timestamp, resolution):
+    """Return the start of the day, week or month of `timestamp`, `timestamp` itself for the run resolution."""
+    if resolution == choices.SnapshotResolutionChoices.RUN:
+        return timestamp
+
+    period_start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == choices.SnapshotResolutionChoices.WEEKLY:
+        period_start -= timedelta(days=period_start.weekday())
+    elif resolution == choices.SnapshotResolutionChoices.MONTHLY:
+        period_start = period_start.replace(day=1)
+
+    return period_start
+
+
+def record_snapshots(summaries, last_run):
+    """Record the SoftwareValidationSummary objects of a validation run as snapshots of the run resolution."""
+    if timezone.is_naive(last_run):
+        last_run = timezone.make_aware(last_run)
+
+    SoftwareValidationSnapshot.objects.bulk_create(
+        [
+            SoftwareValidationSnapshot(
+                content_type=summary.content_type,
+                group_by=summary.group_by,
+                group_id=summary.group_id,
+                group_name=summary.group_name,
+                resolution=choices.SnapshotResolutionChoices.RUN,
+                period_start=last_run,
+                last_run=last_run,
+                **{count_name: getattr(summary, count_name) for count_name in COUNT_NAMES},
+            )
+            for summary in summaries
+            if summary.group_by in SNAPSHOT_GROUPS
+        ],
+        batch_size=SNAPSHOT_BATCH_SIZE,
+    )
+
+
+def _get_snapshot_key(snapshot, period_start):
+    """Return the key identifying the snapshots of the same group and period."""
+    return (snapshot.content_type_id, snapshot.group_by, snapshot.group_id, period_start)
+
+
+def _downsample(resolution, coarser_resolution, cutoff):
+    """Replace the snapshots of `resolution` older than `cutoff` with the last one of each `coarser_resolution` period.
+
+    A period already holding a snapshot of `coarser_resolution` keeps the snapshot of the most recent run.
+    """
+    expired = SoftwareValidationSnapshot.objects.filter(resolution=resolution, period_start__lt=cutoff)
+    points = {}
+    for snapshot in expired.order_by("last_run").iterator():
+        period_start = get_period_start(snapshot.period_start, coarser_resolution)
+        points[_get_snapshot_key(snapshot, period_start)] = snapshot
+    if not points:
+        return
+
+    existing = {
+        _get_snapshot_key(snapshot, snapshot.period_start): snapshot
+        for snapshot in SoftwareValidationSnapshot.objects.filter(
+            resolution=coarser_resolution, period_start__in={key[-1] for key in points}
+        )
+    }
+    created = []
+    updated = []
+    for key, snapshot in points.items():
+        point = existing.get(key)
+        if point is None:
+            point = SoftwareValidationSnapshot(
+                content_type_id=snapshot.content_type_id,
+                group_by=snapshot.group_by,
+                group_id=snapshot.group_id,
+                resolution=coarser_resolution,
+                period_start=key[-1],
+            )
+            created.append(point)
+        elif point.last_run < snapshot.last_run:
+            updated.append(point)
+        else:
+            continue
+        point.group_name = snapshot.group_name
+        point.last_run = snapshot.last_run
+        for count_name in COUNT_NAMES:
+            setattr(point, count_name, getattr(snapshot, count_name))
+
+    SoftwareValidationSnapshot.objects.bulk_create(created, batch_size=SNAPSHOT_BATCH_SIZE)
+    SoftwareValidationSnapshot.objects.bulk_update(
+        updated, ["group_name", "last_run", *COUNT_NAMES], batch_size=SNAPSHOT_BATCH_SIZE
+    )
+    expired.delete()
+
+
+def downsample_snapshots(now=None, retention=None):
+    """Downsample the snapshots past the retention of their resolution, and delete the expired monthly snapshots.
+
+    Args:
+        now (datetime): Time the retention is counted back from, defaults to the current time
+        retention (dict): Mapping of the resolutions to the number of days their snapshots are kept, None keeps them
+            forever, defaults to `get_snapshot_retention()`
+    """
+    now = now or timezone.now()
+    retention = retention or get_snapshot_retention()
+
+    with transaction.atomic():
+        for resolution, coarser_resolution in zip(RESOLUTIONS, RESOLUTIONS[1:]):
+            if retention[resolution] is not None:
+                _downsample(resolution, coarser_resolution, now - timedelta(days=retention[resolution]))
+
+        coarsest_resolution = RESOLUTIONS[-1]
+        if retention[coarsest_resolution] is not None:
+            SoftwareValidationSnapshot.objects.filter(
+                resolution=coarsest_resolution,
+                period_start__lt=now - timedelta(days=retention[coarsest_resolution]),
+            ).delete()
+
+
+def get_trend(snapshots_qs):
+    """Return the compliance trend of the snapshots, as a series of points per group ordered by time.
+
+    The snapshots of all resolutions are combined, downsampling leaves a single snapshot for any point in time.
+    """
+    series = {}
+    for snapshot in snapshots_qs.order_by("period_start"):
+        group_series = series.setdefault(
+            (snapshot.content_type_id, snapshot.group_by, snapshot.group_id),
+            {"group_by": snapshot.group_by, "group_id": snapshot.group_id, "group_name": "", "points": []},
+        )
+        # The group name of the most recent snapshot
+        group_series["group_name"] = snapshot.group_name
+        group_series["points"].append(
+            {
+                "period_start": snapshot.period_start,
+                "resolution": snapshot.resolution,
+                **{count_name: getattr(snapshot, count_name) for count_name in COUNT_NAMES},
+                "valid_percent": snapshot.valid_percent,
+            }
+        )
+
+    return list(series.values())
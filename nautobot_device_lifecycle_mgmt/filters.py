@@ -3,12 +3,16 @@ import datetime
 
 import django_filters
 from django.db.models import Q
-from nautobot.apps.filters import NautobotFilterSet, StatusModelFilterSetMixin
+from nautobot.apps.filters import BaseFilterSet, ContentTypeFilter, NautobotFilterSet, StatusModelFilterSetMixin
 from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, Manufacturer, Platform
 from nautobot.extras.filters.mixins import StatusFilter
 from nautobot.extras.models import Role, Tag
 
-from nautobot_device_lifecycle_mgmt.choices import CVESeverityChoices
+from nautobot_device_lifecycle_mgmt.choices import (
+    CVESeverityChoices,
+    SnapshotResolutionChoices,
+    ValidationSummaryGroupChoices,
+)
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     ContactLCM,
@@ -19,6 +23,7 @@ from nautobot_device_lifecycle_mgmt.models import (
     ProviderLCM,
     SoftwareImageLCM,
     SoftwareLCM,
+    SoftwareValidationSnapshot,
     ValidatedSoftwareLCM,
     VulnerabilityLCM,
 )
@@ -117,6 +122,11 @@ class SoftwareLCMFilterSet(NautobotFilterSet):
     )
     release_date = django_filters.DateTimeFromToRangeFilter()
     end_of_support = django_filters.DateTimeFromToRangeFilter()
+    version__gt = django_filters.CharFilter(method="filter_version", lookup_expr="gt", label="Version newer than")
+    version__gte = django_filters.CharFilter(method="filter_version", lookup_expr="gte", label="Version or newer")
+    version__lt = django_filters.CharFilter(method="filter_version", lookup_expr="lt", label="Version older than")
+    version__lte = django_filters.CharFilter(method="filter_version", lookup_expr="lte", label="Version or older")
+    latest = django_filters.BooleanFilter(method="filter_latest", label="Newest version of its platform")
 
     class Meta:
         """Meta attributes for filter."""
@@ -144,6 +154,21 @@ class SoftwareLCMFilterSet(NautobotFilterSet):
         )
         return queryset.filter(qs_filter)
 
+    def filter_version(self, queryset, name, value):  # pylint: disable=no-self-use
+        """Compare the versions with the version sort key, the lookup is the suffix of the filter name."""
+        if not value.strip():
+            return queryset
+
+        return queryset.filter_version(name.rsplit("__", 1)[1], value)
+
+    def filter_latest(self, queryset, name, value):  # pylint: disable=unused-argument, no-self-use
+        """Filter the software with the newest version of their platform, or the others."""
+        if value is None:
+            return queryset
+        latest = queryset.model.objects.latest_versions()
+
+        return queryset.filter(pk__in=latest) if value else queryset.exclude(pk__in=latest)
+
 
 class SoftwareImageLCMFilterSet(NautobotFilterSet):
     """Filter for SoftwareImageLCM."""
@@ -863,3 +888,26 @@ class VulnerabilityLCMFilterSet(NautobotFilterSet, StatusModelFilterSetMixin):
             | Q(inventory_item__name__icontains=value)
         )
         return queryset.filter(qs_filter)
+
+
+class SoftwareValidationSnapshotFilterSet(BaseFilterSet):
+    """Filter for SoftwareValidationSnapshot."""
+
+    content_type = ContentTypeFilter()
+    group_by = django_filters.MultipleChoiceFilter(choices=ValidationSummaryGroupChoices)
+    resolution = django_filters.MultipleChoiceFilter(choices=SnapshotResolutionChoices)
+    period_start__gte = django_filters.DateTimeFilter(field_name="period_start", lookup_expr="gte")
+    period_start__lte = django_filters.DateTimeFilter(field_name="period_start", lookup_expr="lte")
+
+    class Meta:
+        """Meta attributes for filter."""
+
+        model = SoftwareValidationSnapshot
+
+        fields = [
+            "content_type",
+            "group_by",
+            "group_id",
+            "group_name",
+            "resolution",
+        ]
@@ -201,6 +201,13 @@ class SoftwareLCMFilterForm(NautobotFilterForm):
         help_text="Search for version, alias, or date for release_date or end_of_support.",
     )
     version = forms.CharField(required=False)
+    version__gt = forms.CharField(label="Version Newer Than", required=False)
+    version__lt = forms.CharField(label="Version Older Than", required=False)
+    latest = forms.NullBooleanField(
+        label="Newest Version of its Platform",
+        required=False,
+        widget=StaticSelect2(choices=BOOLEAN_WITH_BLANK_CHOICES),
+    )
     device_platform = forms.ModelMultipleChoiceField(
         required=False, queryset=Platform.objects.all(), to_field_name="name"
     )
@@ -216,6 +223,9 @@ class SoftwareLCMFilterForm(NautobotFilterForm):
         fields = [
             "q",
             "version",
+            "version__gt",
+            "version__lt",
+            "latest",
             "device_platform",
             "release_date_before",
             "release_date_after",
@@ -0,0 +1,106 @@
+"""Prometheus instrumentation of the hot paths of the app, exported alongside the Nautobot metrics.
+
+Unlike the business metrics of `metrics.py`, collected from the database on every scrape, these metrics are
+observed by the processes running the instrumented code, so they're exported by the web server and worker metrics.
+"""
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from prometheus_client import Counter, Histogram
+
+# Buckets of the jobs running from seconds to hours
+JOB_DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200, float("inf"))
+# Buckets of the per-object latency, validating one object is expected to take well under a millisecond
+OBJECT_LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, float("inf"))
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, float("inf"))
+
+VALIDATION_JOB_DURATION = Histogram(
+    "nautobot_lcm_validation_job_duration_seconds",
+    "Duration of the software validation report jobs",
+    ["model", "run_type"],
+    buckets=JOB_DURATION_BUCKETS,
+)
+VALIDATION_OBJECT_LATENCY = Histogram(
+    "nautobot_lcm_validation_object_latency_seconds",
+    "Time to validate the software of one object, averaged over each validated batch or shard",
+    ["model"],
+    buckets=OBJECT_LATENCY_BUCKETS,
+)
+VALIDATED_OBJECTS = Counter(
+    "nautobot_lcm_validated_objects",
+    "Number of objects whose software was validated",
+    ["model"],
+)
+VULNERABILITY_GENERATION_DURATION = Histogram(
+    "nautobot_lcm_vulnerability_generation_duration_seconds",
+    "Duration of the Generate Vulnerabilities job",
+    buckets=JOB_DURATION_BUCKETS,
+)
+VULNERABILITY_GENERATION_CVES = Counter(
+    "nautobot_lcm_vulnerability_generation_cves",
+    "Number of CVEs processed by the Generate Vulnerabilities job",
+)
+VULNERABILITIES_GENERATED = Counter(
+    "nautobot_lcm_vulnerabilities_generated",
+    "Number of vulnerabilities created by the Generate Vulnerabilities job",
+)
+VULNERABILITIES_RETIRED = Counter(
+    "nautobot_lcm_vulnerabilities_retired",
+    "Number of stale vulnerabilities retired to a status by the Generate Vulnerabilities job",
+)
+REPORT_RENDER_DURATION = Histogram(
+    "nautobot_lcm_report_render_seconds",
+    "Time to render the software validation reports",
+    ["report"],
+)
+REPORT_QUERIES = Histogram(
+    "nautobot_lcm_report_queries",
+    "Number of database queries to render the software validation reports",
+    ["report"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+PANEL_RENDER_DURATION = Histogram(
+    "nautobot_lcm_panel_render_seconds",
+    "Time to render the lifecycle panels of the core object detail pages",
+    ["panel", "lazy"],
+)
+PANEL_QUERIES = Histogram(
+    "nautobot_lcm_panel_queries",
+    "Number of database queries to render the lifecycle panels of the core object detail pages",
+    ["panel", "lazy"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+METRICS_COLLECTION_DURATION = Histogram(
+    "nautobot_lcm_metrics_collection_seconds",
+    "Time to collect the business metrics of the app, from the database or from their snapshot",
+    ["collector"],
+)
+
+
+@contextmanager
+def observe_render(duration_histogram, queries_histogram, *labels):
+    """Observe the time and number of database queries of the enclosed rendering in the histograms with `labels`.
+
+    Queries are counted by a database execute wrapper, so they're also counted when `DEBUG` is disabled.
+    """
+    query_count = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal query_count
+        query_count += 1
+        return execute(sql, params, many, context)
+
+    start = time.monotonic()
+    with connection.execute_wrapper(count_query):
+        yield
+    duration_histogram.labels(*labels).observe(time.monotonic() - start)
+    queries_histogram.labels(*labels).observe(query_count)
+
+
+def observe_validation(model, validated_count, duration):
+    """Observe the validation of the software of `validated_count` objects of `model` in `duration` seconds."""
+    model_name = model._meta.model_name
+    VALIDATED_OBJECTS.labels(model_name).inc(validated_count)
+    if validated_count:
+        VALIDATION_OBJECT_LATENCY.labels(model_name).observe(duration / validated_count)
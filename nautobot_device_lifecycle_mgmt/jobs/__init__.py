@@ -1,8 +1,17 @@
 """Nautobot Jobs for the Device Lifecycle app."""
 from nautobot.core.celery import register_jobs
 
-from .cve_tracking import GenerateVulnerabilities
+from .cve_tracking import GenerateVulnerabilities, ImportNVDFeeds
 from .lifecycle_reporting import DeviceSoftwareValidationFullReport, InventoryItemSoftwareValidationFullReport
+from .metrics_snapshots import RefreshMetricsSnapshots
+from .upgrade_planning import GenerateUpgradePlan
 
-jobs = [DeviceSoftwareValidationFullReport, InventoryItemSoftwareValidationFullReport, GenerateVulnerabilities]
+jobs = [
+    DeviceSoftwareValidationFullReport,
+    InventoryItemSoftwareValidationFullReport,
+    GenerateVulnerabilities,
+    ImportNVDFeeds,
+    RefreshMetricsSnapshots,
+    GenerateUpgradePlan,
+]
 register_jobs(*jobs)
@@ -1,27 +1,73 @@
 # pylint: disable=logging-not-lazy, consider-using-f-string
 """Jobs for the CVE Tracking portion of the Device Lifecycle app."""
+import time
 from datetime import datetime
+from pathlib import Path
 
-from nautobot.extras.jobs import BooleanVar, Job, StringVar
-from nautobot.extras.models import Relationship
+from django.conf import settings
+from django.db import transaction
+from nautobot.extras.jobs import BooleanVar, Job, ObjectVar, StringVar
+from nautobot.extras.models import Status
 
-from nautobot_device_lifecycle_mgmt.models import CVELCM, VulnerabilityLCM
+from nautobot_device_lifecycle_mgmt.instrumentation import (
+    VULNERABILITIES_GENERATED,
+    VULNERABILITIES_RETIRED,
+    VULNERABILITY_GENERATION_CVES,
+    VULNERABILITY_GENERATION_DURATION,
+)
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.nvd_import import import_feed, open_feed
+from nautobot_device_lifecycle_mgmt.signals import sync_software_assignments
+from nautobot_device_lifecycle_mgmt.utils import get_previous_successful_runs
+from nautobot_device_lifecycle_mgmt.version_matching import SoftwareVersionIndex
+from nautobot_device_lifecycle_mgmt.vulnerabilities import generate_vulnerabilities, retire_stale_vulnerabilities
 
 name = "CVE Tracking"  # pylint: disable=invalid-name
 
+DEFAULT_PUBLISHED_AFTER = "1970-01-01"
+
+
+def get_watermark(job_result):
+    """Return when the last successful run processing all CVEs started, the changes since then are processed.
+
+    Runs limited to the CVEs published after a date don't count, they leave the changes of the other CVEs unprocessed.
+    """
+    previous_results = get_previous_successful_runs(job_result).only("date_created", "task_kwargs")
+    for previous_result in previous_results.iterator():
+        if (previous_result.task_kwargs or {}).get("published_after") in (None, DEFAULT_PUBLISHED_AFTER):
+            return previous_result.date_created
+
+    return None
+
 
 class GenerateVulnerabilities(Job):
     """Generates VulnerabilityLCM objects based on CVEs that are related to Devices."""
 
     name = "Generate Vulnerabilities"
-    description = "Generates any missing Vulnerability objects."
+    description = (
+        "Generates any missing Vulnerability objects and optionally sets a status on the ones no longer affecting "
+        "their object."
+    )
     read_only = False
     published_after = StringVar(
         regex=r"^[0-9]{4}\-[0-9]{2}\-[0-9]{2}$",
         label="CVEs Published After",
         description="Enter a date in ISO Format (YYYY-MM-DD) to only process CVEs published after that date.",
-        default="1970-01-01",
+        default=DEFAULT_PUBLISHED_AFTER,
+        required=False,
+    )
+    incremental = BooleanVar(
+        label="Incremental Run",
+        description="Only process the CVEs and software assignments that changed since the last successful run "
+        "processing all CVEs.",
+        default=False,
+    )
+    retired_status = ObjectVar(
+        model=Status,
         required=False,
+        label="Stale Vulnerabilities Status",
+        description="Set this status on the Vulnerabilities that no longer apply. They're left unchanged when unset.",
+        query_params={"content_types": "nautobot_device_lifecycle_mgmt.vulnerabilitylcm"},
     )
     debug = BooleanVar(description="Enable for more verbose logging.")
 
@@ -31,38 +77,123 @@ class GenerateVulnerabilities(Job):
         has_sensitive_variables = False
         field_order = [
             "published_after",
+            "incremental",
+            "retired_status",
             "_task_queue",
             "debug",
         ]
 
-    def run(self, published_after, debug=False):  # pylint: disable=too-many-locals, arguments-differ
-        """Check if software assigned to each device is valid. If no software is assigned return warning message."""
+    def run(  # pylint: disable=arguments-differ
+        self, published_after, incremental=False, retired_status=None, debug=False
+    ):
+        """Generate the missing vulnerabilities of the CVEs published after `published_after`, retire the stale ones."""
+        start_time = time.monotonic()
         # Although the default is set on the class attribute for the UI, it doesn't default for the API
-        published_after = published_after if published_after is not None else "1970-01-01"
+        published_after = published_after if published_after is not None else DEFAULT_PUBLISHED_AFTER
         cves = CVELCM.objects.filter(published_date__gte=datetime.fromisoformat(published_after))
-        count_before = VulnerabilityLCM.objects.count()
+        changed_since = None
+        if incremental:
+            changed_since = get_watermark(self.job_result)
+            if changed_since is None:
+                self.logger.info("No previous successful run processing all CVEs found, processing all CVEs.")
+            else:
+                self.logger.info("Processing the changes since %s." % changed_since.isoformat())
+        # Associations changed without signals, e.g. by `QuerySet.update()`, leave their software assignments stale
+        synced_count = sync_software_assignments()
+        if synced_count:
+            self.logger.info("Resynced %d software assignments with their relationship associations." % synced_count)
 
-        device_soft_rel = Relationship.objects.get(key="device_soft")
-        inv_item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+        with transaction.atomic():
+            created = generate_vulnerabilities(cves, changed_since=changed_since)
+            retired_count = 0
+            if retired_status is not None:
+                retired_count = retire_stale_vulnerabilities(cves, retired_status, changed_since=changed_since)
 
-        for cve in cves:
-            if debug:
+        if debug:
+            for cve in CVELCM.objects.filter(pk__in=created):
                 self.logger.info(
-                    "Generating vulnerabilities for CVE %s" % cve,
+                    "Generated %d vulnerabilities for CVE %s" % (created[cve.pk], cve),
                     extra={"object": cve},
                 )
-            for software in cve.affected_softwares.all():
-                # Loop through any device relationships
-                device_rels = software.get_relationships()["source"][device_soft_rel]
-                for dev_rel in device_rels:
-                    VulnerabilityLCM.objects.get_or_create(cve=cve, software=dev_rel.source, device=dev_rel.destination)
-
-                # Loop through any inventory tem relationships
-                item_rels = software.get_relationships()["source"][inv_item_soft_rel]
-                for item_rel in item_rels:
-                    VulnerabilityLCM.objects.get_or_create(
-                        cve=cve, software=item_rel.source, inventory_item=item_rel.destination
-                    )
-
-        diff = VulnerabilityLCM.objects.count() - count_before
-        self.logger.info("Processed %d CVEs and generated %d Vulnerabilities." % (cves.count(), diff))
+
+        generated_count = sum(created.values())
+        cve_count = (cves if changed_since is None else cves.filter(last_updated__gte=changed_since)).count()
+        self.logger.info(
+            "Processed %d CVEs, generated %d Vulnerabilities and retired %d stale Vulnerabilities."
+            % (cve_count, generated_count, retired_count)
+        )
+
+        VULNERABILITY_GENERATION_CVES.inc(cve_count)
+        VULNERABILITIES_GENERATED.inc(generated_count)
+        VULNERABILITIES_RETIRED.inc(retired_count)
+        VULNERABILITY_GENERATION_DURATION.observe(time.monotonic() - start_time)
+
+
+def get_feed_paths(feed_dir, pattern):
+    """Return the paths of the files of `feed_dir` matching the glob `pattern`, files outside of it are left out."""
+    if Path(pattern).is_absolute() or ".." in Path(pattern).parts:
+        raise ValueError("The feed files must be relative to the NVD feed directory.")
+    feed_dir = Path(feed_dir).resolve()
+
+    # Symbolic links may point outside of the feed directory
+    return sorted(path for path in feed_dir.glob(pattern) if path.is_file() and feed_dir in path.resolve().parents)
+
+
+class ImportNVDFeeds(Job):
+    """Creates or updates CVELCM objects from the NVD JSON feed files of the NVD feed directory."""
+
+    name = "Import NVD Feeds"
+    description = "Creates or updates the CVEs of NVD JSON 1.1 and 2.0 feed files, for offline CVE tracking."
+    read_only = False
+    feed_files = StringVar(
+        label="Feed Files",
+        description="Glob pattern of the feed files to import, relative to the NVD feed directory of the app settings. "
+        "Files ending with .gz are decompressed.",
+        default="*.json*",
+    )
+    link_software = BooleanVar(
+        label="Link Affected Software",
+        description="Link the CVEs to the Software whose platform and version match the CPEs of the CVEs.",
+        default=False,
+    )
+    debug = BooleanVar(description="Enable for more verbose logging.")
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
+
+    def run(self, feed_files, link_software=False, debug=False):  # pylint: disable=arguments-differ
+        """Import the CVEs of the feed files matching `feed_files` in the NVD feed directory."""
+        feed_dir = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"].get("nvd_feed_dir")
+        if not feed_dir:
+            raise RuntimeError("The NVD feed directory is not set, see the `nvd_feed_dir` app setting.")
+        paths = get_feed_paths(feed_dir, feed_files)
+        if not paths:
+            raise RuntimeError("No feed files match %s in the NVD feed directory." % feed_files)
+
+        software_index = SoftwareVersionIndex(SoftwareLCM.objects.all()) if link_software else None
+        # Numbers of created and updated CVEs, and of software links added
+        totals = (0, 0, 0)
+        failed_count = 0
+        for path in paths:
+            try:
+                with open_feed(path) as file:
+                    counts = import_feed(file, software_index=software_index)
+            except (OSError, ValueError) as err:
+                self.logger.error("Failed to import %s: %s" % (path.name, err))
+                failed_count += 1
+                continue
+            if debug:
+                self.logger.info(
+                    "Created %d and updated %d CVEs from %s, added %d software links."
+                    % (counts[0], counts[1], path.name, counts[2])
+                )
+            totals = tuple(map(sum, zip(totals, counts)))
+
+        self.logger.info(
+            "Imported %d feed files, created %d and updated %d CVEs, added %d software links."
+            % (len(paths) - failed_count, *totals)
+        )
+        if failed_count:
+            raise RuntimeError(f"{failed_count} of {len(paths)} feed files failed to import.")
@@ -1,78 +1,142 @@
 # pylint: disable=logging-not-lazy, consider-using-f-string
 """Jobs for the Lifecycle Management app."""
+import time
 from datetime import datetime
 
-from nautobot.dcim.models import Device, InventoryItem
-from nautobot.extras.jobs import Job
+from celery import chord
+from nautobot.extras.jobs import BooleanVar, IntegerVar, Job
 
 from nautobot_device_lifecycle_mgmt import choices
-from nautobot_device_lifecycle_mgmt.models import (
-    DeviceSoftwareValidationResult,
-    InventoryItemSoftwareValidationResult,
-    ValidatedSoftwareLCM,
+from nautobot_device_lifecycle_mgmt.instrumentation import VALIDATION_JOB_DURATION
+from nautobot_device_lifecycle_mgmt.signals import sync_software_assignments
+from nautobot_device_lifecycle_mgmt.software import DeviceSoftwareBulkValidator, InventoryItemSoftwareBulkValidator
+from nautobot_device_lifecycle_mgmt.tasks import (
+    finish_software_shards,
+    get_shard_filters,
+    update_validation_reports,
+    validate_software_shard,
 )
-from nautobot_device_lifecycle_mgmt.software import DeviceSoftware, InventoryItemSoftware
+from nautobot_device_lifecycle_mgmt.utils import SHARDS_DISPATCHED_GROUPING, get_previous_successful_runs
 
 name = "Device/Software Lifecycle Reporting"  # pylint: disable=invalid-name
 
 
-class DeviceSoftwareValidationFullReport(Job):
-    """Checks if devices run validated software version."""
+def get_last_successful_run(job_result):
+    """Return the most recent successful JobResult of the same job, excluding `job_result` itself.
 
-    name = "Device Software Validation Report"
-    description = "Validates software version on devices."
-    read_only = False
+    Sharded runs are only returned once their shards finished, see `get_previous_successful_runs`.
+    """
+    return get_previous_successful_runs(job_result).first()
+
+
+class SoftwareValidationReportJob(Job):
+    """Base class for the software validation report jobs."""
+
+    incremental = BooleanVar(
+        label="Incremental Run",
+        description="Only validate objects that changed since the last successful run of this job.",
+        default=False,
+    )
+    shards = IntegerVar(
+        label="Shards",
+        description="Split the objects into this many shards validated in parallel by Celery workers.",
+        default=1,
+        min_value=1,
+        required=False,
+    )
+
+    validator_class = None
+    items_name = None
 
     class Meta:
         """Meta class for the job."""
 
         has_sensitive_variables = False
 
-    def run(self) -> None:  # pylint: disable=arguments-differ
-        """Check if software assigned to each device is valid. If no software is assigned return warning message."""
-        devices = Device.objects.all()
+    def get_items_qs(self):
+        """Return queryset of the objects to validate, all objects of the model validated by `validator_class`."""
+        return self.validator_class.item_model.objects.all()
+
+    def run_shards(self, items_qs, shard_count, last_run, run_type):
+        """Validate the objects in parallel Celery subtasks, one per shard, without waiting for them.
+
+        The chord callback `finish_software_shards` logs the results of the shards to the job result, then updates the
+        summaries and snapshots and logs its completion, or marks the job result as failed if any shard failed.
+        """
+        validator_path = f"{self.validator_class.__module__}.{self.validator_class.__qualname__}"
+        shard_filters = get_shard_filters(
+            items_qs, shard_count, by_range=run_type == choices.ReportRunTypeChoices.REPORT_FULL_RUN
+        )
+        # Logged first, the job result isn't final until the callback logged its completion
+        self.logger.info(
+            "Dispatching the validation of the %s in %d shards." % (self.items_name, len(shard_filters)),
+            extra={"grouping": SHARDS_DISPATCHED_GROUPING},
+        )
+        chord_result = chord(
+            validate_software_shard.s(validator_path, shard_filter, last_run.isoformat(), run_type)
+            for shard_filter in shard_filters
+        )(finish_software_shards.s(validator_path, str(self.job_result.pk), last_run.isoformat(), run_type))
+
+        # The shards already ran when the tasks are executed eagerly, report their failure as the job's own
+        if chord_result.ready() and chord_result.failed():
+            raise RuntimeError(str(chord_result.result))
+
+    def run(self, incremental=False, shards=1):  # pylint: disable=arguments-differ
+        """Validate software assigned to the objects, or only to the changed objects if `incremental` is set."""
+        start_time = time.monotonic()
+        # Associations changed without signals, e.g. by `QuerySet.update()`, leave their software assignments stale
+        synced_count = sync_software_assignments()
+        if synced_count:
+            self.logger.info("Resynced %d software assignments with their relationship associations." % synced_count)
+        items_qs = self.get_items_qs()
         job_run_time = datetime.now()
+        run_type = choices.ReportRunTypeChoices.REPORT_FULL_RUN
 
-        for device in devices:
-            device_software = DeviceSoftware(device)
+        if incremental:
+            last_successful_run = get_last_successful_run(self.job_result)
+            if last_successful_run is None:
+                self.logger.info("No previous successful run found, validating all %s." % self.items_name)
+            else:
+                items_qs = self.validator_class(items_qs).get_changed_items(  # pylint: disable=not-callable
+                    since=last_successful_run.date_created
+                )
+                run_type = choices.ReportRunTypeChoices.REPORT_DELTA_RUN
 
-            validate_obj, _ = DeviceSoftwareValidationResult.objects.get_or_create(device=device)
-            validate_obj.is_validated = device_software.validate_software()
-            validate_obj.valid_software.set(ValidatedSoftwareLCM.objects.get_for_object(device))
-            validate_obj.software = device_software.software
-            validate_obj.last_run = job_run_time
-            validate_obj.run_type = choices.ReportRunTypeChoices.REPORT_FULL_RUN
-            validate_obj.validated_save()
+        # Although the default is set on the class attribute for the UI, it doesn't default for the API
+        shards = shards or 1
+        if shards > 1:
+            self.run_shards(items_qs, shards, last_run=job_run_time, run_type=run_type)
+            return
 
-        self.logger.info("Performed validation on: %d devices.", devices.count())
+        validator = self.validator_class(items_qs)  # pylint: disable=not-callable
+        validated_count = validator.validate(last_run=job_run_time, run_type=run_type)
+        self.logger.info("Performed validation on: %d %s." % (validated_count, self.items_name))
 
+        update_validation_reports(self.validator_class, last_run=job_run_time)
+        self.logger.info("Updated the software validation summaries and snapshot of the %s." % self.items_name)
 
-class InventoryItemSoftwareValidationFullReport(Job):
-    """Checks if inventory items run validated software version."""
+        VALIDATION_JOB_DURATION.labels(self.validator_class.item_model._meta.model_name, run_type).observe(
+            time.monotonic() - start_time
+        )
 
-    name = "Inventory Item Software Validation Report"
-    description = "Validates software version on inventory items."
-    read_only = False
 
-    class Meta:
-        """Meta class for the job."""
+class DeviceSoftwareValidationFullReport(SoftwareValidationReportJob):
+    """Checks if devices run validated software version."""
 
-        has_sensitive_variables = False
+    name = "Device Software Validation Report"
+    description = "Validates software version on devices."
+    read_only = False
+
+    validator_class = DeviceSoftwareBulkValidator
+    items_name = "devices"
 
-    def run(self):  # pylint: disable=arguments-differ
-        """Check if software assigned to each inventory item is valid. If no software is assigned return warning message."""
-        inventory_items = InventoryItem.objects.all()
-        job_run_time = datetime.now()
 
-        for inventoryitem in inventory_items:
-            inventoryitem_software = InventoryItemSoftware(inventoryitem)
+class InventoryItemSoftwareValidationFullReport(SoftwareValidationReportJob):
+    """Checks if inventory items run validated software version."""
 
-            validate_obj, _ = InventoryItemSoftwareValidationResult.objects.get_or_create(inventory_item=inventoryitem)
-            validate_obj.is_validated = inventoryitem_software.validate_software()
-            validate_obj.valid_software.set(ValidatedSoftwareLCM.objects.get_for_object(inventoryitem))
-            validate_obj.software = inventoryitem_software.software
-            validate_obj.last_run = job_run_time
-            validate_obj.run_type = choices.ReportRunTypeChoices.REPORT_FULL_RUN
-            validate_obj.validated_save()
+    name = "Inventory Item Software Validation Report"
+    description = "Validates software version on inventory items."
+    read_only = False
 
-        self.logger.info("Performed validation on: %d inventory items." % inventory_items.count())
+    validator_class = InventoryItemSoftwareBulkValidator
+    items_name = "inventory items"
@@ -0,0 +1,29 @@
+# pylint: disable=logging-not-lazy, consider-using-f-string
+"""Jobs for the Prometheus metrics of the Device Lifecycle app."""
+from nautobot.extras.jobs import Job
+
+from nautobot_device_lifecycle_mgmt.metrics import refresh_metrics_snapshot, snapshot_collectors
+
+name = "Lifecycle Metrics"  # pylint: disable=invalid-name
+
+
+class RefreshMetricsSnapshots(Job):
+    """Collects the Prometheus metrics of the app into the snapshots served to the scrapes."""
+
+    name = "Refresh Metrics Snapshots"
+    description = "Collects the app metrics served by the Prometheus scrapes when the metrics snapshots are enabled."
+    read_only = False
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
+
+    def run(self):  # pylint: disable=arguments-differ
+        """Refresh the snapshot of every collector served from snapshots."""
+        for collector in snapshot_collectors:
+            snapshot = refresh_metrics_snapshot(collector)
+            self.logger.info(
+                "Refreshed the snapshot of %s with %d metrics."
+                % (collector.__name__, sum(len(family["samples"]) for family in snapshot["families"]))
+            )
@@ -0,0 +1,97 @@
+# pylint: disable=logging-not-lazy, consider-using-f-string
+"""Jobs for the software upgrade planning of the Device Lifecycle app."""
+from collections import Counter
+
+from nautobot.dcim.models import Device, Location, Platform
+from nautobot.extras.jobs import BooleanVar, ChoiceVar, Job, MultiObjectVar
+from nautobot.extras.models import Role
+
+from nautobot_device_lifecycle_mgmt.choices import UpgradePlanFormatChoices, UpgradePlanStatusChoices
+from nautobot_device_lifecycle_mgmt.upgrade_plan import get_upgrade_plan, group_upgrade_plan, upgrade_plan_to_csv
+
+name = "Software Upgrade Planning"  # pylint: disable=invalid-name
+
+
+class GenerateUpgradePlan(Job):
+    """Plans the upgrade of the devices to their preferred validated software."""
+
+    name = "Generate Upgrade Plan"
+    description = (
+        "Computes the current software, the preferred validated software and its images of the devices, "
+        "grouped by platform, target software and location."
+    )
+    read_only = True
+    locations = MultiObjectVar(
+        model=Location,
+        required=False,
+        description="Only plan the devices of these locations and their descendants.",
+    )
+    platforms = MultiObjectVar(model=Platform, required=False, description="Only plan the devices of these platforms.")
+    roles = MultiObjectVar(
+        model=Role,
+        required=False,
+        query_params={"content_types": "dcim.device"},
+        description="Only plan the devices with these roles.",
+    )
+    include_current = BooleanVar(
+        label="Include Up to Date Devices",
+        description="Include the devices already running their preferred validated software.",
+        default=False,
+    )
+    output_format = ChoiceVar(
+        choices=UpgradePlanFormatChoices.CHOICES,
+        default=UpgradePlanFormatChoices.JSON,
+        description="JSON plan grouped by platform, target software and location, or CSV plan with a row per device.",
+    )
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
+        field_order = [
+            "locations",
+            "platforms",
+            "roles",
+            "include_current",
+            "output_format",
+        ]
+
+    def run(  # pylint: disable=arguments-differ, too-many-arguments
+        self,
+        locations=None,
+        platforms=None,
+        roles=None,
+        include_current=False,
+        output_format=UpgradePlanFormatChoices.JSON,
+    ):
+        """Return the upgrade plan of the selected devices, the plan is stored in the job result."""
+        devices = Device.objects.all()
+        if locations:
+            devices = devices.filter(
+                location__in=[
+                    descendant.pk for location in locations for descendant in location.descendants(include_self=True)
+                ]
+            )
+        if platforms:
+            devices = devices.filter(platform__in=platforms)
+        if roles:
+            devices = devices.filter(role__in=roles)
+
+        plan = get_upgrade_plan(devices, include_current=include_current)
+        statuses = Counter(row["status"] for row in plan)
+        self.logger.info(
+            "Planned %d devices: %d to upgrade, %d to downgrade, %d without current software, %d up to date "
+            "and %d without validated software."
+            % (
+                len(plan),
+                statuses[UpgradePlanStatusChoices.UPGRADE],
+                statuses[UpgradePlanStatusChoices.DOWNGRADE],
+                statuses[UpgradePlanStatusChoices.NO_SOFTWARE],
+                statuses[UpgradePlanStatusChoices.CURRENT],
+                statuses[UpgradePlanStatusChoices.NO_TARGET],
+            )
+        )
+
+        if output_format == UpgradePlanFormatChoices.CSV:
+            return upgrade_plan_to_csv(plan)
+        return group_upgrade_plan(plan)
@@ -0,0 +1,84 @@
+"""Lifecycle data of Devices and InventoryItems shared by the template extensions rendered for a request."""
+from django.db.models import Q
+from django.utils.functional import cached_property
+from nautobot.dcim.models import Device, InventoryItem
+
+from nautobot_device_lifecycle_mgmt.models import HardwareLCM
+from nautobot_device_lifecycle_mgmt.software import DeviceSoftware, InventoryItemSoftware
+from nautobot_device_lifecycle_mgmt.software_filters import without_tree_fields
+
+REQUEST_CACHE_ATTR = "_nautobot_device_lifecycle_mgmt_contexts"
+
+
+class LifecycleContext:
+    """Lifecycle data of a Device or InventoryItem.
+
+    Every part is computed on first access and reused afterwards, so all template extensions rendered for an object
+    share the same queries. Use `for_request` to get the context memoized on the request.
+    """
+
+    def __init__(self, obj):
+        """Initialize LifecycleContext object."""
+        self.obj = obj
+
+    @classmethod
+    def for_request(cls, request, obj):
+        """Return the context of `obj` memoized on `request`, a new context if there is no request."""
+        if request is None:
+            return cls(obj)
+
+        contexts = getattr(request, REQUEST_CACHE_ATTR, None)
+        if contexts is None:
+            contexts = {}
+            setattr(request, REQUEST_CACHE_ATTR, contexts)
+        key = (obj._meta.label_lower, obj.pk)
+        if key not in contexts:
+            contexts[key] = cls(obj)
+
+        return contexts[key]
+
+    @cached_property
+    def item_software(self):
+        """ItemSoftware object computing the software and validated software of the object."""
+        if isinstance(self.obj, Device):
+            return DeviceSoftware(item_obj=self.obj)
+        if isinstance(self.obj, InventoryItem):
+            return InventoryItemSoftware(item_obj=self.obj)
+
+        raise TypeError(f"{self.obj._meta.verbose_name} objects can't have software assigned")
+
+    @property
+    def software(self):
+        """SoftwareLCM assigned to the object."""
+        return self.item_software.software
+
+    @property
+    def validated_software(self):
+        """List of ValidatedSoftwareLCM objects assigned to the object."""
+        return self.item_software.validated_software
+
+    @cached_property
+    def validated_software_table(self):
+        """Table of the ValidatedSoftwareLCM objects assigned to the object."""
+        return self.item_software.get_validated_software_table()
+
+    @cached_property
+    def software_valid(self):
+        """True if the software assigned to the object is currently validated."""
+        return self.item_software.validate_software()
+
+    @cached_property
+    def hw_notices(self):
+        """List of HardwareLCM notices for the object, for devices also the notices of their inventory items."""
+        if isinstance(self.obj, Device):
+            part_ids = (
+                without_tree_fields(InventoryItem.objects.filter(device=self.obj.pk))
+                .exclude(Q(part_id="") | Q(part_id__isnull=True))
+                .values("part_id")
+            )
+            notices_qs = HardwareLCM.objects.filter(
+                Q(device_type=self.obj.device_type_id) | Q(inventory_item__in=part_ids)
+            ).select_related("device_type")
+            return list(notices_qs)
+
+        return list(HardwareLCM.objects.filter(inventory_item=self.obj.part_id))
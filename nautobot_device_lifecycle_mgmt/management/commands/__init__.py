@@ -0,0 +1 @@
+"""Management commands of the Device Lifecycle app."""
@@ -0,0 +1,42 @@
+"""Management command importing the CVEs of NVD JSON feed files."""
+from django.core.management.base import BaseCommand, CommandError
+
+from nautobot_device_lifecycle_mgmt.models import SoftwareLCM
+from nautobot_device_lifecycle_mgmt.nvd_import import CVE_BATCH_SIZE, import_feed, open_feed
+from nautobot_device_lifecycle_mgmt.version_matching import SoftwareVersionIndex
+
+
+class Command(BaseCommand):
+    """Creates or updates CVELCM objects from NVD JSON 1.1 and 2.0 feed files."""
+
+    help = "Create or update the CVEs of NVD JSON 1.1 and 2.0 feed files, files ending with .gz are decompressed."
+
+    def add_arguments(self, parser):
+        """Add the feed files and the batch size arguments."""
+        parser.add_argument("feed_files", nargs="+", metavar="feed_file", help="Path of an NVD JSON feed file.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=CVE_BATCH_SIZE,
+            help=f"Number of CVEs upserted per batch, defaults to {CVE_BATCH_SIZE}.",
+        )
+        parser.add_argument(
+            "--link-software",
+            action="store_true",
+            help="Link the CVEs to the software whose platform and version match the CPEs of the CVEs.",
+        )
+
+    def handle(self, *args, **options):
+        """Import the feed files one after the other."""
+        software_index = SoftwareVersionIndex(SoftwareLCM.objects.all()) if options["link_software"] else None
+        for path in options["feed_files"]:
+            try:
+                with open_feed(path) as file:
+                    created, updated, linked = import_feed(
+                        file, batch_size=options["batch_size"], software_index=software_index
+                    )
+            except (OSError, ValueError) as err:
+                raise CommandError(f"Failed to import {path}: {err}") from err
+            self.stdout.write(
+                f"Created {created} and updated {updated} CVEs from {path}, added {linked} software links."
+            )
@@ -1,19 +1,107 @@
 """Nautobot Device LCM App application level metrics ."""
+import functools
+import time
+from collections import Counter
 from datetime import datetime
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.core.cache import cache
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
 from django.db.models.functions import Coalesce
 from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, LocationType
-from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.core import GaugeMetricFamily, Metric
 
+from nautobot_device_lifecycle_mgmt.instrumentation import METRICS_COLLECTION_DURATION
 from nautobot_device_lifecycle_mgmt.models import (
     DeviceSoftwareValidationResult,
     HardwareLCM,
     InventoryItemSoftwareValidationResult,
 )
 
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
 
+METRICS_SNAPSHOT_CACHE_KEY = "nautobot_device_lifecycle_mgmt.metrics_snapshot.{}"
+METRICS_SNAPSHOT_LOCK_CACHE_KEY = "nautobot_device_lifecycle_mgmt.metrics_snapshot_lock.{}"
+# Seconds a process may take to refresh a snapshot before another process takes over
+METRICS_SNAPSHOT_LOCK_TIMEOUT = 300
+# Collectors served from snapshots, filled by `snapshot_metrics`
+snapshot_collectors = []
+
+
+def refresh_metrics_snapshot(collector):
+    """Collect the metrics of `collector` and store them as its snapshot, shared by all processes through the cache.
+
+    Returns:
+        dict: The snapshot, "created" is its time in seconds since the epoch, "families" the collected metrics
+    """
+    snapshot = {
+        "created": time.time(),
+        "families": [
+            {
+                "name": family.name,
+                "documentation": family.documentation,
+                "type": family.type,
+                "samples": [(sample.name, sample.labels, sample.value) for sample in family.samples],
+            }
+            for family in collector()
+        ],
+    }
+    cache.set(METRICS_SNAPSHOT_CACHE_KEY.format(collector.__name__), snapshot, None)
+
+    return snapshot
+
+
+def get_metrics_snapshot(collector):
+    """Return the snapshot of `collector`, refreshing it if there is none or, in `ttl` mode, if it's expired.
+
+    Only one process refreshes an expired snapshot, the other processes keep serving it until it's refreshed.
+    """
+    snapshot = cache.get(METRICS_SNAPSHOT_CACHE_KEY.format(collector.__name__))
+    if snapshot is None:
+        return refresh_metrics_snapshot(collector)
+
+    expired = time.time() - snapshot["created"] > PLUGIN_CFG.get("metrics_snapshot_ttl", 300)
+    lock_key = METRICS_SNAPSHOT_LOCK_CACHE_KEY.format(collector.__name__)
+    if (
+        PLUGIN_CFG.get("metrics_snapshot_mode") == "ttl"
+        and expired
+        and cache.add(lock_key, True, METRICS_SNAPSHOT_LOCK_TIMEOUT)
+    ):
+        try:
+            snapshot = refresh_metrics_snapshot(collector)
+        finally:
+            cache.delete(lock_key)
+
+    return snapshot
+
+
+def snapshot_metrics(collector):
+    """Serve the metrics of `collector` from its snapshot when the `metrics_snapshot_mode` setting is enabled.
+
+    With `ttl` the snapshot is refreshed by the first scrape after it's older than `metrics_snapshot_ttl` seconds, with
+    `job` it's only refreshed by the "Refresh Metrics Snapshots" job. Otherwise the metrics are collected on every
+    scrape. The time to serve the metrics either way is observed in `nautobot_lcm_metrics_collection_seconds`.
+    """
+
+    @functools.wraps(collector)
+    def wrapper():
+        with METRICS_COLLECTION_DURATION.labels(collector.__name__).time():
+            if not PLUGIN_CFG.get("metrics_snapshot_mode"):
+                yield from collector()
+                return
+
+            for family in get_metrics_snapshot(collector)["families"]:
+                metric = Metric(family["name"], family["documentation"], family["type"])
+                for name, labels, value in family["samples"]:
+                    metric.add_sample(name, labels, value)
+                yield metric
+
+    snapshot_collectors.append(collector)
+    return wrapper
+
+
+@snapshot_metrics
 def metrics_lcm_validation_report_device_type():
     """Calculate number of devices with valid/invalid software by device_type.
 
@@ -62,6 +150,7 @@ def metrics_lcm_validation_report_device_type():
     yield device_software_compliance_gauge
 
 
+@snapshot_metrics
 def metrics_lcm_validation_report_inventory_item():
     """Calculate number of inventory items with valid/invalid software.
 
@@ -112,9 +201,13 @@ def metrics_lcm_validation_report_inventory_item():
     yield inventory_item_software_compliance_gauge
 
 
+@snapshot_metrics
 def metrics_lcm_hw_end_of_support():  # pylint: disable=too-many-locals
     """Calculate number of End of Support devices and inventory items per Part Number and per Location.
 
+    Every dimension is counted by a single grouped query, including the part numbers and locations without End of
+    Support hardware, which are set to 0.
+
     Yields:
         GaugeMetricFamily: Prometheus Metrics
     """
@@ -130,102 +223,100 @@ def metrics_lcm_hw_end_of_support():  # pylint: disable=too-many-locals
     )
 
     today = datetime.today().date()
-    hw_end_of_support = HardwareLCM.objects.filter(end_of_support__lt=today)
-    hw_end_of_support_device_types = hw_end_of_support.exclude(device_type__isnull=True).values_list(
-        "device_type", flat=True
-    )
-    hw_end_of_support_invitems = hw_end_of_support.exclude(inventory_item__isnull=True).values_list(
-        "inventory_item", flat=True
-    )
+    hw_end_of_support_device_types = set()
+    hw_end_of_support_invitems = set()
+    for device_type_id, inventory_item_part_id in HardwareLCM.objects.filter(end_of_support__lt=today).values_list(
+        "device_type", "inventory_item"
+    ):
+        if device_type_id is not None:
+            hw_end_of_support_device_types.add(device_type_id)
+        else:
+            hw_end_of_support_invitems.add(inventory_item_part_id)
 
-    # Generate metrics with counts for out of support devices per device type
-    for part_number, model, device_count in (
+    # Generate metrics with counts for out of support devices per device type, 0 for the supported device types
+    for device_type_id, part_number, model, device_count in (
         DeviceType.objects.order_by()
-        .annotate(num_devices=Count("devices", filter=Q(id__in=hw_end_of_support_device_types)))
-        .values_list("part_number", "model", "num_devices")
+        .annotate(num_devices=Count("devices"))
+        .values_list("pk", "part_number", "model", "num_devices")
     ):
         hw_end_of_support_part_number_gauge.add_metric(
-            labels=[part_number if part_number else model], value=device_count
+            labels=[part_number if part_number else model],
+            value=device_count if device_type_id in hw_end_of_support_device_types else 0,
         )
 
-    # Generate metrics with counts for out of support inventory items per part id
-    for part_id, inv_item_count in (
-        InventoryItem.objects.order_by()
-        .filter(part_id__in=hw_end_of_support_invitems)
-        .values("part_id")
+    # Generate metrics with counts for out of support inventory items per part id, 0 for the supported part ids
+    # Inventory items without part id are labeled by name, they're never out of support
+    # Tree fields are skipped, InventoryItem and Location querysets compute them by a recursive CTE over the whole table
+    for part_id, metric_label, inv_item_count in (
+        InventoryItem.objects.without_tree_fields()
+        .order_by()
+        .values("part_id", metric_label=Case(When(part_id="", then=F("name")), default=F("part_id")))
         .annotate(inv_item_count=Count("id"))
-        .values_list("part_id", "inv_item_count")
+        .values_list("part_id", "metric_label", "inv_item_count")
     ):
-        hw_end_of_support_part_number_gauge.add_metric(labels=[part_id], value=inv_item_count)
-
-    # Set metric value to 0 for inventory items that don't have corresponding HW notice
-    # Case for inventory items that have non-empty part_id attribute
-    for inv_item_part_id in (
-        InventoryItem.objects.order_by()
-        .filter(~Q(part_id__in=hw_end_of_support_invitems) & ~Q(part_id=""))
-        .values_list("part_id", flat=True)
-        .distinct()
-    ):
-        hw_end_of_support_part_number_gauge.add_metric(labels=[inv_item_part_id], value=0)
-
-    # Set metric value to 0 for inventory items that don't have corresponding HW notice
-    # Case for inventory items that have empty part_id attribute
-    for inv_item_name in (
-        InventoryItem.objects.order_by()
-        .filter(~Q(part_id__in=hw_end_of_support_invitems) & Q(part_id=""))
-        .values_list("name", flat=True)
-        .distinct()
-    ):
-        hw_end_of_support_part_number_gauge.add_metric(labels=[inv_item_name], value=0)
+        hw_end_of_support_part_number_gauge.add_metric(
+            labels=[metric_label], value=inv_item_count if part_id and part_id in hw_end_of_support_invitems else 0
+        )
 
     yield hw_end_of_support_part_number_gauge
 
-    # Initialize per location count to 0 for all locations
-    device_location_types = LocationType.objects.filter(content_types=ContentType.objects.get_for_model(Device))
-    init_location_counts = (
-        Location.objects.filter(location_type__in=device_location_types)
-        .values(location_name=F("name"))
-        .annotate(location_count=Value(0, output_field=IntegerField()))
-    )
-    # Get count of out of hw support devices per location
-    hw_end_of_support_per_location_devices = (
+    # Count out of hw support devices and inventory items per location
+    location_counts = Counter()
+    for location_id, device_count in (
         Device.objects.order_by()
         .filter(device_type_id__in=hw_end_of_support_device_types)
-        .values(location_name=F("location__name"))
-        .annotate(location_count=Count("id"))
-    )
-    # Get count of out of hw support inventory items per location
-    hw_end_of_support_per_location_invitems = (
-        InventoryItem.objects.order_by()
+        .values("location")
+        .annotate(device_count=Count("id"))
+        .values_list("location", "device_count")
+    ):
+        location_counts[location_id] += device_count
+    for location_id, inv_item_count in (
+        InventoryItem.objects.without_tree_fields()
+        .order_by()
         .filter(part_id__in=hw_end_of_support_invitems)
-        .values(location_name=F("device__location__name"))
-        .annotate(location_count=Count("id"))
-    )
+        .values("device__location")
+        .annotate(inv_item_count=Count("id"))
+        .values_list("device__location", "inv_item_count")
+    ):
+        location_counts[location_id] += inv_item_count
 
-    # Build subqueries used in the final query offloading count sum to the DB
-    hw_end_of_support_per_location_devices_sq = Subquery(
-        hw_end_of_support_per_location_devices.filter(location_name=OuterRef("location_name")).values_list(
-            "location_count"
-        )
-    )
-    hw_end_of_support_per_location_invitems_sq = Subquery(
-        hw_end_of_support_per_location_invitems.filter(location_name=OuterRef("location_name")).values_list(
-            "location_count"
-        )
-    )
-    # Build query summing counts per site and generate corresponding metrics
-    for location_name, total_count in init_location_counts.annotate(
-        total_count=F("location_count")
-        + Coalesce(hw_end_of_support_per_location_devices_sq, 0)
-        + Coalesce(hw_end_of_support_per_location_invitems_sq, 0)
-    ).values_list("location_name", "total_count"):
-        hw_end_of_support_location_gauge.add_metric(labels=[location_name], value=total_count)
+    # Generate metrics for all locations that can hold devices, 0 for the locations without out of support hardware
+    device_location_types = LocationType.objects.filter(content_types=ContentType.objects.get_for_model(Device))
+    for location_id, location_name in (
+        Location.objects.without_tree_fields().filter(location_type__in=device_location_types).values_list("pk", "name")
+    ):
+        hw_end_of_support_location_gauge.add_metric(labels=[location_name], value=location_counts[location_id])
 
     yield hw_end_of_support_location_gauge
 
 
+def metrics_lcm_metrics_snapshot_age():
+    """Calculate the age of the metrics snapshots, when the metrics are served from snapshots.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    if not PLUGIN_CFG.get("metrics_snapshot_mode"):
+        return
+
+    metrics_snapshot_age_gauge = GaugeMetricFamily(
+        "nautobot_lcm_metrics_snapshot_age_seconds",
+        "Number of seconds since the served snapshot of the metrics was collected",
+        labels=["collector"],
+    )
+    now = time.time()
+    for collector in snapshot_collectors:
+        snapshot = cache.get(METRICS_SNAPSHOT_CACHE_KEY.format(collector.__name__))
+        if snapshot is not None:
+            metrics_snapshot_age_gauge.add_metric(labels=[collector.__name__], value=now - snapshot["created"])
+
+    yield metrics_snapshot_age_gauge
+
+
 metrics = [
     metrics_lcm_hw_end_of_support,
     metrics_lcm_validation_report_device_type,
     metrics_lcm_validation_report_inventory_item,
+    # Collected last, after the snapshots are refreshed
+    metrics_lcm_metrics_snapshot_age,
 ]
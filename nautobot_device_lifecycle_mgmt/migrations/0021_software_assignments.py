@@ -0,0 +1,111 @@
+# Generated by Django 3.2.25 on 2026-10-17 05:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def populate_software_assignments(apps, schema_editor):
+    """
+    Populate software assignment tables from the device_soft and inventory_item_soft relationship associations.
+    """
+    RelationshipAssociation = apps.get_model("extras", "RelationshipAssociation")
+    Device = apps.get_model("dcim", "Device")
+    InventoryItem = apps.get_model("dcim", "InventoryItem")
+    SoftwareLCM = apps.get_model("nautobot_device_lifecycle_mgmt", "SoftwareLCM")
+    DeviceSoftwareAssignment = apps.get_model("nautobot_device_lifecycle_mgmt", "DeviceSoftwareAssignment")
+    InventoryItemSoftwareAssignment = apps.get_model(
+        "nautobot_device_lifecycle_mgmt", "InventoryItemSoftwareAssignment"
+    )
+
+    for relationship_key, item_model, assignment_model, item_field in (
+        ("device_soft", Device, DeviceSoftwareAssignment, "device_id"),
+        ("inventory_item_soft", InventoryItem, InventoryItemSoftwareAssignment, "inventory_item_id"),
+    ):
+        soft_relationship_associations = RelationshipAssociation.objects.filter(
+            relationship__key=relationship_key,
+            source_id__in=SoftwareLCM.objects.values("pk"),
+            destination_id__in=item_model.objects.values("pk"),
+        ).values_list("destination_id", "source_id")
+
+        assignment_model.objects.bulk_create(
+            [
+                assignment_model(**{item_field: item_id, "software_id": software_id})
+                for item_id, software_id in soft_relationship_associations
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dcim", "0049_remove_slugs_and_change_device_primary_ip_fields"),
+        ("extras", "0083_ensure_relationship_keys_are_unique"),
+        ("nautobot_device_lifecycle_mgmt", "0020_alter_created_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventoryItemSoftwareAssignment",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                (
+                    "inventory_item",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="software_assignment",
+                        to="dcim.inventoryitem",
+                    ),
+                ),
+                (
+                    "software",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inventory_item_assignments",
+                        to="nautobot_device_lifecycle_mgmt.softwarelcm",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Inventory Item Software Assignment",
+                "ordering": ("inventory_item",),
+            },
+        ),
+        migrations.CreateModel(
+            name="DeviceSoftwareAssignment",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                (
+                    "device",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="software_assignment",
+                        to="dcim.device",
+                    ),
+                ),
+                (
+                    "software",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="device_assignments",
+                        to="nautobot_device_lifecycle_mgmt.softwarelcm",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Device Software Assignment",
+                "ordering": ("device",),
+            },
+        ),
+        migrations.RunPython(populate_software_assignments, migrations.RunPython.noop),
+    ]
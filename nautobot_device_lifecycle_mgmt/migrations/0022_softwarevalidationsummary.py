@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-17 05:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("nautobot_device_lifecycle_mgmt", "0021_software_assignments"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SoftwareValidationSummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("group_by", models.CharField(max_length=50)),
+                ("group_id", models.UUIDField(blank=True, null=True)),
+                ("group_name", models.CharField(blank=True, default="", max_length=255)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("valid", models.PositiveIntegerField(default=0)),
+                ("invalid", models.PositiveIntegerField(default=0)),
+                ("no_software", models.PositiveIntegerField(default=0)),
+                ("last_run", models.DateTimeField(blank=True, null=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Software Validation Summary",
+                "verbose_name_plural": "Software Validation Summaries",
+                "ordering": ("content_type", "group_by", "group_name"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="softwarevalidationsummary",
+            index=models.Index(fields=["content_type", "group_by"], name="nautobot_de_content_072ca0_idx"),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.25 on 2026-10-17 05:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("nautobot_device_lifecycle_mgmt", "0022_softwarevalidationsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SoftwareValidationSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("group_by", models.CharField(max_length=50)),
+                ("group_id", models.UUIDField(blank=True, null=True)),
+                ("group_name", models.CharField(blank=True, default="", max_length=255)),
+                ("resolution", models.CharField(default="run", max_length=50)),
+                ("period_start", models.DateTimeField()),
+                ("last_run", models.DateTimeField()),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("valid", models.PositiveIntegerField(default=0)),
+                ("invalid", models.PositiveIntegerField(default=0)),
+                ("no_software", models.PositiveIntegerField(default=0)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="contenttypes.contenttype"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Software Validation Snapshot",
+                "ordering": ("content_type", "group_by", "group_name", "period_start"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="softwarevalidationsnapshot",
+            index=models.Index(
+                fields=["content_type", "group_by", "period_start"], name="nautobot_de_content_ee50a9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarevalidationsnapshot",
+            index=models.Index(fields=["resolution", "period_start"], name="nautobot_de_resolut_18c75e_idx"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0023_softwarevalidationsnapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="devicesoftwareassignment",
+            name="last_updated",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="inventoryitemsoftwareassignment",
+            name="last_updated",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.25 on 2026-10-17 06:56
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of `nautobot_device_lifecycle_mgmt.versions.get_version_sort_key`, so the keys populated by this
+# migration don't change with later versions of the parser
+VERSION_TOKEN_RE = re.compile(r"\d+|[a-z]+")
+EOS_RELEASE_TRAIN_RE = re.compile(r"(?<=\d)[mf]$")
+VERSION_SORT_KEY_LENGTH = 255
+VERSION_NUMBER_WIDTH = 9
+
+
+def get_version_sort_key(version, network_driver=None):
+    """
+    Return the sort key of the `version` of a platform with `network_driver`, encoded as a string.
+    """
+    version = version.strip().lower()
+    if network_driver == "arista_eos":
+        version = EOS_RELEASE_TRAIN_RE.sub("", version)
+    max_number = 10**VERSION_NUMBER_WIDTH - 1
+
+    return "".join(
+        f"1{min(int(token), max_number):0{VERSION_NUMBER_WIDTH}d}" if token.isdigit() else f"0{token}"
+        for token in VERSION_TOKEN_RE.findall(version)
+    )[:VERSION_SORT_KEY_LENGTH]
+
+
+def populate_version_sort_keys(apps, schema_editor):
+    """
+    Populate the version sort keys of the existing software, parsed for the network driver of their platform.
+    """
+    SoftwareLCM = apps.get_model("nautobot_device_lifecycle_mgmt", "SoftwareLCM")
+
+    softwares = []
+    for software in SoftwareLCM.objects.select_related("device_platform").iterator():
+        software.version_sort_key = get_version_sort_key(software.version, software.device_platform.network_driver)
+        softwares.append(software)
+    SoftwareLCM.objects.bulk_update(softwares, ["version_sort_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0024_software_assignment_last_updated"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="softwarelcm",
+            options={
+                "ordering": ("device_platform", "version_sort_key", "end_of_support", "release_date"),
+                "verbose_name": "Software",
+            },
+        ),
+        migrations.AddField(
+            model_name="softwarelcm",
+            name="version_sort_key",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="softwarelcm",
+            index=models.Index(fields=["device_platform", "version_sort_key"], name="nautobot_de_device__7bb813_idx"),
+        ),
+        migrations.RunPython(populate_version_sort_keys, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,8 @@ from django.conf import settings
 # from django.urls import reverse
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Exists, F, OuterRef, Q
+from nautobot.core.models import BaseModel
 from nautobot.core.models.generics import OrganizationalModel, PrimaryModel
 from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.dcim.models import Device, DeviceType, InventoryItem
@@ -15,13 +17,20 @@ from nautobot.extras.utils import extras_features
 
 from nautobot_device_lifecycle_mgmt import choices
 from nautobot_device_lifecycle_mgmt.software_filters import (
+    DeviceSoftwareBatchFilter,
     DeviceSoftwareFilter,
+    DeviceSoftwareImageBatchFilter,
     DeviceSoftwareImageFilter,
+    DeviceValidatedSoftwareBatchFilter,
     DeviceValidatedSoftwareFilter,
+    InventoryItemSoftwareBatchFilter,
     InventoryItemSoftwareFilter,
+    InventoryItemSoftwareImageBatchFilter,
     InventoryItemSoftwareImageFilter,
+    InventoryItemValidatedSoftwareBatchFilter,
     InventoryItemValidatedSoftwareFilter,
 )
+from nautobot_device_lifecycle_mgmt.versions import VERSION_NORMALIZERS, VERSION_SORT_KEY_LENGTH, get_version_sort_key
 
 
 @extras_features(
@@ -142,6 +151,45 @@ class SoftwareLCMQuerySet(RestrictedQuerySet):
 
         return qs
 
+    def get_for_objects(self, queryset):
+        """Return mapping of object pk to the `SoftwareLCM` assigned to it, for all objects in the given queryset.
+
+        Objects without assigned software are left out of the mapping.
+        """
+        if not isinstance(queryset, models.QuerySet):
+            raise TypeError(f"{queryset} is not an instance of Django QuerySet class")
+        if issubclass(queryset.model, Device):
+            return DeviceSoftwareBatchFilter(qs=self, items_qs=queryset).resolve()
+        if issubclass(queryset.model, InventoryItem):
+            return InventoryItemSoftwareBatchFilter(qs=self, items_qs=queryset).resolve()
+
+        raise TypeError(f"{queryset.model.__name__} objects can't have software assigned")
+
+    def filter_version(self, lookup, version):
+        """Return the `SoftwareLCM` whose version compares to `version` with `lookup`, e.g. "gt", on its platform.
+
+        The comparison uses the indexed version sort key, `version` is parsed for each platform version format.
+        """
+        network_drivers = list(VERSION_NORMALIZERS)
+        version_filter = Q(**{f"version_sort_key__{lookup}": get_version_sort_key(version)}) & ~Q(
+            device_platform__network_driver__in=network_drivers
+        )
+        for network_driver in network_drivers:
+            version_filter |= Q(
+                device_platform__network_driver=network_driver,
+                **{f"version_sort_key__{lookup}": get_version_sort_key(version, network_driver)},
+            )
+
+        return self.filter(version_filter)
+
+    def latest_versions(self):
+        """Return the `SoftwareLCM` with the newest version of their platform."""
+        newer_software = SoftwareLCM.objects.filter(
+            device_platform=OuterRef("device_platform"), version_sort_key__gt=OuterRef("version_sort_key")
+        )
+
+        return self.exclude(Exists(newer_software))
+
 
 @extras_features(
     "custom_fields",
@@ -164,21 +212,29 @@ class SoftwareLCM(PrimaryModel):
     documentation_url = models.URLField(blank=True, verbose_name="Documentation URL")
     long_term_support = models.BooleanField(verbose_name="Long Term Support", default=False)
     pre_release = models.BooleanField(verbose_name="Pre-Release", default=False)
+    # Computed from the version by `get_version_sort_key`, the versions of a platform are ordered by it
+    version_sort_key = models.CharField(max_length=VERSION_SORT_KEY_LENGTH, default="", editable=False)
 
     class Meta:
         """Meta attributes for SoftwareLCM."""
 
         verbose_name = "Software"
-        ordering = ("device_platform", "version", "end_of_support", "release_date")
+        ordering = ("device_platform", "version_sort_key", "end_of_support", "release_date")
         unique_together = (
             "device_platform",
             "version",
         )
+        indexes = [models.Index(fields=["device_platform", "version_sort_key"])]
 
     def __str__(self):
         """String representation of SoftwareLCM."""
         return f"{self.device_platform} - {self.version}"
 
+    def save(self, *args, **kwargs):
+        """Override save to compute the version sort key."""
+        self.version_sort_key = get_version_sort_key(self.version, self.device_platform.network_driver)
+        super().save(*args, **kwargs)
+
     objects = SoftwareLCMQuerySet.as_manager()
 
 
@@ -198,6 +254,21 @@ class SoftwareImageLCMQuerySet(RestrictedQuerySet):
 
         return qs
 
+    def get_for_objects(self, queryset):
+        """Return mapping of object pk to the list of `SoftwareImageLCM` resolved for it.
+
+        Batch variant of `get_for_object`, applies the same precedence to all objects in the given queryset
+        using a fixed number of queries.
+        """
+        if not isinstance(queryset, models.QuerySet):
+            raise TypeError(f"{queryset} is not an instance of Django QuerySet class")
+        if issubclass(queryset.model, Device):
+            return DeviceSoftwareImageBatchFilter(qs=self, items_qs=queryset).resolve()
+        if issubclass(queryset.model, InventoryItem):
+            return InventoryItemSoftwareImageBatchFilter(qs=self, items_qs=queryset).resolve()
+
+        raise TypeError(f"{queryset.model.__name__} objects can't have software images assigned")
+
 
 @extras_features(
     "custom_fields",
@@ -257,6 +328,27 @@ class ValidatedSoftwareLCMQuerySet(RestrictedQuerySet):
 
         return qs
 
+    def get_for_objects(self, queryset):
+        """Return mapping of object pk to the list of `ValidatedSoftwareLCM` assigned to it.
+
+        Batch variant of `get_for_object`, resolves all objects in the given queryset using a fixed number of queries.
+        For Device and InventoryItem objects the lists are weighted and ordered the same way as in `get_for_object`.
+        """
+        if not isinstance(queryset, models.QuerySet):
+            raise TypeError(f"{queryset} is not an instance of Django QuerySet class")
+        if issubclass(queryset.model, Device):
+            return DeviceValidatedSoftwareBatchFilter(qs=self, items_qs=queryset).resolve()
+        if issubclass(queryset.model, InventoryItem):
+            return InventoryItemValidatedSoftwareBatchFilter(qs=self, items_qs=queryset).resolve()
+        if issubclass(queryset.model, DeviceType):
+            results = {device_type_pk: [] for device_type_pk in queryset.values_list("pk", flat=True)}
+            for validated_soft in self.filter(device_types__in=queryset).annotate(device_type_pk=F("device_types")):
+                results[validated_soft.device_type_pk].append(validated_soft)
+            return results
+
+        validated_software = list(self)
+        return {obj_pk: list(validated_software) for obj_pk in queryset.values_list("pk", flat=True)}
+
 
 @extras_features(
     "custom_fields",
@@ -401,6 +493,135 @@ class InventoryItemSoftwareValidationResult(PrimaryModel):
         return msg
 
 
+class SoftwareValidationSummary(BaseModel):
+    """Software validation results of Devices or InventoryItems aggregated by one of their attributes.
+
+    Replaced at the end of every validation run, so the reports don't have to aggregate all results on each view.
+    """
+
+    content_type = models.ForeignKey(to="contenttypes.ContentType", on_delete=models.CASCADE, related_name="+")
+    group_by = models.CharField(max_length=50, choices=choices.ValidationSummaryGroupChoices)
+    group_id = models.UUIDField(null=True, blank=True)
+    group_name = models.CharField(max_length=255, blank=True, default="")
+    total = models.PositiveIntegerField(default=0)
+    valid = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    no_software = models.PositiveIntegerField(default=0)
+    last_run = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """Meta attributes for SoftwareValidationSummary."""
+
+        verbose_name = "Software Validation Summary"
+        verbose_name_plural = "Software Validation Summaries"
+        ordering = ("content_type", "group_by", "group_name")
+        indexes = [models.Index(fields=["content_type", "group_by"])]
+
+    def __str__(self):
+        """String representation of SoftwareValidationSummary."""
+        return f"{self.content_type.model} - {self.get_group_by_display()}: {self.group_name}"
+
+    @property
+    def valid_percent(self):
+        """Return percentage of the validated objects."""
+        if not self.total:
+            return 0
+
+        return round(self.valid / self.total * 100, 2)
+
+
+class SoftwareValidationSnapshot(BaseModel):
+    """Software validation results of Devices or InventoryItems aggregated by one of their attributes at a point in time.
+
+    Recorded from the SoftwareValidationSummary objects at the end of every validation run, and downsampled to daily,
+    weekly and monthly points as they age, to report the compliance over time.
+    """
+
+    content_type = models.ForeignKey(to="contenttypes.ContentType", on_delete=models.CASCADE, related_name="+")
+    group_by = models.CharField(max_length=50, choices=choices.ValidationSummaryGroupChoices)
+    group_id = models.UUIDField(null=True, blank=True)
+    group_name = models.CharField(max_length=255, blank=True, default="")
+    resolution = models.CharField(
+        max_length=50, choices=choices.SnapshotResolutionChoices, default=choices.SnapshotResolutionChoices.RUN
+    )
+    period_start = models.DateTimeField()
+    last_run = models.DateTimeField()
+    total = models.PositiveIntegerField(default=0)
+    valid = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    no_software = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """Meta attributes for SoftwareValidationSnapshot."""
+
+        verbose_name = "Software Validation Snapshot"
+        ordering = ("content_type", "group_by", "group_name", "period_start")
+        indexes = [
+            models.Index(fields=["content_type", "group_by", "period_start"]),
+            models.Index(fields=["resolution", "period_start"]),
+        ]
+
+    def __str__(self):
+        """String representation of SoftwareValidationSnapshot."""
+        return f"{self.content_type.model} - {self.get_group_by_display()}: {self.group_name} - {self.period_start}"
+
+    @property
+    def valid_percent(self):
+        """Return percentage of the validated objects."""
+        if not self.total:
+            return 0
+
+        return round(self.valid / self.total * 100, 2)
+
+
+class DeviceSoftwareAssignment(BaseModel):
+    """Software assigned to a Device, denormalized from the `device_soft` RelationshipAssociations.
+
+    Kept in sync by signals, the associations updated with `QuerySet.update()` are only resynced by the software
+    validation and vulnerability generation jobs, see `sync_software_assignments`.
+    """
+
+    device = models.OneToOneField(to="dcim.Device", on_delete=models.CASCADE, related_name="software_assignment")
+    software = models.ForeignKey(to="SoftwareLCM", on_delete=models.CASCADE, related_name="device_assignments")
+    # Tracks the assignment changes processed by incremental vulnerability generation runs
+    last_updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        """Meta attributes for DeviceSoftwareAssignment."""
+
+        verbose_name = "Device Software Assignment"
+        ordering = ("device",)
+
+    def __str__(self):
+        """String representation of DeviceSoftwareAssignment."""
+        return f"Device: {self.device} - Software: {self.software}"
+
+
+class InventoryItemSoftwareAssignment(BaseModel):
+    """Software assigned to an InventoryItem, denormalized from the `inventory_item_soft` RelationshipAssociations.
+
+    Kept in sync by signals, the associations updated with `QuerySet.update()` are only resynced by the software
+    validation and vulnerability generation jobs, see `sync_software_assignments`.
+    """
+
+    inventory_item = models.OneToOneField(
+        to="dcim.InventoryItem", on_delete=models.CASCADE, related_name="software_assignment"
+    )
+    software = models.ForeignKey(to="SoftwareLCM", on_delete=models.CASCADE, related_name="inventory_item_assignments")
+    # Tracks the assignment changes processed by incremental vulnerability generation runs
+    last_updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        """Meta attributes for InventoryItemSoftwareAssignment."""
+
+        verbose_name = "Inventory Item Software Assignment"
+        ordering = ("inventory_item",)
+
+    def __str__(self):
+        """String representation of InventoryItemSoftwareAssignment."""
+        return f"Inventory Item: {self.inventory_item} - Software: {self.software}"
+
+
 @extras_features(
     "custom_fields",
     "custom_links",
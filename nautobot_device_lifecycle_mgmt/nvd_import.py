@@ -0,0 +1,355 @@
+"""Offline import of the CVE records of NVD JSON 1.1 and 2.0 feed files into CVELCM objects.
+
+Feed files are parsed as a stream, one CVE record at a time, so yearly feeds of several gigabytes are never fully
+loaded in memory. The records are upserted in batches on the CVE name.
+"""
+import gzip
+import json
+import logging
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.models import CVELCM
+from nautobot_device_lifecycle_mgmt.version_matching import VersionRange, link_affected_softwares
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+logger = logging.getLogger("nautobot_device_lifecycle_mgmt")
+
+CVE_BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 1024 * 1024
+# Largest JSON value decoded at once, a CVE record of the feeds is a few KB
+MAX_VALUE_SIZE = 16 * 1024 * 1024
+NVD_CVE_URL = "https://nvd.nist.gov/vuln/detail/{}"
+# Keys of the arrays of CVE records in the NVD JSON 1.1 and 2.0 feeds
+FEED_ITEMS_KEYS = ("CVE_Items", "vulnerabilities")
+# Fields set from the feeds, the other fields of the existing CVEs are kept
+CVE_FEED_FIELDS = ("published_date", "link", "severity", "cvss", "cvss_v2", "cvss_v3")
+# CVSS v3 metrics of the NVD JSON 2.0 feeds, from the most to the least recent version
+CVSS_V3_METRICS = ("cvssMetricV31", "cvssMetricV30")
+WHITESPACE = " \t\n\r"
+# Network drivers of the platforms running the products of the CPEs, by CPE "vendor:product"
+DEFAULT_CPE_NETWORK_DRIVERS = {
+    "arista:eos": "arista_eos",
+    "cisco:adaptive_security_appliance_software": "cisco_asa",
+    "cisco:ios": "cisco_ios",
+    "cisco:ios_xe": "cisco_xe",
+    "cisco:ios_xr": "cisco_xr",
+    "cisco:nx-os": "cisco_nxos",
+    "juniper:junos": "juniper_junos",
+    "paloaltonetworks:pan-os": "paloalto_panos",
+}
+# CPE 2.3 names are split on the colons not escaped by a backslash
+CPE_SEPARATOR_RE = re.compile(r"(?<!\\):")
+
+
+class FeedFormatError(ValueError):
+    """Raised when a feed file is not an NVD JSON 1.1 or 2.0 feed."""
+
+
+class JSONStreamReader:
+    """Decodes the values of a JSON document one at a time from a text file, reading it by chunks."""
+
+    def __init__(self, file, chunk_size=READ_CHUNK_SIZE, max_value_size=MAX_VALUE_SIZE):
+        """Initialize JSONStreamReader object."""
+        self.file = file
+        self.chunk_size = chunk_size
+        self.max_value_size = max_value_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_chunk(self):
+        """Append the next chunk of the file to the buffer, dropping the consumed part. Returns False at the end."""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        consumed, self.pos = self.pos, 0
+        self.buffer = self.buffer[consumed:] + chunk
+        return True
+
+    def next_char(self):
+        """Skip the whitespace and return the next character, without consuming it. Returns "" at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.read_chunk():
+                return self.buffer[self.pos] if self.pos < len(self.buffer) else ""
+
+    def expect(self, char):
+        """Consume the next character, raise FeedFormatError if it isn't `char`."""
+        if self.next_char() != char:
+            raise FeedFormatError(f"Expected {char!r} at character {self.pos}.")
+        self.pos += 1
+
+    def decode(self):
+        """Decode and consume the next JSON value."""
+        self.next_char()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as err:
+                # Malformed input would otherwise be buffered until the end of the file
+                if len(self.buffer) - self.pos > self.max_value_size:
+                    raise FeedFormatError(
+                        f"Invalid JSON or value larger than {self.max_value_size} characters: {err}"
+                    ) from err
+                if self.read_chunk():
+                    continue
+                raise FeedFormatError(f"Invalid JSON: {err}") from err
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.read_chunk():
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """Decode and consume the values of the next JSON array, one at a time."""
+        self.expect("[")
+        if self.next_char() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.next_char() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+    def iter_object_array(self, keys):
+        """Yield the values of the array of the first of `keys` found in the next JSON object.
+
+        The values of the other keys of the object are decoded and skipped, they're expected to be small.
+        """
+        self.expect("{")
+        while self.next_char() != "}":
+            key = self.decode()
+            self.expect(":")
+            if key in keys:
+                yield from self.iter_array()
+                return
+            self.decode()
+            if self.next_char() == ",":
+                self.pos += 1
+
+        raise FeedFormatError(f"None of {', '.join(keys)} found in the feed.")
+
+
+def open_feed(path):
+    """Open the feed file at `path` as text, decompressing gzip files."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return open(path, "r", encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+def get_severity(severity):
+    """Return the CVESeverityChoices value of an NVD severity, e.g. "CRITICAL"."""
+    severity = (severity or "").title()
+
+    return severity if severity in choices.CVESeverityChoices.values() else choices.CVESeverityChoices.NONE
+
+
+def parse_feed_item_v1(item):
+    """Return the CVELCM field values of a CVE record of an NVD JSON 1.1 feed."""
+    impact = item.get("impact", {})
+    cvss_v3 = impact.get("baseMetricV3", {}).get("cvssV3", {})
+    base_metric_v2 = impact.get("baseMetricV2", {})
+
+    return {
+        "name": item["cve"]["CVE_data_meta"]["ID"],
+        "published_date": item["publishedDate"],
+        "severity": cvss_v3.get("baseSeverity") or base_metric_v2.get("severity"),
+        "cvss_v2": base_metric_v2.get("cvssV2", {}).get("baseScore"),
+        "cvss_v3": cvss_v3.get("baseScore"),
+    }
+
+
+def get_primary_metric(metrics):
+    """Return the primary metric of an NVD JSON 2.0 metrics list, its first metric if there is no primary one."""
+    return next((metric for metric in metrics if metric.get("type") == "Primary"), metrics[0] if metrics else {})
+
+
+def parse_feed_item_v2(item):
+    """Return the CVELCM field values of a CVE record of an NVD JSON 2.0 feed."""
+    cve = item["cve"]
+    metrics = cve.get("metrics", {})
+    cvss_v3 = next(
+        (get_primary_metric(metrics[key])["cvssData"] for key in CVSS_V3_METRICS if metrics.get(key)),
+        {},
+    )
+    metric_v2 = get_primary_metric(metrics.get("cvssMetricV2", []))
+
+    return {
+        "name": cve["id"],
+        "published_date": cve["published"],
+        "severity": cvss_v3.get("baseSeverity") or metric_v2.get("baseSeverity"),
+        "cvss_v2": metric_v2.get("cvssData", {}).get("baseScore"),
+        "cvss_v3": cvss_v3.get("baseScore"),
+    }
+
+
+def parse_feed_item(item):
+    """Return the CVELCM field values of a CVE record of an NVD JSON 1.1 or 2.0 feed."""
+    values = parse_feed_item_v1(item) if "CVE_data_meta" in item.get("cve", {}) else parse_feed_item_v2(item)
+    values["published_date"] = date.fromisoformat(values["published_date"][:10])
+    values["link"] = NVD_CVE_URL.format(values["name"])
+    values["severity"] = get_severity(values["severity"])
+    # The base score is the most recent CVSS version scored
+    values["cvss"] = values["cvss_v3"] if values["cvss_v3"] is not None else values["cvss_v2"]
+
+    return values
+
+
+def get_cpe_network_drivers():
+    """Return the network drivers of the CPE products, from the defaults and the `nvd_cpe_network_drivers` setting."""
+    return {**DEFAULT_CPE_NETWORK_DRIVERS, **PLUGIN_CFG.get("nvd_cpe_network_drivers", {})}
+
+
+def iter_cpe_matches(nodes):
+    """Yield the CPE matches of NVD JSON 1.1 or 2.0 configuration nodes and of their children."""
+    for node in nodes:
+        yield from node.get("cpe_match", node.get("cpeMatch", []))
+        yield from iter_cpe_matches(node.get("children", []))
+
+
+def parse_cpe_match(cpe_match, cpe_network_drivers):
+    """Return the network driver and the VersionRange of a vulnerable CPE match, None if its product isn't mapped.
+
+    CPEs with a version match that version, CPEs with any version match the version range of the CPE match.
+    """
+    if not cpe_match.get("vulnerable"):
+        return None
+    # cpe:2.3:part:vendor:product:version:...
+    cpe = CPE_SEPARATOR_RE.split(cpe_match.get("cpe23Uri") or cpe_match["criteria"])
+    network_driver = cpe_network_drivers.get(f"{cpe[3]}:{cpe[4]}")
+    # "-" means the product has no versions
+    if network_driver is None or cpe[5] == "-":
+        return None
+    if cpe[5] != "*":
+        version = cpe[5].replace("\\", "")
+        return network_driver, VersionRange(version, version)
+
+    return network_driver, VersionRange(
+        start=cpe_match.get("versionStartIncluding") or cpe_match.get("versionStartExcluding"),
+        end=cpe_match.get("versionEndIncluding") or cpe_match.get("versionEndExcluding"),
+        start_inclusive="versionStartExcluding" not in cpe_match,
+        end_inclusive="versionEndExcluding" not in cpe_match,
+    )
+
+
+def parse_feed_ranges(item, cpe_network_drivers):
+    """Return the (network driver, VersionRange) pairs of the software affected by a CVE record of an NVD feed."""
+    if "CVE_data_meta" in item.get("cve", {}):
+        nodes = item.get("configurations", {}).get("nodes", [])
+    else:
+        nodes = [node for configuration in item["cve"].get("configurations", []) for node in configuration["nodes"]]
+    cpe_ranges = (parse_cpe_match(cpe_match, cpe_network_drivers) for cpe_match in iter_cpe_matches(nodes))
+
+    return [cpe_range for cpe_range in cpe_ranges if cpe_range is not None]
+
+
+def iter_feed_cves(file, cpe_network_drivers=None):
+    """Yield the CVELCM field values of the CVE records of an NVD JSON 1.1 or 2.0 feed file, one at a time.
+
+    With `cpe_network_drivers`, the values include the `affected_ranges` of the CVE, see `parse_feed_ranges`.
+    """
+    for item in JSONStreamReader(file).iter_object_array(FEED_ITEMS_KEYS):
+        try:
+            values = parse_feed_item(item)
+            if cpe_network_drivers is not None:
+                values["affected_ranges"] = parse_feed_ranges(item, cpe_network_drivers)
+        except (KeyError, TypeError, ValueError) as err:
+            logger.warning("Skipped an invalid CVE record: %s", err)
+            continue
+        if len(values["name"]) > CVELCM._meta.get_field("name").max_length:
+            logger.warning("Skipped %s, the CVE name is too long.", values["name"])
+            continue
+        yield values
+
+
+def upsert_cves(cves_values):
+    """Create the CVEs of `cves_values` missing by name and update the existing ones whose feed fields changed.
+
+    Returns:
+        tuple: Number of created and updated CVEs
+    """
+    # The last record of a CVE wins, feeds may be imported together with their updates
+    cves_values = {values["name"]: values for values in cves_values}
+    existing_cves = {cve.name: cve for cve in CVELCM.objects.filter(name__in=cves_values)}
+    now = timezone.now()
+    created = []
+    updated = []
+    for name, values in cves_values.items():
+        cve = existing_cves.get(name)
+        if cve is None:
+            created.append(CVELCM(name=name, **{field: values[field] for field in CVE_FEED_FIELDS}))
+        elif any(getattr(cve, field) != values[field] for field in CVE_FEED_FIELDS):
+            for field in CVE_FEED_FIELDS:
+                setattr(cve, field, values[field])
+            # Bulk updates don't set `last_updated`, which incremental vulnerability generation runs rely on
+            cve.last_updated = now
+            updated.append(cve)
+
+    with transaction.atomic():
+        CVELCM.objects.bulk_create(created)
+        CVELCM.objects.bulk_update(updated, [*CVE_FEED_FIELDS, "last_updated"])
+
+    return len(created), len(updated)
+
+
+def link_cves(cves_values, software_index):
+    """Link the CVEs of `cves_values` to the software of `software_index` within their affected ranges.
+
+    Returns:
+        int: Number of links added
+    """
+    cve_pks = dict(CVELCM.objects.filter(name__in=[values["name"] for values in cves_values]).values_list("name", "pk"))
+
+    return link_affected_softwares(
+        (cve_pks[values["name"]], software_pk)
+        for values in cves_values
+        for network_driver, version_range in values["affected_ranges"]
+        for software_pk in software_index.match_network_driver(network_driver, version_range)
+    )
+
+
+def import_batch(cves_values, software_index=None):
+    """Upsert a batch of CVEs and link them to the software of `software_index`, if any.
+
+    Returns:
+        tuple: Number of created and updated CVEs, and of links added
+    """
+    created, updated = upsert_cves(cves_values)
+    linked = link_cves(cves_values, software_index) if software_index is not None else 0
+
+    return created, updated, linked
+
+
+def import_feed(file, batch_size=CVE_BATCH_SIZE, software_index=None):
+    """Upsert the CVEs of an NVD JSON 1.1 or 2.0 feed file in batches of `batch_size` records.
+
+    With a SoftwareVersionIndex `software_index`, the CVEs are also linked to its software whose platform and
+    version match the CPEs of the CVE, the network drivers of the CPE products are set by `get_cpe_network_drivers`.
+    Existing links are kept.
+
+    Returns:
+        tuple: Number of created and updated CVEs, and of links added
+    """
+    cpe_network_drivers = get_cpe_network_drivers() if software_index is not None else None
+    counts = (0, 0, 0)
+    batch = []
+    for values in iter_feed_cves(file, cpe_network_drivers=cpe_network_drivers):
+        batch.append(values)
+        if len(batch) >= batch_size:
+            counts = tuple(map(sum, zip(counts, import_batch(batch, software_index))))
+            batch = []
+
+    return tuple(map(sum, zip(counts, import_batch(batch, software_index))))
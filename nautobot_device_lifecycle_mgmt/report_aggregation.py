@@ -0,0 +1,103 @@
+"""Aggregation of the software validation results of the reports, in total and per group, in a single query."""
+from itertools import islice
+
+from django.db import connections
+from django.db.models import Count, F, Q
+
+COUNT_NAMES = ("total", "valid", "invalid", "no_software")
+
+
+def get_validation_counts(field):
+    """Return the aggregations counting the validation results by their state, as used by the reports."""
+    return {
+        "total": Count(field),
+        "valid": Count(field, filter=Q(is_validated=True)),
+        "invalid": Count(field, filter=Q(is_validated=False) & ~Q(software=None)),
+        "no_software": Count(field, filter=Q(software=None)),
+    }
+
+
+def aggregate_validation_results(results_qs, groupings):
+    """Return the validation counts of `results_qs` in total and per group of each of the `groupings`.
+
+    PostgreSQL computes all groupings in one pass over the results with GROUPING SETS, other databases run a query
+    per grouping.
+
+    Args:
+        results_qs (QuerySet): DeviceSoftwareValidationResult or InventoryItemSoftwareValidationResult objects
+        groupings (dict): Mapping of the grouping name to the tuple of fields the results are grouped by
+
+    Returns:
+        dict: "all" maps to the dict of the total counts, each grouping name to the list of dicts of the grouping
+            fields values and counts of the groups
+    """
+    results_qs = results_qs.order_by()
+    if results_qs.query.is_empty():
+        # The SQL of an empty queryset can't be compiled, e.g. for the `none()` queryset of invalid report filters
+        return {"all": dict.fromkeys(COUNT_NAMES, 0), **{grouping_name: [] for grouping_name in groupings}}
+    if connections[results_qs.db].vendor == "postgresql":
+        return _aggregate_grouping_sets(results_qs, groupings)
+
+    aggregation = {"all": results_qs.aggregate(**get_validation_counts("pk"))}
+    for grouping_name, fields in groupings.items():
+        aggregation[grouping_name] = list(results_qs.values(*fields).annotate(**get_validation_counts("pk")))
+
+    return aggregation
+
+
+def _get_grouping_sets_sql(results_qs, groupings, fields):
+    """Return the SQL and params of the GROUPING SETS query aggregating `results_qs` by `groupings`.
+
+    The selected columns are the values of `fields`, the GROUPING() bitmask and the counts of COUNT_NAMES. The inner
+    query selects the pk of the results, so the DISTINCT of filterset querysets doesn't merge identical results.
+    """
+    quote_name = connections[results_qs.db].ops.quote_name
+    aliases = {field: f"group_{index}" for index, field in enumerate(fields)}
+    inner_qs = results_qs.annotate(
+        result_validated=F("is_validated"),
+        result_software=F("software"),
+        **{alias: F(field) for field, alias in aliases.items()},
+    ).values("pk", "result_validated", "result_software", *aliases.values())
+    inner_sql, params = inner_qs.query.get_compiler(using=results_qs.db).as_sql()
+
+    columns = ", ".join(quote_name(alias) for alias in aliases.values())
+    grouping_sets = ", ".join(
+        "(" + ", ".join(quote_name(aliases[field]) for field in grouping_fields) + ")"
+        for grouping_fields in groupings.values()
+    )
+    sql = (
+        f"SELECT {columns}, GROUPING({columns}), "
+        "COUNT(*), "
+        "COUNT(*) FILTER (WHERE result_validated), "
+        "COUNT(*) FILTER (WHERE NOT result_validated AND result_software IS NOT NULL), "
+        "COUNT(*) FILTER (WHERE result_software IS NULL) "
+        f"FROM ({inner_sql}) AS results GROUP BY GROUPING SETS ((), {grouping_sets})"
+    )
+
+    return sql, params
+
+
+def _aggregate_grouping_sets(results_qs, groupings):
+    """Return the aggregation of `aggregate_validation_results` computed by a single GROUPING SETS query."""
+    fields = list(dict.fromkeys(field for grouping_fields in groupings.values() for field in grouping_fields))
+    # GROUPING() sets the bit of every column not grouped by, the first column being the most significant bit
+    grouping_masks = {}
+    for grouping_name, grouping_fields in groupings.items():
+        mask = sum(1 << (len(fields) - 1 - index) for index, field in enumerate(fields) if field not in grouping_fields)
+        grouping_masks.setdefault(mask, []).append(grouping_name)
+    all_mask = (1 << len(fields)) - 1
+
+    aggregation = {"all": dict.fromkeys(COUNT_NAMES, 0)}
+    aggregation.update({grouping_name: [] for grouping_name in groupings})
+    with connections[results_qs.db].cursor() as cursor:
+        cursor.execute(*_get_grouping_sets_sql(results_qs, groupings, fields))
+        for row in cursor.fetchall():
+            values, mask = row[: len(fields)], row[len(fields)]
+            counts = dict(zip(COUNT_NAMES, islice(row, len(fields) + 1, None)))
+            if mask == all_mask:
+                aggregation["all"] = counts
+            for grouping_name in grouping_masks.get(mask, ()):
+                group = {field: value for field, value in zip(fields, values) if field in groupings[grouping_name]}
+                aggregation[grouping_name].append({**group, **counts})
+
+    return aggregation
@@ -1,11 +1,28 @@
 """Custom signals for the Lifecycle Management app."""
 
 from django.apps import apps as global_apps
-from django.db.models.signals import pre_delete
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 from nautobot.extras.choices import RelationshipTypeChoices
 from nautobot.extras.models import Relationship, RelationshipAssociation
 
+from nautobot_device_lifecycle_mgmt.models import (
+    CVELCM,
+    DeviceSoftwareAssignment,
+    InventoryItemSoftwareAssignment,
+    ValidatedSoftwareLCM,
+)
+from nautobot_device_lifecycle_mgmt.software_index import ValidatedSoftwareIndex
+from nautobot_device_lifecycle_mgmt.versions import get_version_sort_key
+
+# Maps the software relationship keys to the assignment model and its object field
+SOFTWARE_ASSIGNMENT_MODELS = {
+    "device_soft": (DeviceSoftwareAssignment, "device_id"),
+    "inventory_item_soft": (InventoryItemSoftwareAssignment, "inventory_item_id"),
+}
+
 
 def post_migrate_create_relationships(sender, apps=global_apps, **kwargs):  # pylint: disable=unused-argument
     """Callback function for post_migrate() -- create Relationship records."""
@@ -69,3 +86,108 @@ def delete_inventory_item_software_relationship(sender, instance, **kwargs):  #
     """Delete InventoryItem relationship to SoftwareLCM object."""
     soft_relationships = Relationship.objects.filter(key__in=("device_soft", "inventory_item_soft"))
     RelationshipAssociation.objects.filter(relationship__in=soft_relationships, destination_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=ValidatedSoftwareLCM)
+@receiver(post_delete, sender=ValidatedSoftwareLCM)
+@receiver(m2m_changed, sender=ValidatedSoftwareLCM.devices.through)
+@receiver(m2m_changed, sender=ValidatedSoftwareLCM.device_types.through)
+@receiver(m2m_changed, sender=ValidatedSoftwareLCM.device_roles.through)
+@receiver(m2m_changed, sender=ValidatedSoftwareLCM.inventory_items.through)
+@receiver(m2m_changed, sender=ValidatedSoftwareLCM.object_tags.through)
+def invalidate_validated_software_index(sender, using, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the shared ValidatedSoftwareIndex once the rule changes are committed."""
+    ValidatedSoftwareIndex.invalidate_on_commit(using)
+
+
+def sync_software_assignments():
+    """Resync the software assignment tables with the `device_soft` and `inventory_item_soft` associations.
+
+    Associations changed with queryset operations, e.g. `QuerySet.update()`, send no signals and leave their assignments
+    stale. The assignments not matching an association are deleted and the missing ones are created.
+
+    Returns:
+        int: Number of the deleted and created assignments
+    """
+    changed_count = 0
+    for relationship_key, (assignment_model, item_field) in SOFTWARE_ASSIGNMENT_MODELS.items():
+        associations = RelationshipAssociation.objects.filter(
+            relationship__key=relationship_key,
+            source_id__in=assignment_model._meta.get_field("software").related_model.objects.values("pk"),
+            destination_id__in=assignment_model._meta.get_field(item_field).related_model.objects.values("pk"),
+        )
+        deleted_count, _ = assignment_model.objects.exclude(
+            Exists(associations.filter(destination_id=OuterRef(item_field), source_id=OuterRef("software_id")))
+        ).delete()
+        missing_assignments = associations.exclude(
+            Exists(
+                assignment_model.objects.filter(
+                    **{item_field: OuterRef("destination_id"), "software_id": OuterRef("source_id")}
+                )
+            )
+        ).values_list("destination_id", "source_id")
+        created_assignments = assignment_model.objects.bulk_create(
+            [
+                assignment_model(**{item_field: item_id, "software_id": software_id})
+                for item_id, software_id in missing_assignments
+            ],
+            batch_size=1000,
+        )
+        changed_count += deleted_count + len(created_assignments)
+
+    return changed_count
+
+
+@receiver(post_save, sender=RelationshipAssociation)
+def sync_software_assignment(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """Create or update the software assignment matching a saved `device_soft` or `inventory_item_soft` association.
+
+    Associations updated with `QuerySet.update()` don't send this signal, see `sync_software_assignments`.
+    """
+    if raw or instance.relationship.key not in SOFTWARE_ASSIGNMENT_MODELS:
+        return
+    assignment_model, item_field = SOFTWARE_ASSIGNMENT_MODELS[instance.relationship.key]
+    assignment_model.objects.update_or_create(
+        **{item_field: instance.destination_id}, defaults={"software_id": instance.source_id}
+    )
+
+
+@receiver(post_delete, sender=RelationshipAssociation)
+def delete_software_assignment(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Delete the software assignment matching a deleted `device_soft` or `inventory_item_soft` association.
+
+    Associations deleted with `QuerySet.delete()` send this signal, unlike the ones updated with `QuerySet.update()`.
+    """
+    if instance.relationship.key not in SOFTWARE_ASSIGNMENT_MODELS:
+        return
+    assignment_model, item_field = SOFTWARE_ASSIGNMENT_MODELS[instance.relationship.key]
+    assignment_model.objects.filter(**{item_field: instance.destination_id, "software_id": instance.source_id}).delete()
+
+
+@receiver(m2m_changed, sender=CVELCM.affected_softwares.through)
+def touch_changed_cves(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """Update `last_updated` of the CVEs whose affected softwares changed, to be processed by incremental runs."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        cves = CVELCM.objects.filter(pk=instance.pk)
+    elif action == "pre_clear":
+        cves = CVELCM.objects.filter(affected_softwares=instance)
+    else:
+        cves = CVELCM.objects.filter(pk__in=pk_set)
+    cves.update(last_updated=timezone.now())
+
+
+@receiver(post_save, sender="dcim.Platform")
+def update_version_sort_keys(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """Update the version sort keys of the software of a saved platform, they're parsed for its network driver."""
+    if raw:
+        return
+    softwares = instance.softwarelcm_set.only("version", "version_sort_key")
+    changed_softwares = []
+    for software in softwares:
+        version_sort_key = get_version_sort_key(software.version, instance.network_driver)
+        if software.version_sort_key != version_sort_key:
+            software.version_sort_key = version_sort_key
+            changed_softwares.append(software)
+    softwares.model.objects.bulk_update(changed_softwares, ["version_sort_key"], batch_size=1000)
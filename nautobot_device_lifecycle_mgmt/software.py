@@ -1,13 +1,28 @@
 """Django classes and functions handling Software Lifecycle related functionality."""
+import time
+from datetime import date
 
+from django.db import transaction
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
 from nautobot.dcim.models import Device, InventoryItem
-from nautobot.extras.models import RelationshipAssociation
 
-from nautobot_device_lifecycle_mgmt.filters import ValidatedSoftwareLCMFilterSet
-from nautobot_device_lifecycle_mgmt.models import SoftwareLCM, ValidatedSoftwareLCM
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.instrumentation import observe_validation
+from nautobot_device_lifecycle_mgmt.models import (
+    DeviceSoftwareValidationResult,
+    InventoryItemSoftwareValidationResult,
+    SoftwareLCM,
+    SoftwareValidationSummary,
+    ValidatedSoftwareLCM,
+)
+from nautobot_device_lifecycle_mgmt.software_filters import without_tree_fields
 from nautobot_device_lifecycle_mgmt.tables import ValidatedSoftwareLCMTable
 
+BULK_BATCH_SIZE = 1000
+
 
 class ItemSoftware:
     """Base class providing functions for computing SoftwareLCM and ValidatedSoftwareLCM related objects."""
@@ -20,32 +35,30 @@ class ItemSoftware:
         self.item_obj = item_obj
         self.validated_software_qs = ValidatedSoftwareLCM.objects.get_for_object(self.item_obj)
 
-        if self.soft_relation_name:
-            self.software = self.get_software()
-        else:
-            self.software = None
+    @cached_property
+    def software(self):
+        """Software assigned to the object, looked up on first access."""
+        if not self.soft_relation_name:
+            return None
+
+        return self.get_software()
+
+    @cached_property
+    def validated_software(self):
+        """List of ValidatedSoftwareLCM objects assigned to the object, evaluated once on first access."""
+        return list(self.validated_software_qs.select_related("software__device_platform"))
 
     def get_software(self):
         """Get software assigned to the object."""
-        try:
-            obj_soft_relation = RelationshipAssociation.objects.get(
-                relationship__key=self.soft_relation_name,
-                destination_type=ContentType.objects.get_for_model(self.soft_obj_model),
-                destination_id=self.item_obj.id,
-            )
-            obj_soft = SoftwareLCM.objects.get(id=obj_soft_relation.source_id)
-        except (RelationshipAssociation.DoesNotExist, SoftwareLCM.DoesNotExist):  # pylint: disable=no-member
-            obj_soft = None
-
-        return obj_soft
+        return SoftwareLCM.objects.get_for_object(self.item_obj).select_related("device_platform").first()
 
     def get_validated_software_table(self):
         """Returns table of validated software linked to the object."""
-        if not self.validated_software_qs:
+        if not self.validated_software:
             return None
 
         return ValidatedSoftwareLCMTable(
-            list(self.validated_software_qs),
+            self.validated_software,
             orderable=False,
             exclude=(
                 "software",
@@ -56,16 +69,11 @@ class ItemSoftware:
 
     def validate_software(self, preferred_only=False):
         """Validate software against the validated software objects."""
-        if not (self.software and self.validated_software_qs.count()):
-            return False
-
-        validated_software_versions = ValidatedSoftwareLCMFilterSet(
-            {"valid": True}, self.validated_software_qs.filter(software=self.software)
-        ).qs
+        validated_software = self.validated_software
         if preferred_only:
-            validated_software_versions = validated_software_versions.filter(preferred_only=True)
+            validated_software = [validated_soft for validated_soft in validated_software if validated_soft.preferred]
 
-        return validated_software_versions.count() > 0
+        return ItemSoftwareBulkValidator.is_validated(self.software, validated_software, date.today())
 
 
 class DeviceSoftware(ItemSoftware):
@@ -80,3 +88,270 @@ class InventoryItemSoftware(ItemSoftware):
 
     soft_obj_model = InventoryItem
     soft_relation_name = "inventory_item_soft"
+
+
+class ItemSoftwareBulkValidator:
+    """Base class validating software for a batch of objects using a constant number of queries.
+
+    Produces the same results as running `ItemSoftware.validate_software` and `get_for_object` for each object,
+    but loads software assignments, validated software and existing results upfront, evaluates every object in
+    memory and writes the results with bulk operations.
+    """
+
+    item_model = None
+    result_model = None
+    result_item_field = None
+    # Maps ValidatedSoftwareLCM assignment fields to the lookups of the validated objects they match on
+    rule_target_lookups = {}
+    # Maps the summary groups to the result lookups of the group pk and name
+    summary_group_lookups = {}
+
+    def __init__(self, items_qs):
+        """Initialize ItemSoftwareBulkValidator object."""
+        self.items_qs = without_tree_fields(items_qs)
+
+    @staticmethod
+    def is_validated(software, validated_software, today):
+        """Return True if `software` is one of the currently valid `validated_software`."""
+        if not (software and validated_software):
+            return False
+
+        return any(
+            validated_soft.software_id == software.pk
+            and validated_soft.start <= today
+            and (validated_soft.end is None or validated_soft.end >= today)
+            for validated_soft in validated_software
+        )
+
+    def validate(self, last_run, run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN):
+        """Validate software on all objects and store the results. Returns the number of validated objects."""
+        # pylint: disable=not-callable, too-many-locals
+        start_time = time.monotonic()
+        softwares = SoftwareLCM.objects.get_for_objects(self.items_qs)
+        validated_softwares = ValidatedSoftwareLCM.objects.get_for_objects(self.items_qs)
+        item_field_id = f"{self.result_item_field}_id"
+        results = {
+            getattr(result, item_field_id): result
+            for result in self.result_model.objects.filter(**{f"{self.result_item_field}__in": self.items_qs})
+        }
+        today = date.today()
+        now = timezone.now()
+
+        new_results = []
+        valid_software = {}
+        for item_pk, validated_software in validated_softwares.items():
+            result = results.get(item_pk)
+            if result is None:
+                result = self.result_model(**{item_field_id: item_pk})
+                new_results.append(result)
+            software = softwares.get(item_pk)
+            result.software = software
+            result.is_validated = self.is_validated(software, validated_software, today)
+            result.last_run = last_run
+            result.run_type = run_type
+            result.last_updated = now
+            valid_software[result.pk] = {validated_soft.pk for validated_soft in validated_software}
+
+        with transaction.atomic():
+            self.result_model.objects.bulk_create(new_results, batch_size=BULK_BATCH_SIZE)
+            self.result_model.objects.bulk_update(
+                list(results.values()),
+                ["software", "is_validated", "last_run", "run_type", "last_updated"],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            self._set_valid_software(valid_software)
+        observe_validation(self.item_model, len(valid_software), time.monotonic() - start_time)
+
+        return len(valid_software)
+
+    def get_changed_items(self, since):
+        """Return objects that were never validated or whose validation inputs changed since `since`.
+
+        Inputs are the software assignment, the object itself (e.g. device type, role or tags changes)
+        and any ValidatedSoftwareLCM that matches, or matched before, the object.
+        """
+        # pylint: disable=not-callable, too-many-locals
+        today = date.today()
+        since_date = timezone.localdate(since)
+        item_field_id = f"{self.result_item_field}_id"
+        results = self.result_model.objects.filter(**{f"{self.result_item_field}__in": self.items_qs.values("pk")})
+
+        # Rules edited since the last run, or whose validity window opened or closed since then
+        changed_rules = ValidatedSoftwareLCM.objects.filter(
+            Q(last_updated__gte=since)
+            | Q(start__gt=since_date, start__lte=today)
+            | Q(end__gte=since_date, end__lt=today)
+        ).values("pk")
+
+        changed = Q(last_updated__gte=since) | ~Q(pk__in=results.values(item_field_id))
+        for field_name, item_lookup in self.rule_target_lookups.items():
+            m2m_field = ValidatedSoftwareLCM._meta.get_field(field_name)
+            changed |= Q(
+                **{
+                    f"{item_lookup}__in": m2m_field.remote_field.through.objects.filter(
+                        **{f"{m2m_field.m2m_field_name()}__in": changed_rules}
+                    ).values(f"{m2m_field.m2m_reverse_field_name()}_id")
+                }
+            )
+        changed |= Q(pk__in=results.filter(valid_software__in=changed_rules).values(item_field_id))
+
+        # Deleted rules are removed from `valid_software` on cascade, but `is_validated` has to be recomputed
+        valid_software_field = self.result_model._meta.get_field("valid_software")
+        validating_rules = valid_software_field.remote_field.through.objects.filter(
+            **{
+                valid_software_field.m2m_field_name(): OuterRef("pk"),
+                f"{valid_software_field.m2m_reverse_field_name()}__software": OuterRef("software"),
+                f"{valid_software_field.m2m_reverse_field_name()}__start__lte": today,
+            }
+        ).filter(
+            Q(**{f"{valid_software_field.m2m_reverse_field_name()}__end__isnull": True})
+            | Q(**{f"{valid_software_field.m2m_reverse_field_name()}__end__gte": today})
+        )
+        changed |= Q(pk__in=results.filter(is_validated=True).exclude(Exists(validating_rules)).values(item_field_id))
+
+        # Removed software assignments leave no timestamp, compare the assignments with the software in the results
+        assignment_model = self.item_model._meta.get_field("software_assignment").related_model
+        assignments = assignment_model.objects.filter(**{self.result_item_field: OuterRef(item_field_id)})
+        reassigned = results.exclude(
+            (~Exists(assignments) & Q(software__isnull=True))
+            | Exists(assignments.filter(software=OuterRef("software")))
+        )
+        changed |= Q(pk__in=reassigned.values(item_field_id))
+
+        # Evaluated upfront, the conditions above no longer hold once the objects are validated
+        changed_pks = list(self.items_qs.filter(changed).values_list("pk", flat=True).distinct())
+        return self.items_qs.filter(pk__in=changed_pks)
+
+    @classmethod
+    def update_summaries(cls, last_run):
+        """Replace the SoftwareValidationSummary objects of the model with aggregations of all current results.
+
+        Returns:
+            list: The created SoftwareValidationSummary objects
+        """
+        results = cls.result_model.objects.order_by()
+        counts = {
+            "total": Count("pk"),
+            "valid": Count("pk", filter=Q(is_validated=True)),
+            "invalid": Count("pk", filter=Q(is_validated=False) & ~Q(software=None)),
+            "no_software": Count("pk", filter=Q(software=None)),
+        }
+        content_type = ContentType.objects.get_for_model(cls.item_model)
+
+        summaries = [
+            SoftwareValidationSummary(
+                content_type=content_type,
+                group_by=choices.ValidationSummaryGroupChoices.ALL,
+                last_run=last_run,
+                **results.aggregate(**counts),
+            )
+        ]
+        for group_by, (group_id_lookup, group_name_lookup) in cls.summary_group_lookups.items():
+            for group in results.values(group_id_lookup, group_name_lookup).annotate(**counts):
+                summaries.append(
+                    SoftwareValidationSummary(
+                        content_type=content_type,
+                        group_by=group_by,
+                        group_id=group[group_id_lookup],
+                        group_name=group[group_name_lookup] or "",
+                        last_run=last_run,
+                        **{count_name: group[count_name] for count_name in counts},
+                    )
+                )
+
+        with transaction.atomic():
+            SoftwareValidationSummary.objects.filter(content_type=content_type).delete()
+            SoftwareValidationSummary.objects.bulk_create(summaries, batch_size=BULK_BATCH_SIZE)
+
+        return summaries
+
+    def _set_valid_software(self, valid_software):
+        """Bulk equivalent of `valid_software.set()`, only the changed rows of the through table are written."""
+        m2m_field = self.result_model._meta.get_field("valid_software")
+        through = m2m_field.remote_field.through
+        result_field_id = f"{m2m_field.m2m_field_name()}_id"
+        validated_soft_field_id = f"{m2m_field.m2m_reverse_field_name()}_id"
+
+        stale_rows = []
+        for row_pk, result_pk, validated_soft_pk in through.objects.filter(
+            **{
+                f"{result_field_id}__in": self.result_model.objects.filter(
+                    **{f"{self.result_item_field}__in": self.items_qs}
+                ).values("pk")
+            }
+        ).values_list("pk", result_field_id, validated_soft_field_id):
+            if validated_soft_pk in valid_software.get(result_pk, ()):
+                valid_software[result_pk].discard(validated_soft_pk)
+            else:
+                stale_rows.append(row_pk)
+
+        for batch_start in range(0, len(stale_rows), BULK_BATCH_SIZE):
+            batch_end = batch_start + BULK_BATCH_SIZE
+            through.objects.filter(pk__in=stale_rows[batch_start:batch_end]).delete()
+
+        through.objects.bulk_create(
+            [
+                through(**{result_field_id: result_pk, validated_soft_field_id: validated_soft_pk})
+                for result_pk, validated_soft_pks in valid_software.items()
+                for validated_soft_pk in validated_soft_pks
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+
+class DeviceSoftwareBulkValidator(ItemSoftwareBulkValidator):
+    """Validates software for a batch of Device objects."""
+
+    item_model = Device
+    result_model = DeviceSoftwareValidationResult
+    result_item_field = "device"
+    rule_target_lookups = {
+        "devices": "pk",
+        "device_types": "device_type",
+        "device_roles": "role",
+        "object_tags": "tags",
+    }
+    summary_group_lookups = {
+        choices.ValidationSummaryGroupChoices.DEVICE_TYPE: ("device__device_type", "device__device_type__model"),
+        choices.ValidationSummaryGroupChoices.PLATFORM: ("device__platform", "device__platform__name"),
+        choices.ValidationSummaryGroupChoices.LOCATION: ("device__location", "device__location__name"),
+        choices.ValidationSummaryGroupChoices.ROLE: ("device__role", "device__role__name"),
+        choices.ValidationSummaryGroupChoices.MANUFACTURER: (
+            "device__device_type__manufacturer",
+            "device__device_type__manufacturer__name",
+        ),
+    }
+
+
+class InventoryItemSoftwareBulkValidator(ItemSoftwareBulkValidator):
+    """Validates software for a batch of InventoryItem objects."""
+
+    item_model = InventoryItem
+    result_model = InventoryItemSoftwareValidationResult
+    result_item_field = "inventory_item"
+    rule_target_lookups = {
+        "inventory_items": "pk",
+        "object_tags": "tags",
+    }
+    summary_group_lookups = {
+        choices.ValidationSummaryGroupChoices.DEVICE_TYPE: (
+            "inventory_item__device__device_type",
+            "inventory_item__device__device_type__model",
+        ),
+        choices.ValidationSummaryGroupChoices.PLATFORM: (
+            "inventory_item__device__platform",
+            "inventory_item__device__platform__name",
+        ),
+        choices.ValidationSummaryGroupChoices.LOCATION: (
+            "inventory_item__device__location",
+            "inventory_item__device__location__name",
+        ),
+        choices.ValidationSummaryGroupChoices.ROLE: (
+            "inventory_item__device__role",
+            "inventory_item__device__role__name",
+        ),
+        choices.ValidationSummaryGroupChoices.MANUFACTURER: (
+            "inventory_item__manufacturer",
+            "inventory_item__manufacturer__name",
+        ),
+    }
@@ -1,16 +1,15 @@
 """Filters for Software Lifecycle QuerySets."""
+from collections import defaultdict
 
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Case, IntegerField, Q, Subquery, Value, When
-from nautobot.dcim.models import Device, InventoryItem
-from nautobot.extras.models import RelationshipAssociation
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from nautobot_device_lifecycle_mgmt.software_index import ValidatedSoftwareIndex, get_m2m_targets, get_tags_index
 
 
 class BaseSoftwareFilter:
     """Base class for SoftwareFilter classes."""
 
-    soft_obj_model = None
-    soft_relation_name = None
+    soft_assignment_lookup = None
 
     def __init__(self, qs, item_obj):  # pylint: disable=invalid-name
         """Initalize BaseSoftwareFilter."""
@@ -19,12 +18,7 @@ class BaseSoftwareFilter:
 
     def filter_qs(self):
         """Returns filtered SoftwareLCM query set."""
-        soft_rel_sq = RelationshipAssociation.objects.filter(
-            relationship__key=self.soft_relation_name,
-            destination_type=ContentType.objects.get_for_model(self.soft_obj_model),
-            destination_id=self.item_obj.id,
-        ).values("source_id")[:1]
-        self.software_qs = self.software_qs.filter(id=Subquery(soft_rel_sq))
+        self.software_qs = self.software_qs.filter(**{self.soft_assignment_lookup: self.item_obj.id})
 
         return self.software_qs
 
@@ -32,15 +26,47 @@ class BaseSoftwareFilter:
 class DeviceSoftwareFilter(BaseSoftwareFilter):
     """Filter SoftwareLCM objects based on the Device object."""
 
-    soft_obj_model = Device
-    soft_relation_name = "device_soft"
+    soft_assignment_lookup = "device_assignments__device"
 
 
 class InventoryItemSoftwareFilter(BaseSoftwareFilter):
     """Filter SoftwareLCM objects based on the Device object."""
 
-    soft_obj_model = InventoryItem
-    soft_relation_name = "inventory_item_soft"
+    soft_assignment_lookup = "inventory_item_assignments__inventory_item"
+
+
+def without_tree_fields(items_qs):
+    """Return `items_qs` without tree fields, the tree CTE of e.g. InventoryItem querysets breaks in subqueries."""
+    if hasattr(items_qs, "without_tree_fields"):
+        return items_qs.without_tree_fields()
+
+    return items_qs
+
+
+class BaseSoftwareBatchFilter:
+    """Base class for SoftwareFilter classes resolving software for a batch of objects."""
+
+    def __init__(self, qs, items_qs):  # pylint: disable=invalid-name
+        """Initalize BaseSoftwareBatchFilter."""
+        self.software_qs = qs
+        self.items_qs = without_tree_fields(items_qs)
+
+    def resolve(self):
+        """Returns mapping of object pk to the SoftwareLCM assigned to it."""
+        soft_rels = dict(
+            self.items_qs.filter(software_assignment__isnull=False).values_list("pk", "software_assignment__software")
+        )
+        softwares = self.software_qs.in_bulk(set(soft_rels.values()))
+
+        return {item_pk: softwares[soft_pk] for item_pk, soft_pk in soft_rels.items() if soft_pk in softwares}
+
+
+class DeviceSoftwareBatchFilter(BaseSoftwareBatchFilter):
+    """Resolve SoftwareLCM objects for a batch of Device objects."""
+
+
+class InventoryItemSoftwareBatchFilter(BaseSoftwareBatchFilter):
+    """Resolve SoftwareLCM objects for a batch of InventoryItem objects."""
 
 
 class DeviceValidatedSoftwareFilter:
@@ -55,9 +81,9 @@ class DeviceValidatedSoftwareFilter:
         """Returns filtered ValidatedSoftwareLCM query set."""
         self.validated_software_qs = self.validated_software_qs.filter(
             Q(devices=self.item_obj.pk)
-            | Q(device_types=self.item_obj.device_type.pk, device_roles=self.item_obj.role.pk)
-            | Q(device_types=self.item_obj.device_type.pk, device_roles=None)
-            | Q(device_types=None, device_roles=self.item_obj.role.pk)
+            | Q(device_types=self.item_obj.device_type_id, device_roles=self.item_obj.role_id)
+            | Q(device_types=self.item_obj.device_type_id, device_roles=None)
+            | Q(device_types=None, device_roles=self.item_obj.role_id)
             | Q(object_tags__in=self.item_obj.tags.all())
         ).distinct()
 
@@ -72,21 +98,21 @@ class DeviceValidatedSoftwareFilter:
                 When(devices=self.item_obj.pk, preferred=True, then=Value(10)),
                 When(devices=self.item_obj.pk, preferred=False, then=Value(1000)),
                 When(
-                    device_types=self.item_obj.device_type.pk,
-                    device_roles=self.item_obj.role.pk,
+                    device_types=self.item_obj.device_type_id,
+                    device_roles=self.item_obj.role_id,
                     preferred=True,
                     then=Value(20),
                 ),
                 When(
-                    device_types=self.item_obj.device_type.pk,
-                    device_roles=self.item_obj.role.pk,
+                    device_types=self.item_obj.device_type_id,
+                    device_roles=self.item_obj.role_id,
                     preferred=False,
                     then=Value(1010),
                 ),
-                When(device_types=self.item_obj.device_type.pk, device_roles=None, preferred=True, then=Value(30)),
-                When(device_types=self.item_obj.device_type.pk, device_roles=None, preferred=False, then=Value(1030)),
-                When(device_roles=self.item_obj.role.pk, preferred=True, then=Value(40)),
-                When(device_roles=self.item_obj.role.pk, preferred=False, then=Value(1040)),
+                When(device_types=self.item_obj.device_type_id, device_roles=None, preferred=True, then=Value(30)),
+                When(device_types=self.item_obj.device_type_id, device_roles=None, preferred=False, then=Value(1030)),
+                When(device_roles=self.item_obj.role_id, preferred=True, then=Value(40)),
+                When(device_roles=self.item_obj.role_id, preferred=False, then=Value(1040)),
                 When(preferred=True, then=Value(990)),
                 default=Value(1990),
                 output_field=IntegerField(),
@@ -126,12 +152,51 @@ class InventoryItemValidatedSoftwareFilter:
         )
 
 
+def get_validated_software_index(validated_software_qs):
+    """Return ValidatedSoftwareIndex of the rules, the shared index unless the queryset is filtered or restricted."""
+    if validated_software_qs.query.has_filters():
+        return ValidatedSoftwareIndex(validated_software_qs)
+
+    return ValidatedSoftwareIndex.get_shared(validated_software_qs)
+
+
+class DeviceValidatedSoftwareBatchFilter:
+    """Resolve ValidatedSoftwareLCM objects for a batch of Device objects.
+
+    Mirrors the matching and the weights used by `DeviceValidatedSoftwareFilter` but evaluates them in memory
+    using `ValidatedSoftwareIndex`, issuing a fixed number of queries regardless of the number of devices.
+    """
+
+    def __init__(self, qs, items_qs):  # pylint: disable=invalid-name
+        """Initalize DeviceValidatedSoftwareBatchFilter."""
+        self.validated_software_qs = qs
+        self.items_qs = without_tree_fields(items_qs)
+
+    def resolve(self):
+        """Returns mapping of Device pk to the list of weighted and ordered ValidatedSoftwareLCM objects."""
+        return get_validated_software_index(self.validated_software_qs).resolve_devices(self.items_qs)
+
+
+class InventoryItemValidatedSoftwareBatchFilter:
+    """Resolve ValidatedSoftwareLCM objects for a batch of InventoryItem objects.
+
+    Mirrors the matching and the weights used by `InventoryItemValidatedSoftwareFilter` but evaluates them in memory
+    using `ValidatedSoftwareIndex`, issuing a fixed number of queries regardless of the number of inventory items.
+    """
+
+    def __init__(self, qs, items_qs):  # pylint: disable=invalid-name
+        """Initalize InventoryItemValidatedSoftwareBatchFilter."""
+        self.validated_software_qs = qs
+        self.items_qs = without_tree_fields(items_qs)
+
+    def resolve(self):
+        """Returns mapping of InventoryItem pk to the list of weighted and ordered ValidatedSoftwareLCM objects."""
+        return get_validated_software_index(self.validated_software_qs).resolve_inventory_items(self.items_qs)
+
+
 class DeviceSoftwareImageFilter:
     """Filter SoftwareImageLCM objects based on the Device object."""
 
-    soft_obj_model = Device
-    soft_relation_name = "device_soft"
-
     def __init__(self, qs, item_obj):  # pylint: disable=invalid-name
         """Initalize DeviceSoftwareImageLCMFilter."""
         self.softwareimage_qs = qs
@@ -139,15 +204,11 @@ class DeviceSoftwareImageFilter:
 
     def filter_qs(self):
         """Returns filtered SoftwareImageLCM query set."""
-        soft_rel_obj = RelationshipAssociation.objects.filter(
-            relationship__key=self.soft_relation_name,
-            destination_type=ContentType.objects.get_for_model(self.soft_obj_model),
-            destination_id=self.item_obj.id,
-        ).values("source_id")[:1]
+        soft_q = Q(software__device_assignments__device=self.item_obj.id)
 
-        object_tag_q = Q(software=soft_rel_obj, object_tags__in=self.item_obj.tags.all())
-        device_type_q = Q(software=soft_rel_obj, device_types=self.item_obj.device_type)
-        default_image_q = Q(software=soft_rel_obj, default_image=True)
+        object_tag_q = soft_q & Q(object_tags__in=self.item_obj.tags.all())
+        device_type_q = soft_q & Q(device_types=self.item_obj.device_type_id)
+        default_image_q = soft_q & Q(default_image=True)
 
         device_soft_image_ot_qs = self.softwareimage_qs.filter(object_tag_q)
         if device_soft_image_ot_qs.exists():
@@ -163,9 +224,6 @@ class DeviceSoftwareImageFilter:
 class InventoryItemSoftwareImageFilter:
     """Filter SoftwareImageLCM objects based on the InventoryItem object."""
 
-    soft_obj_model = InventoryItem
-    soft_relation_name = "inventory_item_soft"
-
     def __init__(self, qs, item_obj):  # pylint: disable=invalid-name
         """Initalize InventoryItemSoftwareImageLCMFilter."""
         self.softwareimage_qs = qs
@@ -173,15 +231,11 @@ class InventoryItemSoftwareImageFilter:
 
     def filter_qs(self):
         """Returns filtered SoftwareImageLCM query set."""
-        soft_rel_obj = RelationshipAssociation.objects.filter(
-            relationship__key=self.soft_relation_name,
-            destination_type=ContentType.objects.get_for_model(self.soft_obj_model),
-            destination_id=self.item_obj.id,
-        ).values("source_id")[:1]
+        soft_q = Q(software__inventory_item_assignments__inventory_item=self.item_obj.id)
 
-        object_tag_q = Q(software=soft_rel_obj, object_tags__in=self.item_obj.tags.all())
-        inv_item_q = Q(software=soft_rel_obj, inventory_items=self.item_obj.pk)
-        default_image_q = Q(software=soft_rel_obj, default_image=True)
+        object_tag_q = soft_q & Q(object_tags__in=self.item_obj.tags.all())
+        inv_item_q = soft_q & Q(inventory_items=self.item_obj.pk)
+        default_image_q = soft_q & Q(default_image=True)
 
         invitem_soft_image_ot_qs = self.softwareimage_qs.filter(object_tag_q)
         if invitem_soft_image_ot_qs.exists():
@@ -192,3 +246,70 @@ class InventoryItemSoftwareImageFilter:
             return invitem_soft_image_dt_qs
 
         return self.softwareimage_qs.filter(default_image_q)
+
+
+class BaseSoftwareImageBatchFilter:
+    """Base class resolving SoftwareImageLCM objects for a batch of objects.
+
+    Applies the precedence of the per-object SoftwareImageFilter classes: images matching the object tags,
+    then images assigned to the object (or its device type), then default images of the object software.
+    """
+
+    image_assignment_field = None
+    item_assignment_lookup = None
+
+    def __init__(self, qs, items_qs, softwares=None):  # pylint: disable=invalid-name
+        """Initalize BaseSoftwareImageBatchFilter.
+
+        `softwares` maps the object pks to the pk of the software whose images are resolved, e.g. the software an
+        object is upgraded to, it defaults to the software assigned to the objects.
+        """
+        self.softwareimage_qs = qs
+        self.items_qs = without_tree_fields(items_qs)
+        self.softwares = softwares
+
+    def resolve(self):
+        """Returns mapping of object pk to the list of SoftwareImageLCM objects resolved for it."""
+        softwares = self.softwares
+        if softwares is None:
+            softwares = dict(
+                self.items_qs.filter(software_assignment__isnull=False).values_list(
+                    "pk", "software_assignment__software"
+                )
+            )
+        images_qs = self.softwareimage_qs.filter(software__in=set(softwares.values()))
+        image_tags = get_m2m_targets(images_qs, "object_tags")
+        image_assignments = get_m2m_targets(images_qs, self.image_assignment_field)
+        images_by_software = defaultdict(list)
+        for image in sorted(images_qs, key=lambda image: (image.default_image, image.image_file_name)):
+            images_by_software[image.software_id].append(image)
+        tags = get_tags_index(self.items_qs)
+
+        results = {}
+        for item_pk, assignment_pk in self.items_qs.values_list("pk", self.item_assignment_lookup):
+            software_images = images_by_software.get(softwares.get(item_pk), [])
+            item_tags = tags.get(item_pk, set())
+            for matches in (
+                [image for image in software_images if image_tags.get(image.pk, set()) & item_tags],
+                [image for image in software_images if assignment_pk in image_assignments.get(image.pk, ())],
+                [image for image in software_images if image.default_image],
+            ):
+                if matches:
+                    break
+            results[item_pk] = matches
+
+        return results
+
+
+class DeviceSoftwareImageBatchFilter(BaseSoftwareImageBatchFilter):
+    """Resolve SoftwareImageLCM objects for a batch of Device objects."""
+
+    image_assignment_field = "device_types"
+    item_assignment_lookup = "device_type_id"
+
+
+class InventoryItemSoftwareImageBatchFilter(BaseSoftwareImageBatchFilter):
+    """Resolve SoftwareImageLCM objects for a batch of InventoryItem objects."""
+
+    image_assignment_field = "inventory_items"
+    item_assignment_lookup = "pk"
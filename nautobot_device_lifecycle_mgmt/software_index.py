@@ -0,0 +1,229 @@
+"""In-memory index of ValidatedSoftwareLCM rules, matching objects to rules without querying the database."""
+import threading
+from collections import defaultdict
+from copy import copy
+from functools import partial
+from uuid import uuid4
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connections, transaction
+
+INDEX_VERSION_CACHE_KEY = "nautobot_device_lifecycle_mgmt:validated_software_index_version"
+
+
+def get_m2m_targets(qs, field_name):  # pylint: disable=invalid-name
+    """Return mapping of the pks of `qs` objects to the set of pks of the objects assigned through `field_name`."""
+    m2m_field = qs.model._meta.get_field(field_name)
+    obj_field = m2m_field.m2m_field_name()
+    rel_field = m2m_field.m2m_reverse_field_name()
+    targets = defaultdict(set)
+    for obj_pk, rel_pk in m2m_field.remote_field.through.objects.filter(
+        **{f"{obj_field}__in": qs.values("pk")}
+    ).values_list(f"{obj_field}_id", f"{rel_field}_id"):
+        targets[obj_pk].add(rel_pk)
+
+    return targets
+
+
+def get_tags_index(items_qs):
+    """Return mapping of the object pk to the set of Tag pks assigned to it."""
+    tagged_items = items_qs.model.tags.through.objects.filter(
+        content_type=ContentType.objects.get_for_model(items_qs.model), object_id__in=items_qs.values("pk")
+    ).values_list("object_id", "tag_id")
+    index = defaultdict(set)
+    for item_pk, tag_pk in tagged_items:
+        index[item_pk].add(tag_pk)
+
+    return index
+
+
+class ValidatedSoftwareIndex:  # pylint: disable=too-many-instance-attributes
+    """Compiled index of ValidatedSoftwareLCM rules.
+
+    Maps every key a rule can match on (device, device type and role, device type, role, role and tag, tag,
+    inventory item) to the list of `(weight, rule pk)` pairs, using the weights of `DeviceValidatedSoftwareFilter`
+    and `InventoryItemValidatedSoftwareFilter`. Matching an object is a few dict lookups.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+    # Aliases of the databases whose current transaction, of this thread, changed rules not committed yet
+    _uncommitted = threading.local()
+
+    def __init__(self, validated_software_qs, version=None):
+        """Compile the index from the `validated_software_qs` rules."""
+        self.version = version
+        self.rules = validated_software_qs.in_bulk()
+        self.by_device = defaultdict(list)
+        self.by_device_type_role = defaultdict(list)
+        self.by_device_type = defaultdict(list)
+        self.by_role = defaultdict(list)
+        self.by_role_tag = defaultdict(list)
+        self.by_tag = defaultdict(list)
+        self.by_inventory_item = defaultdict(list)
+        self.by_inventory_item_tag = defaultdict(list)
+        self._compile(validated_software_qs)
+
+    def _compile(self, validated_software_qs):  # pylint: disable=too-many-locals
+        """Populate the index keys with the weighted rules."""
+        devices = get_m2m_targets(validated_software_qs, "devices")
+        device_types = get_m2m_targets(validated_software_qs, "device_types")
+        device_roles = get_m2m_targets(validated_software_qs, "device_roles")
+        inventory_items = get_m2m_targets(validated_software_qs, "inventory_items")
+        object_tags = get_m2m_targets(validated_software_qs, "object_tags")
+
+        for rule_pk, rule in self.rules.items():
+            rule_device_types = device_types.get(rule_pk, set())
+            rule_roles = device_roles.get(rule_pk, set())
+            rule_tags = object_tags.get(rule_pk, set())
+
+            for device_pk in devices.get(rule_pk, ()):
+                self.by_device[device_pk].append((10 if rule.preferred else 1000, rule_pk))
+            for device_type_pk in rule_device_types:
+                for role_pk in rule_roles:
+                    self.by_device_type_role[(device_type_pk, role_pk)].append(
+                        (20 if rule.preferred else 1010, rule_pk)
+                    )
+                if not rule_roles:
+                    self.by_device_type[device_type_pk].append((30 if rule.preferred else 1030, rule_pk))
+            for role_pk in rule_roles:
+                if not rule_device_types:
+                    self.by_role[role_pk].append((40 if rule.preferred else 1040, rule_pk))
+                # Rules assigned to device types are matched on role only together with one of their tags
+                for tag_pk in rule_tags if rule_device_types else ():
+                    self.by_role_tag[(role_pk, tag_pk)].append((40 if rule.preferred else 1040, rule_pk))
+            for tag_pk in rule_tags:
+                self.by_tag[tag_pk].append((990 if rule.preferred else 1990, rule_pk))
+                self.by_inventory_item_tag[tag_pk].append((20 if rule.preferred else 1010, rule_pk))
+            for inventory_item_pk in inventory_items.get(rule_pk, ()):
+                self.by_inventory_item[inventory_item_pk].append((20 if rule.preferred else 1010, rule_pk))
+
+    def _weighted(self, matches):
+        """Return copies of the matched rules annotated with their lowest `weight`, ordered by weight and start."""
+        weights = {}
+        for weighted_rules in matches:
+            for weight, rule_pk in weighted_rules:
+                if rule_pk not in weights or weight < weights[rule_pk]:
+                    weights[rule_pk] = weight
+
+        weighted = []
+        for rule_pk, weight in weights.items():
+            rule = copy(self.rules[rule_pk])
+            rule.weight = weight
+            weighted.append(rule)
+
+        return sorted(weighted, key=lambda rule: (rule.weight, rule.start))
+
+    def match_device(self, device_pk, device_type_pk, role_pk, tag_pks=()):
+        """Return the weighted and ordered rules matching a device with the given attributes."""
+        matches = [
+            self.by_device.get(device_pk, ()),
+            self.by_device_type_role.get((device_type_pk, role_pk), ()),
+            self.by_device_type.get(device_type_pk, ()),
+            self.by_role.get(role_pk, ()),
+        ]
+        for tag_pk in tag_pks:
+            matches.append(self.by_role_tag.get((role_pk, tag_pk), ()))
+            matches.append(self.by_tag.get(tag_pk, ()))
+
+        return self._weighted(matches)
+
+    def match_inventory_item(self, inventory_item_pk, tag_pks=()):
+        """Return the weighted and ordered rules matching an inventory item with the given attributes."""
+        matches = [self.by_inventory_item.get(inventory_item_pk, ())]
+        for tag_pk in tag_pks:
+            matches.append(self.by_inventory_item_tag.get(tag_pk, ()))
+
+        return self._weighted(matches)
+
+    def resolve_devices(self, items_qs):
+        """Return mapping of Device pk to its weighted and ordered rules, for all devices in `items_qs`."""
+        tags = get_tags_index(items_qs)
+        return {
+            device_pk: self.match_device(device_pk, device_type_pk, role_pk, tags.get(device_pk, ()))
+            for device_pk, device_type_pk, role_pk in items_qs.values_list("pk", "device_type_id", "role_id")
+        }
+
+    def resolve_inventory_items(self, items_qs):
+        """Return mapping of InventoryItem pk to its weighted and ordered rules, for all items in `items_qs`."""
+        tags = get_tags_index(items_qs)
+        return {
+            item_pk: self.match_inventory_item(item_pk, tags.get(item_pk, ()))
+            for item_pk in items_qs.values_list("pk", flat=True)
+        }
+
+    @staticmethod
+    def get_version():
+        """Return the current version of the rules, a token replaced whenever changes of the rules are committed."""
+        token = cache.get(INDEX_VERSION_CACHE_KEY)
+        if token is None:
+            token = ValidatedSoftwareIndex.invalidate()
+
+        return token
+
+    @staticmethod
+    def invalidate():
+        """Replace the version token, forcing every process to recompile its shared index. Returns the new token."""
+        token = uuid4().hex
+        cache.set(INDEX_VERSION_CACHE_KEY, token, None)
+
+        return token
+
+    @classmethod
+    def _uncommitted_aliases(cls):
+        """Return the set of the database aliases with uncommitted rule changes in this thread."""
+        if not hasattr(cls._uncommitted, "aliases"):
+            cls._uncommitted.aliases = set()
+
+        return cls._uncommitted.aliases
+
+    @classmethod
+    def invalidate_on_commit(cls, using):
+        """Invalidate the shared index once the rule changes of the current transaction of `using` are committed.
+
+        Until then, the transaction compiles its own index, see `get_shared`.
+        """
+        if connections[using].in_atomic_block:
+            cls._uncommitted_aliases().add(using)
+        transaction.on_commit(partial(cls._commit_changes, using), using=using)
+
+    @classmethod
+    def _commit_changes(cls, using):
+        """Commit callback of `invalidate_on_commit`."""
+        cls._uncommitted_aliases().discard(using)
+        cls.invalidate()
+
+    @classmethod
+    def has_uncommitted_changes(cls, using):
+        """Return whether the current transaction of the `using` database changed rules, not committed yet."""
+        aliases = cls._uncommitted_aliases()
+        # Rolled back changes have no callback, the transaction just ended without committing them
+        if using in aliases and not connections[using].in_atomic_block:
+            aliases.discard(using)
+
+        return using in aliases
+
+    @classmethod
+    def get_shared(cls, validated_software_qs):
+        """Return the index shared within the process, recompiled from `validated_software_qs` if the rules changed.
+
+        `validated_software_qs` has to select all rules, restricted querysets need their own index. The rule changes
+        are only seen by other transactions once committed, the transaction making them compiles its own index.
+        """
+        if cls.has_uncommitted_changes(validated_software_qs.db):
+            return cls(validated_software_qs)
+
+        version = cls.get_version()
+        shared = cls._shared
+        if shared is not None and shared.version == version:
+            return shared
+
+        # Threads missing the index wait for the one compiling it
+        with cls._shared_lock:
+            shared = cls._shared
+            if shared is None or shared.version != version:
+                shared = cls(validated_software_qs, version=version)
+                cls._shared = shared
+
+        return shared
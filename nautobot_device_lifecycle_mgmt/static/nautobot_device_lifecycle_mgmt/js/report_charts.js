@@ -0,0 +1,197 @@
+// Render the software validation report charts as SVG from the chart data embedded in the report page.
+(function () {
+    "use strict";
+
+    var SVG_NS = "http://www.w3.org/2000/svg";
+
+    function svgElement(name, attrs, text) {
+        var element = document.createElementNS(SVG_NS, name);
+        Object.keys(attrs || {}).forEach(function (attr) {
+            element.setAttribute(attr, attrs[attr]);
+        });
+        if (text !== undefined) {
+            element.textContent = text;
+        }
+        return element;
+    }
+
+    // Integer y-axis ticks covering 0..maxValue
+    function yTicks(maxValue) {
+        var step = Math.max(1, Math.ceil(maxValue / 5));
+        var ticks = [];
+        for (var value = 0; value <= maxValue + step - 1; value += step) {
+            ticks.push(value);
+        }
+        return ticks;
+    }
+
+    function renderBarChart(container, chart) {
+        var width = 1000, height = 400;
+        var margin = {top: 40, right: 20, bottom: 60, left: 60};
+        var plotWidth = width - margin.left - margin.right;
+        var plotHeight = height - margin.top - margin.bottom;
+        var svg = svgElement("svg", {viewBox: "0 0 " + width + " " + height, width: "100%", role: "img"});
+        svg.appendChild(svgElement("title", {}, chart.title));
+        svg.appendChild(svgElement("text", {x: width / 2, y: 20, "text-anchor": "middle", "font-weight": "bold"}, chart.title));
+
+        var maxValue = 0;
+        chart.series.forEach(function (series) {
+            series.data.forEach(function (value) {
+                maxValue = Math.max(maxValue, value);
+            });
+        });
+        var ticks = yTicks(maxValue);
+        var yMax = ticks[ticks.length - 1] || 1;
+        var plot = svgElement("g", {transform: "translate(" + margin.left + "," + margin.top + ")"});
+        svg.appendChild(plot);
+
+        ticks.forEach(function (tick) {
+            var y = plotHeight - (tick / yMax) * plotHeight;
+            plot.appendChild(svgElement("line", {x1: 0, x2: plotWidth, y1: y, y2: y, stroke: "#eeeeee"}));
+            plot.appendChild(svgElement("text", {x: -8, y: y + 4, "text-anchor": "end", "font-size": 12}, tick));
+        });
+        plot.appendChild(svgElement("text", {
+            transform: "translate(-45," + plotHeight / 2 + ") rotate(-90)", "text-anchor": "middle", "font-size": 12
+        }, chart.ylabel));
+
+        var groupWidth = plotWidth / Math.max(chart.labels.length, 1);
+        var barWidth = Math.min(40, (groupWidth * 0.8) / Math.max(chart.series.length, 1));
+        chart.labels.forEach(function (label, labelIndex) {
+            var groupX = labelIndex * groupWidth + (groupWidth - barWidth * chart.series.length) / 2;
+            chart.series.forEach(function (series, seriesIndex) {
+                var value = series.data[labelIndex];
+                var barHeight = (value / yMax) * plotHeight;
+                var bar = svgElement("rect", {
+                    x: groupX + seriesIndex * barWidth, y: plotHeight - barHeight,
+                    width: barWidth, height: barHeight, fill: series.color, stroke: "#999999"
+                });
+                bar.appendChild(svgElement("title", {}, series.label + ": " + value));
+                plot.appendChild(bar);
+                plot.appendChild(svgElement("text", {
+                    x: groupX + (seriesIndex + 0.5) * barWidth, y: plotHeight - barHeight - 4,
+                    "text-anchor": "middle", "font-size": 11
+                }, value));
+            });
+            plot.appendChild(svgElement("text", {
+                x: (labelIndex + 0.5) * groupWidth, y: plotHeight + 20, "text-anchor": "middle", "font-size": 12
+            }, label === null ? "None" : label));
+        });
+        plot.appendChild(svgElement("line", {x1: 0, x2: plotWidth, y1: plotHeight, y2: plotHeight, stroke: "#333333"}));
+
+        chart.series.forEach(function (series, seriesIndex) {
+            var legendX = margin.left + seriesIndex * 130;
+            svg.appendChild(svgElement("rect", {x: legendX, y: height - 22, width: 14, height: 14, fill: series.color, stroke: "#999999"}));
+            svg.appendChild(svgElement("text", {x: legendX + 20, y: height - 10, "font-size": 12}, series.label));
+        });
+
+        container.appendChild(svg);
+    }
+
+    // Line chart of percentages, the labels are thinned out to fit the x-axis
+    function renderLineChart(container, chart) {
+        var width = 1000, height = 300;
+        var margin = {top: 40, right: 20, bottom: 60, left: 60};
+        var plotWidth = width - margin.left - margin.right;
+        var plotHeight = height - margin.top - margin.bottom;
+        var svg = svgElement("svg", {viewBox: "0 0 " + width + " " + height, width: "100%", role: "img"});
+        svg.appendChild(svgElement("title", {}, chart.title));
+        svg.appendChild(svgElement("text", {x: width / 2, y: 20, "text-anchor": "middle", "font-weight": "bold"}, chart.title));
+        var plot = svgElement("g", {transform: "translate(" + margin.left + "," + margin.top + ")"});
+        svg.appendChild(plot);
+
+        [0, 25, 50, 75, 100].forEach(function (tick) {
+            var y = plotHeight - (tick / 100) * plotHeight;
+            plot.appendChild(svgElement("line", {x1: 0, x2: plotWidth, y1: y, y2: y, stroke: "#eeeeee"}));
+            plot.appendChild(svgElement("text", {x: -8, y: y + 4, "text-anchor": "end", "font-size": 12}, tick));
+        });
+        plot.appendChild(svgElement("text", {
+            transform: "translate(-45," + plotHeight / 2 + ") rotate(-90)", "text-anchor": "middle", "font-size": 12
+        }, chart.ylabel));
+
+        var step = chart.labels.length > 1 ? plotWidth / (chart.labels.length - 1) : 0;
+        var labelEvery = Math.max(1, Math.ceil(chart.labels.length / 8));
+        function pointX(index) {
+            return chart.labels.length > 1 ? index * step : plotWidth / 2;
+        }
+        chart.labels.forEach(function (label, index) {
+            if (index % labelEvery === 0 || index === chart.labels.length - 1) {
+                plot.appendChild(svgElement("text", {
+                    x: pointX(index), y: plotHeight + 20, "text-anchor": "middle", "font-size": 11
+                }, label));
+            }
+        });
+        chart.series.forEach(function (series) {
+            var points = series.data.map(function (value, index) {
+                return pointX(index) + "," + (plotHeight - (value / 100) * plotHeight);
+            });
+            plot.appendChild(svgElement("polyline", {
+                points: points.join(" "), fill: "none", stroke: series.color, "stroke-width": 2
+            }));
+            series.data.forEach(function (value, index) {
+                var point = svgElement("circle", {
+                    cx: pointX(index), cy: plotHeight - (value / 100) * plotHeight, r: 3, fill: series.color
+                });
+                point.appendChild(svgElement("title", {}, chart.labels[index] + " - " + series.label + ": " + value + "%"));
+                plot.appendChild(point);
+            });
+        });
+        plot.appendChild(svgElement("line", {x1: 0, x2: plotWidth, y1: plotHeight, y2: plotHeight, stroke: "#333333"}));
+
+        container.appendChild(svg);
+    }
+
+    function renderPieChart(container, chart) {
+        var size = 150, radius = 60, center = size / 2;
+        var total = chart.data.reduce(function (sum, value) { return sum + value; }, 0);
+        var svg = svgElement("svg", {viewBox: "0 0 " + size + " " + (size + 20), width: size, role: "img"});
+        svg.appendChild(svgElement("title", {}, chart.title));
+
+        var angle = -Math.PI / 2;
+        chart.data.forEach(function (value, index) {
+            if (!value) {
+                return;
+            }
+            var label = chart.labels[index] + ": " + value + " (" + (100 * value / total).toFixed(1) + "%)";
+            var slice;
+            if (value === total) {
+                slice = svgElement("circle", {cx: center, cy: center, r: radius, fill: chart.colors[index]});
+            } else {
+                var endAngle = angle + 2 * Math.PI * value / total;
+                var path = [
+                    "M", center, center,
+                    "L", center + radius * Math.cos(angle), center + radius * Math.sin(angle),
+                    "A", radius, radius, 0, endAngle - angle > Math.PI ? 1 : 0, 1,
+                    center + radius * Math.cos(endAngle), center + radius * Math.sin(endAngle),
+                    "Z"
+                ].join(" ");
+                slice = svgElement("path", {d: path, fill: chart.colors[index], stroke: "#ffffff"});
+                angle = endAngle;
+            }
+            slice.appendChild(svgElement("title", {}, label));
+            svg.appendChild(slice);
+        });
+        svg.appendChild(svgElement("text", {x: center, y: size + 12, "text-anchor": "middle", "font-size": 12}, chart.title));
+
+        container.appendChild(svg);
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        var dataElement = document.getElementById("lcm-chart-data");
+        if (!dataElement) {
+            return;
+        }
+        var chartData = JSON.parse(dataElement.textContent);
+        var barChart = document.getElementById("lcm-bar-chart");
+        var pieChart = document.getElementById("lcm-pie-chart");
+        if (barChart && chartData.bar_chart) {
+            renderBarChart(barChart, chartData.bar_chart);
+        }
+        if (pieChart && chartData.pie_chart) {
+            renderPieChart(pieChart, chartData.pie_chart);
+        }
+        var trendChart = document.getElementById("lcm-trend-chart");
+        if (trendChart && chartData.trend_chart) {
+            renderLineChart(trendChart, chartData.trend_chart);
+        }
+    });
+})();
@@ -108,6 +108,8 @@ class SoftwareLCMTable(BaseTable):
         args=[A("pk")],
         orderable=False,
     )
+    # Versions are sorted by platform, the sort keys only compare the versions of a platform, e.g. 15.2 before 15.10
+    version = tables.Column(order_by=("device_platform__name", "version_sort_key"))
     device_platform = tables.TemplateColumn("{{ record.device_platform }}")
     long_term_support = BooleanColumn()
     pre_release = BooleanColumn()
@@ -0,0 +1,120 @@
+"""Celery tasks for the Lifecycle Management app."""
+import math
+import time
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from nautobot.core.celery import nautobot_task
+from nautobot.extras.choices import JobResultStatusChoices, LogLevelChoices
+from nautobot.extras.models import JobResult
+
+from nautobot_device_lifecycle_mgmt.compliance_history import downsample_snapshots, record_snapshots
+from nautobot_device_lifecycle_mgmt.instrumentation import VALIDATION_JOB_DURATION
+from nautobot_device_lifecycle_mgmt.software import ItemSoftwareBulkValidator
+from nautobot_device_lifecycle_mgmt.utils import SHARDS_FINISHED_GROUPING
+
+
+def get_shard_filters(items_qs, shard_count, by_range=True):
+    """Split `items_qs` into at most `shard_count` shards of roughly equal size.
+
+    Returns list of lookups selecting each shard. With `by_range` shards are contiguous primary key ranges,
+    otherwise shards list the primary keys explicitly, which suits small sets of objects picked by an incremental run.
+    """
+    pks = [str(pk) for pk in items_qs.order_by("pk").values_list("pk", flat=True)]
+    if not pks:
+        return []
+    shard_size = math.ceil(len(pks) / shard_count)
+    shards = []
+    for shard_start in range(0, len(pks), shard_size):
+        shard_end = shard_start + shard_size
+        shards.append(pks[shard_start:shard_end])
+    if by_range:
+        return [{"pk__gte": shard[0], "pk__lte": shard[-1]} for shard in shards]
+
+    return [{"pk__in": shard} for shard in shards]
+
+
+def get_validator_class(validator_path):
+    """Return the software validator class imported from `validator_path`."""
+    validator_class = import_string(validator_path)
+    if not issubclass(validator_class, ItemSoftwareBulkValidator):
+        raise ValueError(f"{validator_path} is not a software validator.")
+
+    return validator_class
+
+
+def update_validation_reports(validator_class, last_run):
+    """Update the software validation summaries and snapshots of the objects validated by `validator_class`."""
+    summaries = validator_class.update_summaries(last_run=last_run)
+    record_snapshots(summaries, last_run=last_run)
+    downsample_snapshots()
+
+
+@nautobot_task
+def validate_software_shard(validator_path, shard_filter, last_run, run_type):
+    """Validate software on one shard of objects, returns the number of validated objects and the time it took.
+
+    Errors are returned rather than raised, so the chord callback `finish_software_shards` runs and reports them.
+    """
+    start_time = time.monotonic()
+    try:
+        validator_class = get_validator_class(validator_path)
+        items_qs = validator_class.item_model.objects.filter(**shard_filter)
+        validated_count = validator_class(items_qs).validate(
+            last_run=datetime.fromisoformat(last_run), run_type=run_type
+        )
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return {"error": f"{type(error).__name__}: {error}", "duration": time.monotonic() - start_time}
+
+    return {"validated": validated_count, "duration": time.monotonic() - start_time}
+
+
+@nautobot_task
+def finish_software_shards(shard_results, validator_path, job_result_pk, last_run, run_type):
+    """Chord callback of the shards of a software validation job, logged to the JobResult `job_result_pk`.
+
+    Updates the software validation summaries and snapshots once all shards succeeded and logs the completion of the
+    shards, otherwise marks the JobResult as failed. Returns the number of validated objects.
+    """
+    validator_class = get_validator_class(validator_path)
+    items_name = validator_class.item_model._meta.verbose_name_plural
+    job_result = JobResult.objects.get(pk=job_result_pk)
+    last_run = datetime.fromisoformat(last_run)
+
+    validated_count = 0
+    failed_count = 0
+    for shard_number, shard_result in enumerate(shard_results, start=1):
+        if "error" in shard_result:
+            failed_count += 1
+            job_result.log(
+                f"Shard {shard_number} of {len(shard_results)} failed: {shard_result['error']}",
+                level_choice=LogLevelChoices.LOG_ERROR,
+            )
+            continue
+        validated_count += shard_result["validated"]
+        job_result.log(
+            f"Shard {shard_number} of {len(shard_results)} validated {shard_result['validated']} {items_name} "
+            f"in {shard_result['duration']:.2f} seconds."
+        )
+
+    if failed_count:
+        job_result.log(f"{failed_count} of {len(shard_results)} shards failed.", level_choice=LogLevelChoices.LOG_ERROR)
+        job_result.status = JobResultStatusChoices.STATUS_FAILURE
+        job_result.date_done = timezone.now()
+        job_result.save()
+        raise RuntimeError(f"{failed_count} of {len(shard_results)} shards failed.")
+
+    job_result.log(f"Performed validation on: {validated_count} {items_name}.")
+    update_validation_reports(validator_class, last_run)
+    # Marks the job result as final, see `get_previous_successful_runs`
+    job_result.log(
+        f"Updated the software validation summaries and snapshot of the {items_name}.",
+        grouping=SHARDS_FINISHED_GROUPING,
+    )
+
+    VALIDATION_JOB_DURATION.labels(validator_class.item_model._meta.model_name, run_type).observe(
+        (timezone.now() - job_result.date_created).total_seconds()
+    )
+
+    return validated_count
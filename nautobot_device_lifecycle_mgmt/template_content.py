@@ -1,21 +1,60 @@
 """Extended core templates for the Lifecycle Management app."""
-from abc import ABCMeta
+from abc import ABCMeta, abstractmethod
 
-from django.db.models import Q
-from nautobot.dcim.models import InventoryItem
+from django.conf import settings
+from django.urls import reverse
 from nautobot.extras.plugins import PluginTemplateExtension
 
+from nautobot_device_lifecycle_mgmt.instrumentation import PANEL_QUERIES, PANEL_RENDER_DURATION, observe_render
+from nautobot_device_lifecycle_mgmt.lifecycle_context import LifecycleContext
 from nautobot_device_lifecycle_mgmt.models import HardwareLCM, ValidatedSoftwareLCM
-from nautobot_device_lifecycle_mgmt.software import DeviceSoftware, InventoryItemSoftware
 from nautobot_device_lifecycle_mgmt.tables import ValidatedSoftwareLCMTable
 
 
-class DeviceTypeHWLCM(PluginTemplateExtension, metaclass=ABCMeta):
+def get_lifecycle_context(context):
+    """Return the LifecycleContext of the page object, shared by all template extensions rendering the page."""
+    return LifecycleContext.for_request(context.get("request"), context["object"])
+
+
+class LifecyclePanel(PluginTemplateExtension, metaclass=ABCMeta):  # pylint: disable=abstract-method
+    """Base class for lifecycle panels on the right side of core object detail pages.
+
+    With the `lazy_load_panels` setting enabled the page only renders a placeholder, which loads the panel
+    from `LifecyclePanelView` once the page is loaded.
+    """
+
+    panel_name = None
+
+    def right_page(self):
+        """Display panel, or its placeholder, on right side of page."""
+        if settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"].get("lazy_load_panels"):
+            panel_url = reverse(
+                "plugins:nautobot_device_lifecycle_mgmt:lifecycle_panel",
+                kwargs={"panel": self.panel_name, "pk": self.context["object"].pk},
+            )
+            return self.render(
+                "nautobot_device_lifecycle_mgmt/inc/lazy_panel.html", extra_context={"panel_url": panel_url}
+            )
+
+        return self.render_panel_instrumented(lazy=False)
+
+    def render_panel_instrumented(self, lazy):
+        """Render the panel content, observing its render time and number of queries."""
+        with observe_render(PANEL_RENDER_DURATION, PANEL_QUERIES, self.panel_name, str(lazy)):
+            return self.render_panel()
+
+    @abstractmethod
+    def render_panel(self):
+        """Render the panel content."""
+
+
+class DeviceTypeHWLCM(LifecyclePanel, metaclass=ABCMeta):
     """Class to add table for HardwareLCM related to device type."""
 
     model = "dcim.devicetype"
+    panel_name = "devicetype-hardware"
 
-    def right_page(self):
+    def render_panel(self):
         """Display table on right side of page."""
         devtype_obj = self.context["object"]
 
@@ -26,30 +65,28 @@ class DeviceTypeHWLCM(PluginTemplateExtension, metaclass=ABCMeta):
 
 
 class DeviceTypeValidatedSoftwareLCM(
-    PluginTemplateExtension,
+    LifecyclePanel,
 ):  # pylint: disable=abstract-method
     """Class to add table for ValidatedSoftwareLCM related to device type."""
 
     model = "dcim.devicetype"
+    panel_name = "devicetype-software"
 
-    def __init__(self, context):
-        """Init setting up the DeviceTypeValidatedSoftwareLCM object."""
-        super().__init__(context)
-        self.device_type_validated_software = ValidatedSoftwareLCM.objects.get_for_object(self.context["object"])
-        self.validated_software_table = ValidatedSoftwareLCMTable(
-            list(self.device_type_validated_software),
-            orderable=False,
-            exclude=(
-                "software",
-                "start",
-                "actions",
-            ),
-        )
-
-    def right_page(self):
+    def render_panel(self):
         """Display table on right side of page."""
+        device_type_validated_software = ValidatedSoftwareLCM.objects.get_for_object(
+            self.context["object"]
+        ).select_related("software__device_platform")
         extra_context = {
-            "validsoft_table": self.validated_software_table,
+            "validsoft_table": ValidatedSoftwareLCMTable(
+                list(device_type_validated_software),
+                orderable=False,
+                exclude=(
+                    "software",
+                    "start",
+                    "actions",
+                ),
+            ),
         }
 
         return self.render(
@@ -58,63 +95,49 @@ class DeviceTypeValidatedSoftwareLCM(
         )
 
 
-class DeviceHWLCM(PluginTemplateExtension, metaclass=ABCMeta):
+class DeviceHWLCM(LifecyclePanel, metaclass=ABCMeta):
     """Class to add table for DeviceHWLCM related to device type."""
 
     model = "dcim.device"
+    panel_name = "device-hardware"
 
-    def right_page(self):
+    def render_panel(self):
         """Display table on right side of page."""
-        dev_obj = self.context["object"]
-
         return self.render(
             "nautobot_device_lifecycle_mgmt/inc/device_notice.html",
-            extra_context={
-                "hw_notices": HardwareLCM.objects.filter(
-                    Q(device_type=dev_obj.device_type)
-                    | Q(
-                        inventory_item__in=[
-                            i.part_id for i in InventoryItem.objects.filter(device__pk=dev_obj.pk) if i.part_id
-                        ]
-                    )
-                )
-            },
+            extra_context={"hw_notices": get_lifecycle_context(self.context).hw_notices},
         )
 
 
-class InventoryItemHWLCM(PluginTemplateExtension, metaclass=ABCMeta):
+class InventoryItemHWLCM(LifecyclePanel, metaclass=ABCMeta):
     """Class to add table for InventoryItemHWLCM related to inventory items."""
 
     model = "dcim.inventoryitem"
+    panel_name = "inventoryitem-hardware"
 
-    def right_page(self):
+    def render_panel(self):
         """Display table on right side of page."""
-        inv_item_obj = self.context["object"]
-
         return self.render(
             "nautobot_device_lifecycle_mgmt/inc/general_notice.html",
-            extra_context={"hw_notices": HardwareLCM.objects.filter(inventory_item=inv_item_obj.part_id)},
+            extra_context={"hw_notices": get_lifecycle_context(self.context).hw_notices},
         )
 
 
 class DeviceSoftwareLCMAndValidatedSoftwareLCM(
-    PluginTemplateExtension,
+    LifecyclePanel,
 ):  # pylint: disable=abstract-method
     """Class to add table for SoftwareLCM and ValidatedSoftwareLCM related to device."""
 
     model = "dcim.device"
+    panel_name = "device-software"
 
-    def __init__(self, context):
-        """Init setting up the DeviceSoftwareLCMAndValidatedSoftwareLCM object."""
-        super().__init__(context)
-        self.device_software = DeviceSoftware(item_obj=self.context["object"])
-
-    def right_page(self):
+    def render_panel(self):
         """Display table on right side of page."""
+        lifecycle_context = get_lifecycle_context(self.context)
         extra_context = {
-            "validsoft_table": self.device_software.get_validated_software_table(),
-            "obj_soft": self.device_software.software,
-            "obj_soft_valid": self.device_software.validate_software(),
+            "validsoft_table": lifecycle_context.validated_software_table,
+            "obj_soft": lifecycle_context.software,
+            "obj_soft_valid": lifecycle_context.software_valid,
         }
 
         return self.render(
@@ -124,23 +147,20 @@ class DeviceSoftwareLCMAndValidatedSoftwareLCM(
 
 
 class InventoryItemSoftwareLCMAndValidatedSoftwareLCM(
-    PluginTemplateExtension,
+    LifecyclePanel,
 ):  # pylint: disable=abstract-method
     """Class to add table for SoftwareLCM and ValidatedSoftwareLCM related to inventory item."""
 
     model = "dcim.inventoryitem"
+    panel_name = "inventoryitem-software"
 
-    def __init__(self, context):
-        """Init setting up the InventoryItemSoftwareLCMAndValidatedSoftwareLCM object."""
-        super().__init__(context)
-        self.inventory_item_software = InventoryItemSoftware(item_obj=self.context["object"])
-
-    def right_page(self):
+    def render_panel(self):
         """Display table on right side of page."""
+        lifecycle_context = get_lifecycle_context(self.context)
         extra_context = {
-            "validsoft_table": self.inventory_item_software.get_validated_software_table,
-            "obj_soft": self.inventory_item_software.software,
-            "obj_soft_valid": self.inventory_item_software.validate_software(),
+            "validsoft_table": lifecycle_context.validated_software_table,
+            "obj_soft": lifecycle_context.software,
+            "obj_soft_valid": lifecycle_context.software_valid,
         }
 
         return self.render(
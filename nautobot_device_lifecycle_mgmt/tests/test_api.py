@@ -5,17 +5,21 @@ from unittest import skip
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from nautobot.apps.testing import APIViewTestCases
+from django.urls import reverse
+from nautobot.apps.testing import APITestCase, APIViewTestCases
 from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, LocationType, Manufacturer, Platform
-from nautobot.extras.models import Role, Status, Tag
+from nautobot.extras.models import Relationship, RelationshipAssociation, Role, Status, Tag
 
+from nautobot_device_lifecycle_mgmt import choices
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     ContractLCM,
+    DeviceSoftwareValidationResult,
     HardwareLCM,
     ProviderLCM,
     SoftwareImageLCM,
     SoftwareLCM,
+    SoftwareValidationSnapshot,
     ValidatedSoftwareLCM,
     VulnerabilityLCM,
 )
@@ -658,6 +662,42 @@ class SoftwareImageLCMAPITest(APIViewTestCases.APIViewTestCase):
         )
         software_image.device_types.set([devicetype.pk for devicetype in devicetypes_arista])
         software_image.save()
+        cls.software_image = software_image
+        cls.device_arista = device_arista
+        cls.inventoryitem_arista = inventoryitems_arista[0]
+        device_soft_rel = Relationship.objects.get(key="device_soft")
+        RelationshipAssociation.objects.create(
+            source=softwares_arista[1], destination=device_arista, relationship=device_soft_rel
+        )
+
+    def test_resolve_software_images(self):
+        """Test batch resolution of software images."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_softwareimagelcm", "dcim.view_device")
+        url = reverse("plugins-api:nautobot_device_lifecycle_mgmt-api:softwareimagelcm-resolve")
+
+        response = self.client.post(
+            url,
+            {"devices": [str(self.device_arista.pk)], "inventory_items": [str(self.inventoryitem_arista.pk)]},
+            format="json",
+            **self.header,
+        )
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            [image["id"] for image in response.data["devices"][str(self.device_arista.pk)]],
+            [str(self.software_image.pk)],
+        )
+        # Inventory items the user is not permitted to view are left out
+        self.assertEqual(response.data["inventory_items"], {})
+
+    def test_resolve_software_images_invalid(self):
+        """Test batch resolution of software images with invalid input."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_softwareimagelcm")
+        url = reverse("plugins-api:nautobot_device_lifecycle_mgmt-api:softwareimagelcm-resolve")
+
+        response = self.client.post(url, {"devices": ["invalid"]}, format="json", **self.header)
+
+        self.assertHttpStatus(response, 400)
 
     @skip("Not implemented")
     def test_bulk_delete_objects(self):
@@ -749,3 +789,106 @@ class ProviderLCMAPITest(APIViewTestCases.APIViewTestCase):
     @skip("Not implemented")
     def test_bulk_delete_objects(self):
         pass
+
+
+class DeviceSoftwareValidationResultAPITest(APITestCase):
+    """Test the DeviceSoftwareValidationResult API."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        self.devices = create_devices()
+        software = SoftwareLCM.objects.create(device_platform=self.devices[0].platform, version="17.3.3")
+        DeviceSoftwareValidationResult.objects.create(device=self.devices[0], software=software, is_validated=True)
+        DeviceSoftwareValidationResult.objects.create(device=self.devices[1], software=software, is_validated=False)
+        DeviceSoftwareValidationResult.objects.create(device=self.devices[2], software=None, is_validated=False)
+        self.url = reverse("plugins-api:nautobot_device_lifecycle_mgmt-api:devicesoftwarevalidationresult-chart-data")
+
+    def test_chart_data_without_permission(self):
+        """Test the chart data are not returned without permission."""
+        self.assertHttpStatus(self.client.get(self.url, **self.header), 403)
+
+    def test_chart_data(self):
+        """Test the chart data of the report."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+
+        response = self.client.get(self.url, **self.header)
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            response.data["aggregation"],
+            {"total": 3, "valid": 1, "invalid": 1, "no_software": 1, "name": "Devices", "valid_percent": 33.33},
+        )
+        self.assertEqual(response.data["pie_chart"]["data"], [1, 1, 1])
+        bar_chart = response.data["bar_chart"]
+        self.assertEqual([series["label"] for series in bar_chart["series"]], ["Valid", "Invalid", "No Software"])
+        self.assertEqual(sum(sum(series["data"]) for series in bar_chart["series"]), 3)
+
+    def test_chart_data_filtered(self):
+        """Test the chart data of the filtered results."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+
+        response = self.client.get(self.url, {"device_id": [self.devices[0].pk]}, **self.header)
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["aggregation"]["total"], 1)
+        self.assertEqual(response.data["aggregation"]["valid"], 1)
+
+
+class SoftwareValidationSnapshotAPITest(APITestCase):
+    """Test the SoftwareValidationSnapshot API."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        device_ct = ContentType.objects.get_for_model(Device)
+        for day, valid in ((1, 2), (2, 3)):
+            period_start = datetime.datetime(2023, 1, day, tzinfo=datetime.timezone.utc)
+            for content_type, group_by in (
+                (device_ct, choices.ValidationSummaryGroupChoices.ALL),
+                (device_ct, choices.ValidationSummaryGroupChoices.PLATFORM),
+                (ContentType.objects.get_for_model(InventoryItem), choices.ValidationSummaryGroupChoices.ALL),
+            ):
+                SoftwareValidationSnapshot.objects.create(
+                    content_type=content_type,
+                    group_by=group_by,
+                    period_start=period_start,
+                    last_run=period_start,
+                    total=4,
+                    valid=valid,
+                    invalid=4 - valid,
+                )
+        self.url = reverse("plugins-api:nautobot_device_lifecycle_mgmt-api:softwarevalidationsnapshot-trend")
+
+    def test_trend_without_permission(self):
+        """Test the trend is not returned without permission."""
+        self.assertHttpStatus(self.client.get(self.url, **self.header), 403)
+
+    def test_trend(self):
+        """Test the compliance trend of the filtered snapshots."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_softwarevalidationsnapshot")
+
+        response = self.client.get(
+            self.url,
+            {"content_type": "dcim.device", "group_by": choices.ValidationSummaryGroupChoices.ALL},
+            **self.header,
+        )
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["group_by"], choices.ValidationSummaryGroupChoices.ALL)
+        self.assertEqual([point["valid_percent"] for point in response.data[0]["points"]], [50, 75])
+
+    def test_list(self):
+        """Test the snapshots are listed."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_softwarevalidationsnapshot")
+
+        response = self.client.get(
+            reverse("plugins-api:nautobot_device_lifecycle_mgmt-api:softwarevalidationsnapshot-list"),
+            {"content_type": "dcim.inventoryitem"},
+            **self.header,
+        )
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["valid_percent"], 50)
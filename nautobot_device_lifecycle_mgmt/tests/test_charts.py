@@ -0,0 +1,164 @@
+"""Tests for the report charts and their cache."""
+import subprocess  # nosec
+import sys
+from datetime import datetime, timezone
+from unittest import mock
+
+import matplotlib.pyplot as plt
+from django.test import TestCase
+from django.urls import reverse
+from nautobot.apps.testing import TestCase as NautobotTestCase
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.charts import (
+    ChartCache,
+    chart_cache,
+    get_chart_key,
+    plot_barchart_visual,
+    plot_piechart_visual,
+)
+from nautobot_device_lifecycle_mgmt.compliance_history import record_snapshots
+from nautobot_device_lifecycle_mgmt.models import DeviceSoftwareValidationResult
+from nautobot_device_lifecycle_mgmt.software import DeviceSoftwareBulkValidator
+
+from .conftest import create_devices
+
+BAR_CHART_ATTRS = {
+    "label_accessor": "name",
+    "ylabel": "Device",
+    "title": "Valid per Platform",
+    "chart_bars": [{"label": "Valid", "data_attr": "valid", "color": "#D5E8D4"}],
+}
+PIE_CHART_ATTRS = {"aggr_labels": ["valid", "invalid"], "chart_labels": ["Valid", "Invalid"]}
+
+
+class ChartsTestCase(TestCase):
+    """Tests for the chart rendering and ChartCache."""
+
+    def test_figures_closed(self):
+        plt.close("all")
+
+        self.assertTrue(plot_barchart_visual([{"name": "ios", "valid": 2}], BAR_CHART_ATTRS))
+        self.assertTrue(plot_piechart_visual({"name": "Devices", "valid": 2, "invalid": 1}, PIE_CHART_ATTRS))
+
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_plotting_stack_not_imported_on_startup(self):
+        # Run in a fresh process, the tests already imported matplotlib
+        output = subprocess.run(  # nosec
+            [
+                sys.executable,
+                "-c",
+                "import sys, nautobot; nautobot.setup(); import django; django.setup(); "
+                "import nautobot_device_lifecycle_mgmt.urls, nautobot_device_lifecycle_mgmt.api.urls; "
+                "print('matplotlib' in sys.modules, 'numpy' in sys.modules)",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+        self.assertEqual(output.strip().splitlines()[-1], "False False")
+
+    def test_chart_key(self):
+        last_run = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            get_chart_key("chart", {"platform": ["b", "a"], "device_type": "x", "role": ""}, last_run),
+            get_chart_key("chart", {"device_type": ["x"], "platform": ["a", "b"]}, last_run),
+        )
+        self.assertNotEqual(
+            get_chart_key("chart", {"platform": ["a"]}, last_run),
+            get_chart_key("chart", {"platform": ["a"]}, None),
+        )
+        self.assertNotEqual(get_chart_key("chart", {}, last_run), get_chart_key("other_chart", {}, last_run))
+
+    def test_chart_cache(self):
+        cache = ChartCache(max_size=2)
+        render = mock.Mock(side_effect=lambda: "chart")
+
+        cache.get_or_render("a", render)
+        cache.get_or_render("b", render)
+        self.assertEqual(cache.get_or_render("a", render), "chart")
+        self.assertEqual(render.call_count, 2)
+
+        # The least recently used chart is evicted
+        cache.get_or_render("c", render)
+        self.assertEqual(len(cache), 2)
+        cache.get_or_render("a", render)
+        self.assertEqual(render.call_count, 3)
+        cache.get_or_render("b", render)
+        self.assertEqual(render.call_count, 4)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_chart_cache_disabled(self):
+        cache = ChartCache(max_size=0)
+        render = mock.Mock(side_effect=lambda: "chart")
+
+        cache.get_or_render("a", render)
+        cache.get_or_render("a", render)
+
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+
+class ReportChartCacheViewTest(NautobotTestCase):
+    """Test the report views serving the charts from the cache."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        for device in create_devices():
+            DeviceSoftwareValidationResult.objects.create(
+                device=device,
+                software=None,
+                is_validated=False,
+                last_run=datetime(2023, 1, 1, tzinfo=timezone.utc),
+                run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+            )
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+        self.url = reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report")
+        chart_cache.clear()
+        self.addCleanup(chart_cache.clear)
+
+    def test_client_side_charts(self):
+        response = self.client.get(self.url)
+
+        self.assertHttpStatus(response, 200)
+        self.assertNotIn("bar_chart", response.context)
+        chart_data = response.context["chart_data"]
+        self.assertEqual(chart_data["pie_chart"]["data"], [0, 0, 3])
+        self.assertEqual(sum(chart_data["bar_chart"]["series"][2]["data"]), 3)
+        self.assertContains(response, 'id="lcm-chart-data"')
+
+    def test_trend_chart(self):
+        self.assertIsNone(self.client.get(self.url).context["chart_data"]["trend_chart"])
+
+        summaries = DeviceSoftwareBulkValidator.update_summaries(last_run=datetime(2023, 1, 1, tzinfo=timezone.utc))
+        record_snapshots(summaries, last_run=datetime(2023, 1, 1, tzinfo=timezone.utc))
+        response = self.client.get(self.url)
+
+        trend_chart = response.context["chart_data"]["trend_chart"]
+        self.assertEqual(trend_chart["labels"], ["2023-01-01 00:00"])
+        self.assertEqual(trend_chart["series"][0]["data"], [0])
+        self.assertContains(response, 'id="lcm-trend-chart"')
+        # The trend isn't filtered
+        self.assertNotIn("trend_chart", self.client.get(self.url, {"valid": True}).context["chart_data"])
+
+    @mock.patch.dict("nautobot_device_lifecycle_mgmt.views.PLUGIN_CFG", {"client_side_charts": False})
+    def test_charts_rendered_once(self):
+        with mock.patch(
+            "nautobot_device_lifecycle_mgmt.views.plot_barchart_visual", return_value="chart"
+        ) as plot_barchart:
+            for _ in range(2):
+                response = self.client.get(self.url)
+                self.assertHttpStatus(response, 200)
+                self.assertEqual(response.context["bar_chart"], "chart")
+            self.assertEqual(plot_barchart.call_count, 1)
+
+            # A new report run renders new charts
+            DeviceSoftwareValidationResult.objects.update(last_run=datetime(2023, 1, 2, tzinfo=timezone.utc))
+            self.client.get(self.url)
+            self.assertEqual(plot_barchart.call_count, 2)
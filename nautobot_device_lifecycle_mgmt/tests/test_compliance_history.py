@@ -0,0 +1,147 @@
+"""Tests for the historical snapshots of the software validation summaries."""
+from datetime import datetime, timezone
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from nautobot.dcim.models import Device
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.compliance_history import (
+    downsample_snapshots,
+    get_period_start,
+    get_trend,
+    record_snapshots,
+)
+from nautobot_device_lifecycle_mgmt.models import SoftwareValidationSnapshot, SoftwareValidationSummary
+
+RESOLUTION = choices.SnapshotResolutionChoices
+RETENTION = {RESOLUTION.RUN: 7, RESOLUTION.DAILY: 30, RESOLUTION.WEEKLY: 90, RESOLUTION.MONTHLY: 365}
+NOW = datetime(2023, 6, 30, 12, tzinfo=timezone.utc)
+
+
+class ComplianceHistoryTestCase(TestCase):
+    """Tests for recording, downsampling and reporting the snapshots."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(Device)
+
+    def record_run(self, last_run, valid, total=10):
+        """Record the snapshots of a validation run with `valid` of `total` devices validated."""
+        summaries = [
+            SoftwareValidationSummary(
+                content_type=self.content_type,
+                group_by=group_by,
+                group_name=group_name,
+                total=total,
+                valid=valid,
+                invalid=total - valid,
+                no_software=0,
+            )
+            for group_by, group_name in (
+                (choices.ValidationSummaryGroupChoices.ALL, ""),
+                (choices.ValidationSummaryGroupChoices.PLATFORM, "cisco_ios"),
+                (choices.ValidationSummaryGroupChoices.ROLE, "core"),
+            )
+        ]
+        record_snapshots(summaries, last_run=last_run)
+
+    @staticmethod
+    def get_snapshots(resolution):
+        """Return the (period_start, valid) of the snapshots of all devices with `resolution`."""
+        return list(
+            SoftwareValidationSnapshot.objects.filter(
+                group_by=choices.ValidationSummaryGroupChoices.ALL, resolution=resolution
+            )
+            .order_by("period_start")
+            .values_list("period_start", "valid")
+        )
+
+    def test_period_start(self):
+        timestamp = datetime(2023, 6, 15, 13, 45, tzinfo=timezone.utc)  # Thursday
+
+        self.assertEqual(get_period_start(timestamp, RESOLUTION.RUN), timestamp)
+        self.assertEqual(get_period_start(timestamp, RESOLUTION.DAILY), datetime(2023, 6, 15, tzinfo=timezone.utc))
+        self.assertEqual(get_period_start(timestamp, RESOLUTION.WEEKLY), datetime(2023, 6, 12, tzinfo=timezone.utc))
+        self.assertEqual(get_period_start(timestamp, RESOLUTION.MONTHLY), datetime(2023, 6, 1, tzinfo=timezone.utc))
+
+    def test_record_snapshots(self):
+        self.record_run(NOW, valid=5)
+
+        snapshots = SoftwareValidationSnapshot.objects.all()
+        # Role summaries aren't recorded
+        self.assertEqual(
+            sorted(snapshots.values_list("group_by", flat=True)),
+            [choices.ValidationSummaryGroupChoices.ALL, choices.ValidationSummaryGroupChoices.PLATFORM],
+        )
+        for snapshot in snapshots:
+            self.assertEqual(snapshot.resolution, RESOLUTION.RUN)
+            self.assertEqual((snapshot.period_start, snapshot.last_run), (NOW, NOW))
+            self.assertEqual(snapshot.valid_percent, 50)
+
+    def test_downsample_daily(self):
+        # Two runs on a day past the run retention, one within it
+        self.record_run(datetime(2023, 6, 20, 8, tzinfo=timezone.utc), valid=1)
+        self.record_run(datetime(2023, 6, 20, 20, tzinfo=timezone.utc), valid=2)
+        self.record_run(datetime(2023, 6, 29, 8, tzinfo=timezone.utc), valid=3)
+
+        downsample_snapshots(now=NOW, retention=RETENTION)
+
+        self.assertEqual(self.get_snapshots(RESOLUTION.RUN), [(datetime(2023, 6, 29, 8, tzinfo=timezone.utc), 3)])
+        # The last run of the day is kept
+        self.assertEqual(self.get_snapshots(RESOLUTION.DAILY), [(datetime(2023, 6, 20, tzinfo=timezone.utc), 2)])
+        daily = SoftwareValidationSnapshot.objects.get(
+            group_by=choices.ValidationSummaryGroupChoices.ALL, resolution=RESOLUTION.DAILY
+        )
+        self.assertEqual(daily.last_run, datetime(2023, 6, 20, 20, tzinfo=timezone.utc))
+        self.assertEqual(SoftwareValidationSnapshot.objects.filter(resolution=RESOLUTION.DAILY).count(), 2)
+
+    def test_downsample_merges_into_existing_period(self):
+        self.record_run(datetime(2023, 6, 20, 8, tzinfo=timezone.utc), valid=1)
+        downsample_snapshots(now=NOW, retention=RETENTION)
+
+        # A later run of the same day expires on the next downsampling
+        self.record_run(datetime(2023, 6, 20, 20, tzinfo=timezone.utc), valid=2)
+        downsample_snapshots(now=NOW, retention=RETENTION)
+
+        self.assertEqual(self.get_snapshots(RESOLUTION.RUN), [])
+        self.assertEqual(self.get_snapshots(RESOLUTION.DAILY), [(datetime(2023, 6, 20, tzinfo=timezone.utc), 2)])
+
+    def test_downsample_weekly_monthly_and_retention(self):
+        self.record_run(datetime(2022, 1, 10, tzinfo=timezone.utc), valid=1)  # Past the monthly retention
+        self.record_run(datetime(2023, 2, 14, tzinfo=timezone.utc), valid=2)
+        self.record_run(datetime(2023, 2, 20, tzinfo=timezone.utc), valid=3)
+        self.record_run(datetime(2023, 5, 3, tzinfo=timezone.utc), valid=4)  # Wednesday
+
+        downsample_snapshots(now=NOW, retention=RETENTION)
+
+        self.assertEqual(self.get_snapshots(RESOLUTION.RUN), [])
+        self.assertEqual(self.get_snapshots(RESOLUTION.DAILY), [])
+        self.assertEqual(self.get_snapshots(RESOLUTION.WEEKLY), [(datetime(2023, 5, 1, tzinfo=timezone.utc), 4)])
+        self.assertEqual(self.get_snapshots(RESOLUTION.MONTHLY), [(datetime(2023, 2, 1, tzinfo=timezone.utc), 3)])
+
+    def test_downsample_kept_forever(self):
+        self.record_run(datetime(2020, 1, 1, tzinfo=timezone.utc), valid=1)
+
+        downsample_snapshots(now=NOW, retention={**RETENTION, RESOLUTION.RUN: None})
+
+        self.assertEqual(self.get_snapshots(RESOLUTION.RUN), [(datetime(2020, 1, 1, tzinfo=timezone.utc), 1)])
+
+    def test_trend(self):
+        self.record_run(datetime(2023, 2, 14, tzinfo=timezone.utc), valid=2)
+        self.record_run(datetime(2023, 6, 29, 8, tzinfo=timezone.utc), valid=5)
+        downsample_snapshots(now=NOW, retention=RETENTION)
+
+        trend = get_trend(SoftwareValidationSnapshot.objects.all())
+
+        self.assertEqual(
+            sorted((series["group_by"], series["group_name"]) for series in trend),
+            [
+                (choices.ValidationSummaryGroupChoices.ALL, ""),
+                (choices.ValidationSummaryGroupChoices.PLATFORM, "cisco_ios"),
+            ],
+        )
+        self.assertEqual(
+            [(point["resolution"], point["valid_percent"]) for point in trend[0]["points"]],
+            [(RESOLUTION.MONTHLY, 20), (RESOLUTION.RUN, 50)],
+        )
+        self.assertEqual(trend[0]["points"][0]["period_start"], datetime(2023, 2, 1, tzinfo=timezone.utc))
@@ -228,6 +228,60 @@ class SoftwareLCMFilterSetTestCase(TestCase):
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
 
 
+class SoftwareLCMVersionFilterSetTestCase(TestCase):
+    """Tests for the SoftwareLCMFilterSet filters comparing versions."""
+
+    queryset = SoftwareLCM.objects.all()
+    filterset = SoftwareLCMFilterSet
+
+    def setUp(self):
+        platform_ios = Platform.objects.create(name="Cisco IOS", network_driver="cisco_ios")
+        platform_eos = Platform.objects.create(name="Arista EOS", network_driver="arista_eos")
+        self.softwares = {
+            version: SoftwareLCM.objects.create(device_platform=platform, version=version)
+            for platform, version in (
+                (platform_ios, "15.10(1)"),
+                (platform_ios, "15.2(4)E10"),
+                (platform_ios, "15.2(4)E9"),
+                (platform_ios, "15.2(7)E"),
+                (platform_eos, "4.28.3M"),
+                (platform_eos, "4.9.1F"),
+            )
+        }
+
+    def get_versions(self, params):
+        """Return the set of versions of the software filtered by `params`."""
+        return set(self.filterset(params, self.queryset).qs.values_list("version", flat=True))
+
+    def test_version_gt(self):
+        """Test version__gt filter."""
+        params = {"version__gt": "15.2(4)E9"}
+        self.assertEqual(self.get_versions(params), {"15.2(4)E10", "15.2(7)E", "15.10(1)"})
+
+    def test_version_lt(self):
+        """Test version__lt and version__lte filters, parsed for each platform."""
+        self.assertEqual(self.get_versions({"version__lt": "4.28.3F"}), {"4.9.1F"})
+        # The release train of EOS versions isn't compared
+        self.assertEqual(self.get_versions({"version__lte": "4.28.3F"}), {"4.9.1F", "4.28.3M"})
+
+    def test_version_gte(self):
+        """Test version__gte filter combined with the platform filter."""
+        params = {"version__gte": "15.2(7)", "device_platform": ["Cisco IOS"]}
+        self.assertEqual(self.get_versions(params), {"15.2(7)E", "15.10(1)"})
+
+    def test_latest(self):
+        """Test latest filter."""
+        self.assertEqual(self.get_versions({"latest": True}), {"15.10(1)", "4.28.3M"})
+        self.assertEqual(self.get_versions({"latest": False}), {"15.2(4)E10", "15.2(4)E9", "15.2(7)E", "4.9.1F"})
+
+    def test_ordering(self):
+        """Test the versions of a platform are ordered by their sort key."""
+        self.assertEqual(
+            list(self.queryset.filter(device_platform__name="Cisco IOS").values_list("version", flat=True)),
+            ["15.2(4)E9", "15.2(4)E10", "15.2(7)E", "15.10(1)"],
+        )
+
+
 class ValidatedSoftwareLCMFilterSetTestCase(TestCase):
     """Tests for ValidatedSoftwareLCMFilterSet."""
 
@@ -0,0 +1,126 @@
+"""Tests for the Prometheus instrumentation of the hot paths of the app."""
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nautobot.apps.testing import TestCase
+from nautobot.core.testing import run_job_for_testing
+from nautobot.dcim.models import Device
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import Job
+from prometheus_client import REGISTRY
+
+from nautobot_device_lifecycle_mgmt.metrics import metrics_lcm_hw_end_of_support
+from nautobot_device_lifecycle_mgmt.models import DeviceSoftwareValidationResult
+from nautobot_device_lifecycle_mgmt.software import DeviceSoftwareBulkValidator
+from nautobot_device_lifecycle_mgmt.template_content import DeviceHWLCM
+
+from .conftest import create_cves, create_devices, create_softwares
+
+
+def get_sample_value(name, **labels):
+    """Return the value of the sample `name` with `labels` in the default registry, 0 if it wasn't observed yet."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class InstrumentationTestCase(TestCase):
+    """Tests for the metrics observed by the instrumented code."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        self.devices = create_devices()
+
+    def test_validation(self):
+        validated_before = get_sample_value("nautobot_lcm_validated_objects_total", model="device")
+        latency_count_before = get_sample_value("nautobot_lcm_validation_object_latency_seconds_count", model="device")
+
+        DeviceSoftwareBulkValidator(Device.objects.all()).validate(last_run=datetime.datetime.now())
+
+        self.assertEqual(
+            get_sample_value("nautobot_lcm_validated_objects_total", model="device") - validated_before,
+            len(self.devices),
+        )
+        self.assertEqual(
+            get_sample_value("nautobot_lcm_validation_object_latency_seconds_count", model="device")
+            - latency_count_before,
+            1,
+        )
+
+    def test_vulnerability_generation(self):
+        cves_before = get_sample_value("nautobot_lcm_vulnerability_generation_cves_total")
+        duration_count_before = get_sample_value("nautobot_lcm_vulnerability_generation_duration_seconds_count")
+        create_cves()
+        job = Job.objects.get(job_class_name="GenerateVulnerabilities")
+        job.enabled = True
+        job.validated_save()
+
+        job_result = run_job_for_testing(job, published_after="1970-01-01")
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(get_sample_value("nautobot_lcm_vulnerability_generation_cves_total") - cves_before, 3)
+        self.assertEqual(
+            get_sample_value("nautobot_lcm_vulnerability_generation_duration_seconds_count") - duration_count_before,
+            1,
+        )
+
+    def test_report_render(self):
+        DeviceSoftwareValidationResult.objects.create(
+            device=self.devices[0], software=create_softwares()[0], is_validated=True
+        )
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+        renders_before = get_sample_value("nautobot_lcm_report_render_seconds_count", report="device")
+        queries_before = get_sample_value("nautobot_lcm_report_queries_sum", report="device")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report")
+            )
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            get_sample_value("nautobot_lcm_report_render_seconds_count", report="device") - renders_before, 1
+        )
+        # The report is aggregated from the validation results, these queries are counted with the rendering ones
+        results_table = DeviceSoftwareValidationResult._meta.db_table
+        self.assertTrue(any(results_table in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(
+            get_sample_value("nautobot_lcm_report_queries_sum", report="device") - queries_before,
+            len(queries.captured_queries),
+        )
+
+    def test_panel_render(self):
+        labels = {"panel": "device-hardware", "lazy": "False"}
+        renders_before = get_sample_value("nautobot_lcm_panel_render_seconds_count", **labels)
+        queries_before = get_sample_value("nautobot_lcm_panel_queries_sum", **labels)
+
+        DeviceHWLCM({"object": self.devices[0]}).right_page()
+
+        self.assertEqual(get_sample_value("nautobot_lcm_panel_render_seconds_count", **labels) - renders_before, 1)
+        self.assertGreater(get_sample_value("nautobot_lcm_panel_queries_sum", **labels) - queries_before, 0)
+
+    def test_lazy_panel_render(self):
+        labels = {"panel": "device-hardware", "lazy": "True"}
+        renders_before = get_sample_value("nautobot_lcm_panel_render_seconds_count", **labels)
+        self.add_permissions("dcim.view_device", "nautobot_device_lifecycle_mgmt.view_hardwarelcm")
+
+        response = self.client.get(
+            reverse(
+                "plugins:nautobot_device_lifecycle_mgmt:lifecycle_panel",
+                kwargs={"panel": "device-hardware", "pk": self.devices[0].pk},
+            )
+        )
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(get_sample_value("nautobot_lcm_panel_render_seconds_count", **labels) - renders_before, 1)
+
+    def test_metrics_collection(self):
+        labels = {"collector": "metrics_lcm_hw_end_of_support"}
+        collections_before = get_sample_value("nautobot_lcm_metrics_collection_seconds_count", **labels)
+
+        list(metrics_lcm_hw_end_of_support())
+
+        self.assertEqual(
+            get_sample_value("nautobot_lcm_metrics_collection_seconds_count", **labels) - collections_before, 1
+        )
@@ -0,0 +1,71 @@
+# pylint: disable=no-member
+"""Tests for the LifecycleContext shared by the template extensions."""
+from datetime import date
+
+from django.test import RequestFactory, TestCase
+from nautobot.dcim.models import InventoryItem
+from nautobot.extras.models import Relationship, RelationshipAssociation
+
+from nautobot_device_lifecycle_mgmt.lifecycle_context import LifecycleContext
+from nautobot_device_lifecycle_mgmt.models import HardwareLCM, SoftwareLCM
+
+from .conftest import create_devices
+from .test_software import create_validated_software
+
+
+class LifecycleContextTestCase(TestCase):
+    """Tests for LifecycleContext."""
+
+    def setUp(self):
+        self.device, self.device_other, _ = create_devices()
+        self.software = SoftwareLCM.objects.create(device_platform=self.device.platform, version="17.3.3")
+        RelationshipAssociation.objects.create(
+            source=self.software, destination=self.device, relationship=Relationship.objects.get(key="device_soft")
+        )
+        self.validated_software = create_validated_software(self.software, date(2019, 1, 10), devices=[self.device])
+        self.notice_device_type = HardwareLCM.objects.create(
+            device_type=self.device.device_type, end_of_sale=date(2023, 4, 1)
+        )
+        self.notice_part = HardwareLCM.objects.create(inventory_item="WS-X6548-GE-TX", end_of_sale=date(2023, 4, 1))
+        HardwareLCM.objects.create(inventory_item="WS-SUP720-3BXL", end_of_sale=date(2023, 4, 1))
+        InventoryItem.objects.create(device=self.device, name="Linecard 1", part_id="WS-X6548-GE-TX")
+        InventoryItem.objects.create(device=self.device, name="Linecard 2", part_id="")
+
+    def test_for_request(self):
+        request = RequestFactory().get("/")
+        lifecycle_context = LifecycleContext.for_request(request, self.device)
+
+        self.assertIs(LifecycleContext.for_request(request, self.device), lifecycle_context)
+        self.assertIsNot(LifecycleContext.for_request(request, self.device_other), lifecycle_context)
+        self.assertIsNot(LifecycleContext.for_request(RequestFactory().get("/"), self.device), lifecycle_context)
+        self.assertIsNot(LifecycleContext.for_request(None, self.device), lifecycle_context)
+
+    def test_device_context(self):
+        lifecycle_context = LifecycleContext(self.device)
+
+        self.assertEqual(lifecycle_context.software, self.software)
+        self.assertEqual(lifecycle_context.validated_software, [self.validated_software])
+        self.assertTrue(lifecycle_context.software_valid)
+        self.assertEqual(
+            sorted(lifecycle_context.hw_notices, key=str), sorted([self.notice_device_type, self.notice_part], key=str)
+        )
+        self.assertEqual(len(lifecycle_context.validated_software_table.rows), 1)
+
+    def test_device_context_queries(self):
+        lifecycle_context = LifecycleContext(self.device)
+
+        # Software, validated software, the table custom field, computed field and relationship columns, notices
+        with self.assertNumQueries(7):
+            for _ in range(2):
+                str(lifecycle_context.software)
+                str(lifecycle_context.validated_software)
+                lifecycle_context.software_valid  # pylint: disable=pointless-statement
+                str(lifecycle_context.validated_software_table.rows[0].get_cell("name"))
+                str(lifecycle_context.hw_notices)
+
+    def test_device_context_without_software(self):
+        lifecycle_context = LifecycleContext(self.device_other)
+
+        self.assertIsNone(lifecycle_context.software)
+        self.assertFalse(lifecycle_context.software_valid)
+        self.assertIsNone(lifecycle_context.validated_software_table)
@@ -0,0 +1,150 @@
+"""Tests for the Prometheus metrics of the app."""
+from datetime import date
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from nautobot.core.testing import run_job_for_testing
+from nautobot.dcim.models import InventoryItem
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import Job
+
+from nautobot_device_lifecycle_mgmt import metrics
+from nautobot_device_lifecycle_mgmt.metrics import (
+    METRICS_SNAPSHOT_CACHE_KEY,
+    METRICS_SNAPSHOT_LOCK_CACHE_KEY,
+    metrics_lcm_hw_end_of_support,
+    metrics_lcm_metrics_snapshot_age,
+    metrics_lcm_validation_report_device_type,
+)
+from nautobot_device_lifecycle_mgmt.models import DeviceSoftwareValidationResult, HardwareLCM
+
+from .conftest import create_devices, create_inventory_items
+
+SNAPSHOT_KEY = METRICS_SNAPSHOT_CACHE_KEY.format("metrics_lcm_validation_report_device_type")
+
+
+def collect_samples(collector):
+    """Return the samples of the metrics of `collector` as a dict of labels tuple to value."""
+    return {tuple(sorted(sample.labels.items())): sample.value for family in collector() for sample in family.samples}
+
+
+def expire_snapshot():
+    """Age the snapshot of the device type validation metrics past its time to live."""
+    snapshot = cache.get(SNAPSHOT_KEY)
+    snapshot["created"] -= 3600
+    cache.set(SNAPSHOT_KEY, snapshot, None)
+
+
+class MetricsSnapshotTestCase(TestCase):
+    """Tests for serving the metrics from snapshots."""
+
+    def setUp(self):
+        self.device = create_devices()[0]
+        self.device_type_labels = (("device_type", self.device.device_type.model), ("is_valid", "True"))
+        cache.delete_many(
+            [SNAPSHOT_KEY, METRICS_SNAPSHOT_LOCK_CACHE_KEY.format("metrics_lcm_validation_report_device_type")]
+        )
+        self.addCleanup(cache.delete, SNAPSHOT_KEY)
+
+    def validate_device(self):
+        """Record the software of the device as valid."""
+        DeviceSoftwareValidationResult.objects.create(device=self.device, software=None, is_validated=True)
+
+    def test_live_metrics(self):
+        self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type)[self.device_type_labels], 0)
+        self.validate_device()
+
+        self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type)[self.device_type_labels], 1)
+        self.assertIsNone(cache.get(SNAPSHOT_KEY))
+        self.assertEqual(list(metrics_lcm_metrics_snapshot_age()), [])
+
+    @mock.patch.dict(metrics.PLUGIN_CFG, {"metrics_snapshot_mode": "ttl", "metrics_snapshot_ttl": 60})
+    def test_ttl_snapshot(self):
+        live_samples = collect_samples(metrics_lcm_validation_report_device_type)
+        self.validate_device()
+
+        # The snapshot is served until it's expired
+        with self.assertNumQueries(0):
+            self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type), live_samples)
+        expire_snapshot()
+        self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type)[self.device_type_labels], 1)
+
+    @mock.patch.dict(metrics.PLUGIN_CFG, {"metrics_snapshot_mode": "ttl", "metrics_snapshot_ttl": 60})
+    def test_ttl_snapshot_refreshed_once(self):
+        collect_samples(metrics_lcm_validation_report_device_type)
+        self.validate_device()
+        expire_snapshot()
+
+        # Another process is refreshing the snapshot
+        cache.add(METRICS_SNAPSHOT_LOCK_CACHE_KEY.format("metrics_lcm_validation_report_device_type"), True)
+        self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type)[self.device_type_labels], 0)
+
+    @mock.patch.dict(metrics.PLUGIN_CFG, {"metrics_snapshot_mode": "job"})
+    def test_job_snapshot(self):
+        collect_samples(metrics_lcm_validation_report_device_type)
+        self.validate_device()
+        expire_snapshot()
+
+        # Expired snapshots are only refreshed by the job
+        self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type)[self.device_type_labels], 0)
+        job = Job.objects.get(job_class_name="RefreshMetricsSnapshots")
+        job.enabled = True
+        job.validated_save()
+        job_result = run_job_for_testing(job)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(collect_samples(metrics_lcm_validation_report_device_type)[self.device_type_labels], 1)
+
+    @mock.patch.dict(metrics.PLUGIN_CFG, {"metrics_snapshot_mode": "ttl", "metrics_snapshot_ttl": 60})
+    def test_snapshot_age(self):
+        collect_samples(metrics_lcm_validation_report_device_type)
+        expire_snapshot()
+        cache.add(METRICS_SNAPSHOT_LOCK_CACHE_KEY.format("metrics_lcm_validation_report_device_type"), True)
+
+        samples = collect_samples(metrics_lcm_metrics_snapshot_age)
+
+        self.assertGreaterEqual(samples[(("collector", "metrics_lcm_validation_report_device_type"),)], 3600)
+
+
+class HardwareEndOfSupportMetricsTestCase(TestCase):
+    """Tests for the hardware end of support metrics."""
+
+    def setUp(self):
+        inventory_items = create_inventory_items()
+        device = inventory_items[0].device
+        HardwareLCM.objects.create(device_type=device.device_type, end_of_support=date(2020, 1, 1))
+        HardwareLCM.objects.create(inventory_item="VS-S2T-10G", end_of_support=date(2020, 1, 1))
+        HardwareLCM.objects.create(inventory_item="QSFP-100G-SR4-S", end_of_support=date(2099, 1, 1))
+        # Two inventory items sharing the out of support part id, and one without part id
+        InventoryItem.objects.create(device=device, name="Spare SUP2T Card", part_id="VS-S2T-10G")
+        InventoryItem.objects.create(device=device, name="Fan Tray")
+
+    def test_hw_end_of_support_metrics(self):
+        samples = collect_samples(getattr(metrics_lcm_hw_end_of_support, "__wrapped__", metrics_lcm_hw_end_of_support))
+
+        self.assertEqual(
+            samples,
+            {
+                (("part_number", "6509-E"),): 3,
+                (("part_number", "VS-S2T-10G"),): 2,
+                (("part_number", "QSFP-100G-SR4-S"),): 0,
+                (("part_number", "WS-X6548-GE-TX"),): 0,
+                (("part_number", "Fan Tray"),): 0,
+                (("location", "Location1"),): 4,
+                (("location", "Location2"),): 1,
+            },
+        )
+
+    def test_hw_end_of_support_metrics_queries(self):
+        InventoryItem.objects.bulk_create(
+            [
+                InventoryItem(device=item.device, name=f"{item.name} {index}", part_id=item.part_id)
+                for index in range(10)
+                for item in InventoryItem.objects.all()[:3]
+            ]
+        )
+
+        # The number of queries doesn't grow with the number of part numbers and locations
+        with self.assertNumQueries(6):
+            list(getattr(metrics_lcm_hw_end_of_support, "__wrapped__", metrics_lcm_hw_end_of_support)())
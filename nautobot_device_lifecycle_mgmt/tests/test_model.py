@@ -7,15 +7,17 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.test import TestCase
-from nautobot.dcim.models import DeviceType, Manufacturer, Platform
+from nautobot.dcim.models import Device, DeviceType, InventoryItem, Manufacturer, Platform
 from nautobot.extras.choices import RelationshipTypeChoices
 from nautobot.extras.models import Relationship, RelationshipAssociation, Status, Tag
 
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     ContractLCM,
+    DeviceSoftwareAssignment,
     DeviceSoftwareValidationResult,
     HardwareLCM,
+    InventoryItemSoftwareAssignment,
     InventoryItemSoftwareValidationResult,
     ProviderLCM,
     SoftwareImageLCM,
@@ -23,6 +25,8 @@ from nautobot_device_lifecycle_mgmt.models import (
     ValidatedSoftwareLCM,
     VulnerabilityLCM,
 )
+from nautobot_device_lifecycle_mgmt.signals import sync_software_assignments
+from nautobot_device_lifecycle_mgmt.versions import get_version_sort_key
 
 from .conftest import create_cves, create_devices, create_inventory_items, create_softwares, create_validated_softwares
 
@@ -174,6 +178,17 @@ class SoftwareLCMTestCase(TestCase):
         self.assertEqual(softwarelcm_full.pre_release, True)
         self.assertEqual(str(softwarelcm_full), f"{self.device_platform.name} - {softwarelcm_full.version}")
 
+    def test_version_sort_key(self):
+        """The version sort key is computed on save, for the network driver of the platform."""
+        softwarelcm = SoftwareLCM.objects.create(device_platform=self.device_platform, version="4.21.3F")
+        self.assertEqual(softwarelcm.version_sort_key, get_version_sort_key("4.21.3F"))
+
+        self.device_platform.network_driver = "arista_eos"
+        self.device_platform.save()
+
+        softwarelcm.refresh_from_db()
+        self.assertEqual(softwarelcm.version_sort_key, get_version_sort_key("4.21.3", "arista_eos"))
+
 
 class ValidatedSoftwareLCMTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
     """Tests for the ValidatedSoftwareLCM model."""
@@ -322,6 +337,73 @@ class ValidatedSoftwareLCMTestCase(TestCase):  # pylint: disable=too-many-instan
         self.assertEqual(validated_software_for_inventoryitem.count(), 1)
         self.assertTrue(self.inventoryitem_1 in validated_software_for_inventoryitem.first().inventory_items.all())
 
+    def test_get_for_objects_device(self):
+        validatedsoftwarelcm_1 = ValidatedSoftwareLCM(
+            software=self.software,
+            start=date(2019, 1, 10),
+        )
+        validatedsoftwarelcm_1.devices.set([self.device_1])
+        validatedsoftwarelcm_1.save()
+
+        validatedsoftwarelcm_2 = ValidatedSoftwareLCM(
+            software=self.software,
+            start=date(2018, 1, 10),
+            preferred=True,
+        )
+        validatedsoftwarelcm_2.devices.set([self.device_1, self.device_2])
+        validatedsoftwarelcm_2.save()
+
+        validated_software_for_devices = ValidatedSoftwareLCM.objects.get_for_objects(
+            Device.objects.filter(pk__in=[self.device_1.pk, self.device_2.pk])
+        )
+        self.assertEqual(
+            validated_software_for_devices[self.device_1.pk], [validatedsoftwarelcm_2, validatedsoftwarelcm_1]
+        )
+        self.assertEqual(validated_software_for_devices[self.device_2.pk], [validatedsoftwarelcm_2])
+        self.assertEqual(
+            validated_software_for_devices[self.device_1.pk],
+            list(ValidatedSoftwareLCM.objects.get_for_object(self.device_1)),
+        )
+
+    def test_get_for_objects_devicetype(self):
+        validatedsoftwarelcm_1 = ValidatedSoftwareLCM(
+            software=self.software,
+            start=date(2019, 1, 10),
+        )
+        validatedsoftwarelcm_1.device_types.set([self.device_type_1])
+        validatedsoftwarelcm_1.save()
+
+        validatedsoftwarelcm_2 = ValidatedSoftwareLCM(
+            software=self.software,
+            start=date(2018, 1, 10),
+        )
+        validatedsoftwarelcm_2.device_types.set([self.device_type_2])
+        validatedsoftwarelcm_2.save()
+
+        validated_software_for_device_types = ValidatedSoftwareLCM.objects.get_for_objects(
+            DeviceType.objects.filter(pk__in=[self.device_type_1.pk, self.device_type_2.pk])
+        )
+        self.assertEqual(validated_software_for_device_types[self.device_type_1.pk], [validatedsoftwarelcm_1])
+        self.assertEqual(validated_software_for_device_types[self.device_type_2.pk], [validatedsoftwarelcm_2])
+
+    def test_get_for_objects_inventoryitem(self):
+        validatedsoftwarelcm_1 = ValidatedSoftwareLCM(
+            software=self.software,
+            start=date(2019, 1, 10),
+        )
+        validatedsoftwarelcm_1.inventory_items.set([self.inventoryitem_1])
+        validatedsoftwarelcm_1.save()
+
+        validated_software_for_inventoryitems = ValidatedSoftwareLCM.objects.get_for_objects(
+            InventoryItem.objects.filter(pk__in=[self.inventoryitem_1.pk, self.inventoryitem_2.pk])
+        )
+        self.assertEqual(validated_software_for_inventoryitems[self.inventoryitem_1.pk], [validatedsoftwarelcm_1])
+        self.assertEqual(validated_software_for_inventoryitems[self.inventoryitem_2.pk], [])
+
+    def test_get_for_objects_not_queryset(self):
+        with self.assertRaises(TypeError):
+            ValidatedSoftwareLCM.objects.get_for_objects(self.device_1)
+
 
 class DeviceSoftwareValidationResultTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
     """Tests for the DeviceSoftwareValidationResult model."""
@@ -426,6 +508,88 @@ class InventoryItemSoftwareValidationResultTestCase(TestCase):  # pylint: disabl
         self.assertEqual(validation_result.valid_software.values()[1]["software_id"], self.software_two.id)
 
 
+class SoftwareAssignmentTestCase(TestCase):
+    """Tests for the DeviceSoftwareAssignment and InventoryItemSoftwareAssignment models."""
+
+    def setUp(self):
+        """Set up test objects."""
+        self.device = create_devices()[0]
+        self.inventory_item = create_inventory_items()[0]
+        self.software_one, self.software_two = SoftwareLCM.objects.bulk_create(
+            [
+                SoftwareLCM(device_platform=self.device.platform, version="17.3.3 MD"),
+                SoftwareLCM(device_platform=self.device.platform, version="17.6.1"),
+            ]
+        )
+        self.device_soft_rel = Relationship.objects.get(key="device_soft")
+        self.inventory_item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+
+    def test_device_assignment_synced(self):
+        """DeviceSoftwareAssignment follows the device_soft relationship association."""
+        device_soft = RelationshipAssociation.objects.create(
+            source=self.software_one, destination=self.device, relationship=self.device_soft_rel
+        )
+        self.assertEqual(DeviceSoftwareAssignment.objects.get(device=self.device).software, self.software_one)
+
+        device_soft.source = self.software_two
+        device_soft.save()
+        self.assertEqual(DeviceSoftwareAssignment.objects.get(device=self.device).software, self.software_two)
+
+        device_soft.delete()
+        self.assertFalse(DeviceSoftwareAssignment.objects.filter(device=self.device).exists())
+
+    def test_queryset_update_resynced(self):
+        """Associations updated with `QuerySet.update()` only update their assignments once resynced."""
+        RelationshipAssociation.objects.create(
+            source=self.software_one, destination=self.device, relationship=self.device_soft_rel
+        )
+        RelationshipAssociation.objects.filter(destination_id=self.device.pk).update(source_id=self.software_two.pk)
+        self.assertEqual(DeviceSoftwareAssignment.objects.get(device=self.device).software, self.software_one)
+
+        # The stale assignment is deleted and the missing one created
+        self.assertEqual(sync_software_assignments(), 2)
+        self.assertEqual(DeviceSoftwareAssignment.objects.get(device=self.device).software, self.software_two)
+        self.assertEqual(sync_software_assignments(), 0)
+
+    def test_inventory_item_assignment_synced(self):
+        """InventoryItemSoftwareAssignment follows the inventory_item_soft relationship association."""
+        item_soft = RelationshipAssociation.objects.create(
+            source=self.software_one, destination=self.inventory_item, relationship=self.inventory_item_soft_rel
+        )
+        self.assertEqual(
+            InventoryItemSoftwareAssignment.objects.get(inventory_item=self.inventory_item).software,
+            self.software_one,
+        )
+
+        item_soft.delete()
+        self.assertFalse(InventoryItemSoftwareAssignment.objects.filter(inventory_item=self.inventory_item).exists())
+
+    def test_assignment_deleted_with_software(self):
+        """Deleting the software removes its assignments."""
+        RelationshipAssociation.objects.create(
+            source=self.software_one, destination=self.device, relationship=self.device_soft_rel
+        )
+        self.software_one.delete()
+
+        self.assertFalse(DeviceSoftwareAssignment.objects.exists())
+        self.assertIsNone(SoftwareLCM.objects.get_for_object(self.device).first())
+
+    def test_other_relationships_ignored(self):
+        """Associations of other relationships don't create software assignments."""
+        relationship = Relationship.objects.create(
+            label="Other Software on Device",
+            key="other_device_soft",
+            type=RelationshipTypeChoices.TYPE_ONE_TO_MANY,
+            source_type=ContentType.objects.get_for_model(SoftwareLCM),
+            destination_type=ContentType.objects.get_for_model(Device),
+        )
+        RelationshipAssociation.objects.create(
+            source=self.software_one, destination=self.device, relationship=relationship
+        )
+
+        self.assertFalse(DeviceSoftwareAssignment.objects.exists())
+
+
 class CVELCMTestCase(TestCase):
     """Tests for the CVELCM model."""
 
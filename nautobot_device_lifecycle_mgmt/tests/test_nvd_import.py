@@ -0,0 +1,208 @@
+"""Tests for the import of the CVEs of NVD JSON feed files."""
+import datetime
+import gzip
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from nautobot.core.testing import run_job_for_testing
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.dcim.models import Platform
+from nautobot.extras.models import Job
+
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.nvd_import import FeedFormatError, JSONStreamReader, import_feed, iter_feed_cves
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FEED_V1 = FIXTURES_DIR / "nvdcve-1.1-sample.json"
+FEED_V2 = FIXTURES_DIR / "nvdcve-2.0-sample.json"
+
+
+class JSONStreamReaderTestCase(TestCase):
+    """Tests for the streaming JSON reader."""
+
+    def test_iter_object_array(self):
+        document = {"count": 3, "meta": {"items": [1.5]}, "items": [{"id": 1}, 12345, "a,b]", None, []], "after": 1}
+        for chunk_size in (1, 2, 7, 1024):
+            reader = JSONStreamReader(io.StringIO(json.dumps(document, indent=2)), chunk_size=chunk_size)
+
+            self.assertEqual(list(reader.iter_object_array(("items",))), document["items"], chunk_size)
+
+    def test_empty_array(self):
+        reader = JSONStreamReader(io.StringIO('{"items": [ ]}'), chunk_size=1)
+
+        self.assertEqual(list(reader.iter_object_array(("items",))), [])
+
+    def test_missing_array(self):
+        reader = JSONStreamReader(io.StringIO('{"other": []}'))
+
+        with self.assertRaises(FeedFormatError):
+            list(reader.iter_object_array(("items",)))
+
+    def test_invalid_json(self):
+        reader = JSONStreamReader(io.StringIO('{"items": [{"id": 1}, {"id": ]}'), chunk_size=4)
+
+        with self.assertRaises(FeedFormatError):
+            list(reader.iter_object_array(("items",)))
+
+    def test_value_size_limit(self):
+        file = io.StringIO('{"items": [{"id": ' + " " * 1000 + "}]}")
+        reader = JSONStreamReader(file, chunk_size=10, max_value_size=100)
+
+        with self.assertRaises(FeedFormatError):
+            list(reader.iter_object_array(("items",)))
+        # The reading stops once the limit is exceeded
+        self.assertLess(file.tell(), 200)
+
+    def test_feed_streamed(self):
+        # The file is read by chunks as the records are consumed
+        with open(FEED_V2, encoding="utf-8") as file:
+            reader = JSONStreamReader(file, chunk_size=256)
+            next(reader.iter_object_array(("vulnerabilities",)))
+
+            self.assertLess(file.tell(), FEED_V2.stat().st_size)
+
+
+class ImportNVDFeedsTestCase(TestCase):
+    """Tests for importing the CVEs of NVD JSON feed files."""
+
+    def test_feed_v1(self):
+        with open(FEED_V1, encoding="utf-8") as file:
+            cves = {values["name"]: values for values in iter_feed_cves(file)}
+
+        self.assertEqual(
+            cves["CVE-2021-1435"],
+            {
+                "name": "CVE-2021-1435",
+                "published_date": datetime.date(2021, 3, 24),
+                "link": "https://nvd.nist.gov/vuln/detail/CVE-2021-1435",
+                "severity": "High",
+                "cvss": 7.2,
+                "cvss_v2": 9.0,
+                "cvss_v3": 7.2,
+            },
+        )
+        self.assertEqual((cves["CVE-2015-0008"]["cvss"], cves["CVE-2015-0008"]["severity"]), (8.3, "High"))
+        self.assertEqual((cves["CVE-2023-0001"]["cvss"], cves["CVE-2023-0001"]["severity"]), (None, "None"))
+
+    def test_feed_v2(self):
+        with open(FEED_V2, encoding="utf-8") as file:
+            cves = {values["name"]: values for values in iter_feed_cves(file)}
+
+        # The primary metrics are preferred, the secondary ones are used when there's no primary metric
+        self.assertEqual(
+            cves["CVE-2021-1435"],
+            {
+                "name": "CVE-2021-1435",
+                "published_date": datetime.date(2021, 3, 24),
+                "link": "https://nvd.nist.gov/vuln/detail/CVE-2021-1435",
+                "severity": "Critical",
+                "cvss": 9.8,
+                "cvss_v2": 9.0,
+                "cvss_v3": 9.8,
+            },
+        )
+        self.assertEqual((cves["CVE-2022-20695"]["cvss_v3"], cves["CVE-2022-20695"]["severity"]), (10.0, "Critical"))
+        self.assertEqual((cves["CVE-2023-44487"]["cvss"], cves["CVE-2023-44487"]["severity"]), (None, "None"))
+
+    def test_invalid_records_skipped(self):
+        feed = {"vulnerabilities": [{"cve": {"id": "CVE-2023-1"}}, {"cve": {"id": "CVE-2023-2", "published": "2023"}}]}
+
+        self.assertEqual(list(iter_feed_cves(io.StringIO(json.dumps(feed)))), [])
+
+    def test_import_feed(self):
+        with open(FEED_V1, encoding="utf-8") as file:
+            self.assertEqual(import_feed(file), (3, 0, 0))
+
+        self.assertEqual(CVELCM.objects.get(name="CVE-2021-1435").cvss_v3, 7.2)
+
+    def test_import_feed_upserts(self):
+        cve = CVELCM.objects.create(
+            name="CVE-2021-1435", published_date=datetime.date(2021, 3, 24), link="https://cisco.com", comments="Kept"
+        )
+        with open(FEED_V1, encoding="utf-8") as file:
+            import_feed(file)
+
+        # The newer feed updates the scores of the CVE, importing it again changes nothing
+        with open(FEED_V2, encoding="utf-8") as file:
+            self.assertEqual(import_feed(file, batch_size=2), (2, 1, 0))
+        with open(FEED_V2, encoding="utf-8") as file:
+            self.assertEqual(import_feed(file), (0, 0, 0))
+
+        cve.refresh_from_db()
+        self.assertEqual((cve.cvss, cve.severity, cve.comments), (9.8, "Critical", "Kept"))
+        self.assertEqual(cve.link, "https://nvd.nist.gov/vuln/detail/CVE-2021-1435")
+        self.assertEqual(CVELCM.objects.count(), 5)
+
+    def test_batches(self):
+        # A query selecting the existing CVEs and one inserting the new ones per batch, within savepoints
+        with open(FEED_V2, encoding="utf-8") as file:
+            with self.assertNumQueries(2 * (2 + 2)):
+                import_feed(file, batch_size=2)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as feed_dir:
+            gzip_path = Path(feed_dir) / "nvdcve-2.0-sample.json.gz"
+            with open(FEED_V2, "rb") as file, gzip.open(gzip_path, "wb") as gzip_file:
+                shutil.copyfileobj(file, gzip_file)
+            out = io.StringIO()
+
+            call_command("import_nvd_feeds", str(FEED_V1), str(gzip_path), batch_size=2, stdout=out)
+
+        self.assertIn("Created 3 and updated 0 CVEs from", out.getvalue())
+        self.assertIn("Created 2 and updated 1 CVEs from", out.getvalue())
+        self.assertEqual(CVELCM.objects.count(), 5)
+
+    def test_command_invalid_feed(self):
+        with self.assertRaises(CommandError):
+            call_command("import_nvd_feeds", str(FIXTURES_DIR / "missing.json"), stdout=io.StringIO())
+
+
+class ImportNVDFeedsJobTestCase(TestCase):
+    """Tests for the Import NVD Feeds job."""
+
+    def setUp(self):
+        self.job = Job.objects.get(job_class_name="ImportNVDFeeds")
+        self.job.enabled = True
+        self.job.validated_save()
+
+    def run_job(self, feed_dir, feed_files, **kwargs):
+        """Run the job importing `feed_files` with `feed_dir` as NVD feed directory."""
+        plugins_config = {
+            **settings.PLUGINS_CONFIG,
+            "nautobot_device_lifecycle_mgmt": {
+                **settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"],
+                "nvd_feed_dir": str(feed_dir),
+            },
+        }
+        with override_settings(PLUGINS_CONFIG=plugins_config):
+            return run_job_for_testing(self.job, feed_files=feed_files, **kwargs)
+
+    def test_job(self):
+        job_result = self.run_job(FIXTURES_DIR, "nvdcve-*-sample.json")
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(CVELCM.objects.count(), 5)
+        # The 2.0 feed is imported after the 1.1 feed
+        self.assertEqual(CVELCM.objects.get(name="CVE-2021-1435").cvss_v3, 9.8)
+
+    def test_job_link_software(self):
+        platform = Platform.objects.create(name="IOS XE", network_driver="cisco_xe")
+        software = SoftwareLCM.objects.create(device_platform=platform, version="16.12.4")
+
+        job_result = self.run_job(FIXTURES_DIR, "nvdcve-2.0-sample.json", link_software=True)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(list(software.corresponding_cves.values_list("name", flat=True)), ["CVE-2021-1435"])
+
+    def test_paths_outside_feed_dir(self):
+        for feed_files in ("../fixtures/*.json", str(FEED_V1)):
+            job_result = self.run_job(FIXTURES_DIR, feed_files)
+
+            self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILURE)
+        self.assertFalse(CVELCM.objects.exists())
@@ -0,0 +1,98 @@
+"""Tests for the aggregation of the software validation report results."""
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from nautobot.dcim.models import Platform
+
+from nautobot_device_lifecycle_mgmt.models import DeviceSoftwareValidationResult, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.report_aggregation import (
+    _aggregate_grouping_sets,
+    aggregate_validation_results,
+    get_validation_counts,
+)
+
+from .conftest import create_devices
+
+GROUPINGS = {
+    "platform": ("device__platform__name",),
+    "device_type": ("device__device_type__model", "device__device_type__pk"),
+}
+
+
+def sort_groups(aggregation):
+    """Return the aggregation with the groups sorted, as the order of the groups isn't defined."""
+    return {
+        name: value if name == "all" else sorted(value, key=lambda group: str(sorted(group.items())))
+        for name, value in aggregation.items()
+    }
+
+
+class AggregateValidationResultsTestCase(TestCase):
+    """Tests for aggregate_validation_results."""
+
+    def setUp(self):
+        self.device_1, self.device_2, self.device_3 = create_devices()
+        self.device_3.platform = Platform.objects.create(name="junos")
+        self.device_3.save()
+        software = SoftwareLCM.objects.create(device_platform=self.device_1.platform, version="17.3.3")
+        DeviceSoftwareValidationResult.objects.create(device=self.device_1, software=software, is_validated=True)
+        DeviceSoftwareValidationResult.objects.create(device=self.device_2, software=software, is_validated=False)
+        DeviceSoftwareValidationResult.objects.create(device=self.device_3, software=None, is_validated=False)
+
+    def test_aggregation(self):
+        aggregation = aggregate_validation_results(DeviceSoftwareValidationResult.objects.all(), GROUPINGS)
+
+        self.assertEqual(aggregation["all"], {"total": 3, "valid": 1, "invalid": 1, "no_software": 1})
+        self.assertEqual(
+            sorted(aggregation["platform"], key=lambda group: group["total"]),
+            [
+                {"device__platform__name": "junos", "total": 1, "valid": 0, "invalid": 0, "no_software": 1},
+                {
+                    "device__platform__name": self.device_1.platform.name,
+                    "total": 2,
+                    "valid": 1,
+                    "invalid": 1,
+                    "no_software": 0,
+                },
+            ],
+        )
+        self.assertEqual(sum(group["total"] for group in aggregation["device_type"]), 3)
+        for group in aggregation["device_type"]:
+            self.assertEqual(set(group), {*GROUPINGS["device_type"], "total", "valid", "invalid", "no_software"})
+
+    def test_aggregation_filtered(self):
+        aggregation = aggregate_validation_results(
+            DeviceSoftwareValidationResult.objects.filter(device=self.device_3), GROUPINGS
+        )
+
+        self.assertEqual(aggregation["all"], {"total": 1, "valid": 0, "invalid": 0, "no_software": 1})
+        self.assertEqual([group["device__platform__name"] for group in aggregation["platform"]], ["junos"])
+
+    def test_aggregation_distinct(self):
+        # Filterset querysets are distinct, identical results are still counted separately
+        DeviceSoftwareValidationResult.objects.filter(device=self.device_2).update(is_validated=True)
+        aggregation = aggregate_validation_results(
+            DeviceSoftwareValidationResult.objects.filter(device__platform=self.device_1.platform).distinct(), GROUPINGS
+        )
+
+        self.assertEqual(aggregation["all"], {"total": 2, "valid": 2, "invalid": 0, "no_software": 0})
+        self.assertEqual([group["total"] for group in aggregation["device_type"]], [2])
+
+    def test_aggregation_empty(self):
+        aggregation = aggregate_validation_results(DeviceSoftwareValidationResult.objects.none(), GROUPINGS)
+
+        self.assertEqual(aggregation["all"], {"total": 0, "valid": 0, "invalid": 0, "no_software": 0})
+        self.assertEqual(aggregation["platform"], [])
+
+    @skipUnless(connection.vendor == "postgresql", "GROUPING SETS are only used on PostgreSQL")
+    def test_grouping_sets_match_per_grouping_queries(self):
+        results_qs = DeviceSoftwareValidationResult.objects.order_by()
+        per_grouping = {"all": results_qs.aggregate(**get_validation_counts("pk"))}
+        for name, fields in GROUPINGS.items():
+            per_grouping[name] = list(results_qs.values(*fields).annotate(**get_validation_counts("pk")))
+
+        with self.assertNumQueries(1):
+            aggregation = _aggregate_grouping_sets(results_qs, GROUPINGS)
+
+        self.assertEqual(sort_groups(aggregation), sort_groups(per_grouping))
@@ -0,0 +1,378 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for software validation."""
+from datetime import date, datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from nautobot.dcim.models import Device, DeviceType, InventoryItem, Manufacturer, Platform
+from nautobot.core.testing import TransactionTestCase, run_job_for_testing
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import Job, JobLogEntry, JobResult, Relationship, RelationshipAssociation, Role, Tag
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.jobs.lifecycle_reporting import get_last_successful_run
+from nautobot_device_lifecycle_mgmt.models import (
+    DeviceSoftwareValidationResult,
+    InventoryItemSoftwareValidationResult,
+    SoftwareLCM,
+    SoftwareValidationSnapshot,
+    SoftwareValidationSummary,
+    ValidatedSoftwareLCM,
+)
+from nautobot_device_lifecycle_mgmt.signals import sync_software_assignments
+from nautobot_device_lifecycle_mgmt.software import (
+    DeviceSoftware,
+    DeviceSoftwareBulkValidator,
+    InventoryItemSoftware,
+    InventoryItemSoftwareBulkValidator,
+)
+
+from nautobot_device_lifecycle_mgmt.tasks import finish_software_shards, get_shard_filters, validate_software_shard
+from nautobot_device_lifecycle_mgmt.utils import SHARDS_DISPATCHED_GROUPING, SHARDS_FINISHED_GROUPING
+
+from .conftest import create_devices, create_inventory_items
+
+
+def create_validated_software(software, start, end=None, preferred=False, **targets):
+    """Create ValidatedSoftwareLCM object assigned to the given targets."""
+    validated_software = ValidatedSoftwareLCM(software=software, start=start, end=end, preferred=preferred)
+    validated_software.save()
+    for field_name, objects in targets.items():
+        getattr(validated_software, field_name).set(objects)
+
+    return validated_software
+
+
+class DeviceSoftwareBulkValidatorTestCase(TestCase):
+    """Tests for DeviceSoftwareBulkValidator."""
+
+    def setUp(self):
+        self.device_1, self.device_2, self.device_3 = create_devices()
+        platform, _ = Platform.objects.get_or_create(name="cisco_ios")
+        manufacturer, _ = Manufacturer.objects.get_or_create(name="Cisco")
+        device_type_other, _ = DeviceType.objects.get_or_create(manufacturer=manufacturer, model="ASR-1000")
+        role_switch = Role.objects.get(name="core-switch")
+        role_router = Role.objects.get(name="router")
+        tag, _ = Tag.objects.get_or_create(name="lcm")
+        self.device_2.tags.add(tag)
+        self.device_3.tags.add(tag)
+
+        self.software_1 = SoftwareLCM.objects.create(device_platform=platform, version="15.1(2)M")
+        self.software_2 = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M")
+        device_soft_rel = Relationship.objects.get(key="device_soft")
+        RelationshipAssociation.objects.create(
+            source=self.software_1, destination=self.device_1, relationship=device_soft_rel
+        )
+        RelationshipAssociation.objects.create(
+            source=self.software_2, destination=self.device_3, relationship=device_soft_rel
+        )
+
+        create_validated_software(self.software_1, date(2019, 1, 10), preferred=True, devices=[self.device_1])
+        create_validated_software(
+            self.software_1,
+            date(2019, 2, 10),
+            device_types=[self.device_1.device_type],
+            device_roles=[role_switch],
+        )
+        create_validated_software(self.software_2, date(2019, 3, 10), device_types=[self.device_1.device_type])
+        create_validated_software(self.software_2, date(2019, 4, 10), date(2020, 1, 1), device_roles=[role_router])
+        create_validated_software(self.software_1, date(2019, 5, 10), preferred=True, object_tags=[tag])
+        create_validated_software(
+            self.software_2,
+            date(2019, 6, 10),
+            device_types=[device_type_other],
+            device_roles=[role_router],
+            object_tags=[tag],
+        )
+
+    def _assert_results_match_per_device(self):
+        for device in (self.device_1, self.device_2, self.device_3):
+            device_software = DeviceSoftware(device)
+            result = DeviceSoftwareValidationResult.objects.get(device=device)
+            self.assertEqual(result.software, device_software.software)
+            self.assertEqual(result.is_validated, device_software.validate_software())
+            self.assertEqual(set(result.valid_software.all()), set(ValidatedSoftwareLCM.objects.get_for_object(device)))
+
+    def test_results_match_per_device_validation(self):
+        validated_count = DeviceSoftwareBulkValidator(Device.objects.all()).validate(last_run=datetime.now())
+
+        self.assertEqual(validated_count, 3)
+        self._assert_results_match_per_device()
+
+    def test_weights_match_per_device_filter(self):
+        devices = Device.objects.all()
+        batch_validated_software = ValidatedSoftwareLCM.objects.get_for_objects(devices)
+
+        for device in (self.device_1, self.device_2, self.device_3):
+            weights = {}
+            for validated_soft in ValidatedSoftwareLCM.objects.get_for_object(device):
+                weights.setdefault(validated_soft.pk, validated_soft.weight)
+            self.assertEqual(
+                {validated_soft.pk: validated_soft.weight for validated_soft in batch_validated_software[device.pk]},
+                weights,
+            )
+
+    def test_rerun_updates_existing_results(self):
+        devices = Device.objects.all()
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        ValidatedSoftwareLCM.objects.filter(devices=self.device_1).delete()
+        RelationshipAssociation.objects.filter(destination_id=self.device_3.pk).delete()
+
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+
+        self.assertEqual(DeviceSoftwareValidationResult.objects.count(), 3)
+        self._assert_results_match_per_device()
+
+    def test_changed_items_unchanged(self):
+        devices = Device.objects.all()
+        validator = DeviceSoftwareBulkValidator(devices)
+        self.assertEqual(set(validator.get_changed_items(since=timezone.now())), set(devices))
+
+        validator.validate(last_run=datetime.now())
+
+        self.assertFalse(validator.get_changed_items(since=timezone.now()).exists())
+
+    def test_changed_items(self):
+        devices = Device.objects.all()
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        since = timezone.now()
+        validator = DeviceSoftwareBulkValidator(devices)
+
+        self.device_2.validated_save()
+        self.assertEqual(list(validator.get_changed_items(since=since)), [self.device_2])
+
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        since = timezone.now()
+        RelationshipAssociation.objects.filter(destination_id=self.device_3.pk).update(source_id=self.software_1.pk)
+        # Queryset updates send no signals, the validation jobs resync the software assignments before validating
+        sync_software_assignments()
+        self.assertEqual(list(validator.get_changed_items(since=since)), [self.device_3])
+
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        since = timezone.now()
+        ValidatedSoftwareLCM.objects.filter(software=self.software_1).delete()
+        self.assertEqual(list(validator.get_changed_items(since=since)), [self.device_1, self.device_3])
+
+    def test_changed_items_assignments(self):
+        devices = Device.objects.all()
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        since = timezone.now()
+
+        # The software of the first device is removed, the second device is assigned software
+        RelationshipAssociation.objects.get(destination_id=self.device_1.pk).delete()
+        RelationshipAssociation.objects.create(
+            source=self.software_2, destination=self.device_2, relationship=Relationship.objects.get(key="device_soft")
+        )
+
+        # A single query selects the changed devices
+        with self.assertNumQueries(1):
+            changed_items = DeviceSoftwareBulkValidator(devices).get_changed_items(since=since)
+        self.assertEqual(set(changed_items), {self.device_1, self.device_2})
+
+    def test_changed_items_changed_rule(self):
+        devices = Device.objects.all()
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        since = timezone.now()
+
+        create_validated_software(self.software_2, date(2019, 7, 10), devices=[self.device_2])
+
+        changed_items = DeviceSoftwareBulkValidator(devices).get_changed_items(since=since)
+        self.assertEqual(list(changed_items), [self.device_2])
+
+    def test_incremental_run_matches_per_device_validation(self):
+        devices = Device.objects.all()
+        DeviceSoftwareBulkValidator(devices).validate(last_run=datetime.now())
+        since = timezone.now()
+        ValidatedSoftwareLCM.objects.filter(software=self.software_1).delete()
+        create_validated_software(self.software_2, date(2019, 7, 10), devices=[self.device_2])
+        RelationshipAssociation.objects.filter(destination_id=self.device_3.pk).delete()
+
+        changed_items = DeviceSoftwareBulkValidator(devices).get_changed_items(since=since)
+        validated_count = DeviceSoftwareBulkValidator(changed_items).validate(
+            last_run=datetime.now(), run_type=choices.ReportRunTypeChoices.REPORT_DELTA_RUN
+        )
+
+        self.assertEqual(validated_count, 3)
+        self._assert_results_match_per_device()
+        self.assertEqual(
+            DeviceSoftwareValidationResult.objects.filter(
+                run_type=choices.ReportRunTypeChoices.REPORT_DELTA_RUN
+            ).count(),
+            3,
+        )
+
+    def test_get_shard_filters(self):
+        devices = Device.objects.all()
+
+        for by_range in (True, False):
+            shard_filters = get_shard_filters(devices, 2, by_range=by_range)
+            self.assertEqual(len(shard_filters), 2)
+            shard_pks = [
+                set(devices.filter(**shard_filter).values_list("pk", flat=True)) for shard_filter in shard_filters
+            ]
+            self.assertFalse(shard_pks[0] & shard_pks[1])
+            self.assertEqual(shard_pks[0] | shard_pks[1], set(devices.values_list("pk", flat=True)))
+
+        self.assertEqual(get_shard_filters(Device.objects.none(), 2), [])
+        self.assertEqual(len(get_shard_filters(devices, 10)), 3)
+
+    def test_validate_software_shard(self):
+        shard_result = validate_software_shard(
+            "nautobot_device_lifecycle_mgmt.software.DeviceSoftwareBulkValidator",
+            {"pk__in": [str(self.device_1.pk), str(self.device_2.pk)]},
+            datetime.now().isoformat(),
+            choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+        )
+
+        self.assertEqual(shard_result["validated"], 2)
+        self.assertEqual(
+            set(DeviceSoftwareValidationResult.objects.values_list("device", flat=True)),
+            {self.device_1.pk, self.device_2.pk},
+        )
+
+    def test_update_summaries(self):
+        DeviceSoftwareBulkValidator(Device.objects.all()).validate(last_run=datetime.now())
+        last_run = timezone.now()
+
+        DeviceSoftwareBulkValidator.update_summaries(last_run=last_run)
+
+        summaries = SoftwareValidationSummary.objects.all()
+        summary_all = summaries.get(group_by=choices.ValidationSummaryGroupChoices.ALL)
+        self.assertEqual(
+            (summary_all.total, summary_all.valid, summary_all.invalid, summary_all.no_software), (3, 2, 0, 1)
+        )
+        self.assertEqual(summary_all.last_run, last_run)
+        for group_by in choices.ValidationSummaryGroupChoices.values():
+            self.assertEqual(sum(summaries.filter(group_by=group_by).values_list("total", flat=True)), 3)
+        summary_device_type = summaries.get(
+            group_by=choices.ValidationSummaryGroupChoices.DEVICE_TYPE, group_id=self.device_1.device_type_id
+        )
+        self.assertEqual(summary_device_type.group_name, self.device_1.device_type.model)
+
+        # Summaries are replaced on the next update
+        DeviceSoftwareValidationResult.objects.filter(device=self.device_2).delete()
+        DeviceSoftwareBulkValidator.update_summaries(last_run=last_run)
+        self.assertEqual(summaries.get(group_by=choices.ValidationSummaryGroupChoices.ALL).total, 2)
+
+
+class InventoryItemSoftwareBulkValidatorTestCase(TestCase):
+    """Tests for InventoryItemSoftwareBulkValidator."""
+
+    def setUp(self):
+        self.inventory_item_1, self.inventory_item_2, self.inventory_item_3 = create_inventory_items()
+        platform, _ = Platform.objects.get_or_create(name="cisco_ios")
+        tag, _ = Tag.objects.get_or_create(name="lcm")
+        self.inventory_item_3.tags.add(tag)
+
+        self.software_1 = SoftwareLCM.objects.create(device_platform=platform, version="15.1(2)M")
+        self.software_2 = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M")
+        inventory_item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+        RelationshipAssociation.objects.create(
+            source=self.software_1, destination=self.inventory_item_1, relationship=inventory_item_soft_rel
+        )
+        RelationshipAssociation.objects.create(
+            source=self.software_1, destination=self.inventory_item_3, relationship=inventory_item_soft_rel
+        )
+
+        create_validated_software(self.software_1, date(2019, 1, 10), inventory_items=[self.inventory_item_1])
+        create_validated_software(self.software_2, date(2019, 2, 10), object_tags=[tag])
+
+    def test_results_match_per_inventory_item_validation(self):
+        inventory_items = InventoryItem.objects.all()
+        validated_count = InventoryItemSoftwareBulkValidator(inventory_items).validate(last_run=datetime.now())
+
+        self.assertEqual(validated_count, 3)
+        for inventory_item in (self.inventory_item_1, self.inventory_item_2, self.inventory_item_3):
+            inventory_item_software = InventoryItemSoftware(inventory_item)
+            result = InventoryItemSoftwareValidationResult.objects.get(inventory_item=inventory_item)
+            self.assertEqual(result.software, inventory_item_software.software)
+            self.assertEqual(result.is_validated, inventory_item_software.validate_software())
+            self.assertEqual(
+                set(result.valid_software.all()), set(ValidatedSoftwareLCM.objects.get_for_object(inventory_item))
+            )
+
+
+class ShardedSoftwareValidationJobTestCase(TransactionTestCase):
+    """Tests for the software validation jobs validating the objects in shards."""
+
+    validator_path = "nautobot_device_lifecycle_mgmt.software.DeviceSoftwareBulkValidator"
+
+    def setUp(self):
+        super().setUp()
+        self.device_1, _, _ = create_devices()
+        software = SoftwareLCM.objects.create(device_platform=self.device_1.platform, version="15.1(2)M")
+        RelationshipAssociation.objects.create(
+            source=software, destination=self.device_1, relationship=Relationship.objects.get(key="device_soft")
+        )
+        create_validated_software(software, date(2019, 1, 10), preferred=True, devices=[self.device_1])
+        self.job = Job.objects.get(job_class_name="DeviceSoftwareValidationFullReport")
+        self.job.enabled = True
+        self.job.validated_save()
+
+    def test_sharded_job_run(self):
+        job_result = run_job_for_testing(self.job, incremental=False, shards=2)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.count(), 3)
+        self.assertTrue(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated)
+        self.assertTrue(SoftwareValidationSummary.objects.filter(group_by=choices.ValidationSummaryGroupChoices.ALL))
+        self.assertTrue(SoftwareValidationSnapshot.objects.filter(group_by=choices.ValidationSummaryGroupChoices.ALL))
+        self.assertTrue(JobLogEntry.objects.filter(job_result=job_result, message__startswith="Shard 2 of 2").exists())
+        self.assertTrue(JobLogEntry.objects.filter(job_result=job_result, grouping=SHARDS_FINISHED_GROUPING).exists())
+        next_job_result = JobResult.objects.create(name=self.job.class_path, job_model=self.job)
+        self.assertEqual(get_last_successful_run(next_job_result), job_result)
+
+    def test_unfinished_sharded_run_skipped(self):
+        job_result = JobResult.objects.create(
+            name=self.job.class_path, job_model=self.job, status=JobResultStatusChoices.STATUS_SUCCESS
+        )
+        job_result.log("Dispatching the validation of the devices in 2 shards.", grouping=SHARDS_DISPATCHED_GROUPING)
+        next_job_result = JobResult.objects.create(name=self.job.class_path, job_model=self.job)
+
+        # The shards of the run are still validating
+        self.assertIsNone(get_last_successful_run(next_job_result))
+
+        job_result.log("Updated the software validation summaries.", grouping=SHARDS_FINISHED_GROUPING)
+        self.assertEqual(get_last_successful_run(next_job_result), job_result)
+
+    def test_sharded_job_run_resyncs_assignments(self):
+        software = SoftwareLCM.objects.create(device_platform=self.device_1.platform, version="15.2(1)M")
+        RelationshipAssociation.objects.filter(destination_id=self.device_1.pk).update(source_id=software.pk)
+
+        job_result = run_job_for_testing(self.job, incremental=True, shards=2)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        result = DeviceSoftwareValidationResult.objects.get(device=self.device_1)
+        self.assertEqual(result.software, software)
+        self.assertFalse(result.is_validated)
+
+    def test_shard_error_returned(self):
+        shard_result = validate_software_shard(
+            "nautobot_device_lifecycle_mgmt.models.SoftwareLCM",
+            {},
+            datetime.now().isoformat(),
+            choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+        )
+
+        self.assertTrue(shard_result["error"].startswith("ValueError"))
+
+    def test_failed_shard_fails_job_result(self):
+        job_result = JobResult.objects.create(name=self.job.class_path, job_model=self.job)
+
+        callback_result = finish_software_shards.apply(
+            args=(
+                [{"validated": 2, "duration": 0.1}, {"error": "ValueError: invalid shard", "duration": 0.1}],
+                self.validator_path,
+                str(job_result.pk),
+                datetime.now().isoformat(),
+                choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+            )
+        )
+
+        self.assertIsInstance(callback_result.result, RuntimeError)
+        job_result.refresh_from_db()
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILURE)
+        self.assertFalse(SoftwareValidationSummary.objects.exists())
+        self.assertTrue(
+            JobLogEntry.objects.filter(job_result=job_result, message="Shard 2 of 2 failed: ValueError: invalid shard")
+        )
@@ -6,7 +6,12 @@ from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, Lo
 from nautobot.extras.models import Relationship, RelationshipAssociation, Role, Status, Tag
 
 from nautobot_device_lifecycle_mgmt.models import SoftwareImageLCM, SoftwareLCM
-from nautobot_device_lifecycle_mgmt.software_filters import DeviceSoftwareImageFilter, InventoryItemSoftwareImageFilter
+from nautobot_device_lifecycle_mgmt.software_filters import (
+    DeviceSoftwareImageBatchFilter,
+    DeviceSoftwareImageFilter,
+    InventoryItemSoftwareImageBatchFilter,
+    InventoryItemSoftwareImageFilter,
+)
 
 
 class DeviceSoftwareImageFilterTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
@@ -165,6 +170,15 @@ class DeviceSoftwareImageFilterTestCase(TestCase):  # pylint: disable=too-many-i
         self.assertEqual(soft_image_filtered_qs.count(), 1)
         self.assertEqual(soft_image_filtered_qs[0], self.soft_image_ot_win)
 
+    def test_soft_image_batch_matches_per_device_filter(self):
+        software_image_qs = SoftwareImageLCM.objects.all()
+        soft_images = DeviceSoftwareImageBatchFilter(software_image_qs, Device.objects.all()).resolve()
+
+        for device in (self.device_1, self.device_2, self.device_3, self.device_4):
+            self.assertEqual(
+                soft_images[device.pk], list(DeviceSoftwareImageFilter(software_image_qs, device).filter_qs())
+            )
+
 
 class InventoryItemSoftwareImageFilterTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
     """Tests for InventoryItemSoftwareImageFilter."""
@@ -301,3 +315,13 @@ class InventoryItemSoftwareImageFilterTestCase(TestCase):  # pylint: disable=too
 
         self.assertEqual(soft_image_filterd_qs.count(), 1)
         self.assertEqual(soft_image_filterd_qs[0], self.soft_image_ot_win)
+
+    def test_soft_image_batch_matches_per_invitem_filter(self):
+        software_image_qs = SoftwareImageLCM.objects.all()
+        soft_images = InventoryItemSoftwareImageBatchFilter(software_image_qs, InventoryItem.objects.all()).resolve()
+
+        for inventoryitem in (self.inventoryitem_1, self.inventoryitem_2, self.inventoryitem_3, self.inventoryitem_4):
+            self.assertEqual(
+                soft_images[inventoryitem.pk],
+                list(InventoryItemSoftwareImageFilter(software_image_qs, inventoryitem).filter_qs()),
+            )
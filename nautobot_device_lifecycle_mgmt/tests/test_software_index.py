@@ -0,0 +1,122 @@
+"""Tests for the ValidatedSoftwareIndex."""
+from datetime import date
+
+from django.db import transaction
+from django.test import TestCase
+from nautobot.core.testing import TransactionTestCase
+from nautobot.extras.models import Role, Tag
+
+from nautobot_device_lifecycle_mgmt.models import SoftwareLCM, ValidatedSoftwareLCM
+from nautobot_device_lifecycle_mgmt.software_index import ValidatedSoftwareIndex
+
+from .conftest import create_devices
+from .test_software import create_validated_software
+
+
+class ValidatedSoftwareIndexTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for ValidatedSoftwareIndex."""
+
+    def setUp(self):
+        self.device_1, self.device_2, _ = create_devices()
+        self.role = Role.objects.get(name="core-switch")
+        self.tag, _ = Tag.objects.get_or_create(name="lcm")
+        self.software = SoftwareLCM.objects.create(device_platform=self.device_1.platform, version="17.3.3")
+
+        self.validated_device = create_validated_software(self.software, date(2019, 1, 10), devices=[self.device_1])
+        self.validated_device_type_role = create_validated_software(
+            self.software,
+            date(2019, 2, 10),
+            preferred=True,
+            device_types=[self.device_1.device_type],
+            device_roles=[self.role],
+        )
+        self.validated_tag = create_validated_software(self.software, date(2019, 3, 10), object_tags=[self.tag])
+
+    def test_match_device(self):
+        index = ValidatedSoftwareIndex(ValidatedSoftwareLCM.objects.all())
+
+        matches = index.match_device(self.device_1.pk, self.device_1.device_type_id, self.role.pk, [self.tag.pk])
+
+        self.assertEqual(
+            [(rule, rule.weight) for rule in matches],
+            [(self.validated_device_type_role, 20), (self.validated_device, 1000), (self.validated_tag, 1990)],
+        )
+        self.assertEqual(index.match_device(self.device_2.pk, None, None), [])
+
+    def test_match_device_role_and_tag(self):
+        self.validated_device_type_role.object_tags.set([self.tag])
+        index = ValidatedSoftwareIndex(ValidatedSoftwareLCM.objects.all())
+
+        matches = index.match_device(self.device_2.pk, None, self.role.pk, [self.tag.pk])
+
+        self.assertEqual(
+            [(rule, rule.weight) for rule in matches],
+            [(self.validated_device_type_role, 40), (self.validated_tag, 1990)],
+        )
+
+    def test_match_inventory_item(self):
+        index = ValidatedSoftwareIndex(ValidatedSoftwareLCM.objects.all())
+
+        matches = index.match_inventory_item(self.device_1.pk, [self.tag.pk])
+
+        self.assertEqual([(rule, rule.weight) for rule in matches], [(self.validated_tag, 1010)])
+
+    def test_matches_are_copies(self):
+        index = ValidatedSoftwareIndex(ValidatedSoftwareLCM.objects.all())
+
+        matches = index.match_device(self.device_2.pk, None, self.role.pk, [self.tag.pk])
+        matches[0].weight = 0
+
+        self.assertFalse(hasattr(index.rules[self.validated_tag.pk], "weight"))
+
+
+class SharedValidatedSoftwareIndexTestCase(TransactionTestCase):
+    """Tests for the ValidatedSoftwareIndex shared within the process, with committed rule changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.device = create_devices()[0]
+        self.software = SoftwareLCM.objects.create(device_platform=self.device.platform, version="17.3.3")
+        self.validated_device = create_validated_software(self.software, date(2019, 1, 10), devices=[self.device])
+
+    def test_get_shared(self):
+        index = ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all())
+        # Only the version token is read from the cache
+        with self.assertNumQueries(0):
+            self.assertIs(ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all()), index)
+
+        ValidatedSoftwareIndex.invalidate()
+        invalidated_index = ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all())
+        self.assertIsNot(invalidated_index, index)
+
+        self.validated_device.delete()
+        changed_index = ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all())
+        self.assertIsNot(changed_index, invalidated_index)
+        self.assertNotIn(self.validated_device.pk, changed_index.rules)
+
+    def test_uncommitted_changes(self):
+        index = ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all())
+
+        with transaction.atomic():
+            validated_software = create_validated_software(self.software, date(2019, 2, 10), devices=[self.device])
+            # The transaction sees its own changes, without sharing them
+            self.assertIn(
+                validated_software.pk, ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all()).rules
+            )
+            transaction.set_rollback(True)
+
+        self.assertIs(ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all()), index)
+        self.assertFalse(ValidatedSoftwareIndex.has_uncommitted_changes("default"))
+
+    def test_committed_changes(self):
+        index = ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all())
+
+        with transaction.atomic():
+            validated_software = create_validated_software(self.software, date(2019, 2, 10), devices=[self.device])
+            self.assertTrue(ValidatedSoftwareIndex.has_uncommitted_changes("default"))
+
+        self.assertFalse(ValidatedSoftwareIndex.has_uncommitted_changes("default"))
+        committed_index = ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all())
+        self.assertIsNot(committed_index, index)
+        self.assertIn(validated_software.pk, committed_index.rules)
+        self.assertIs(ValidatedSoftwareIndex.get_shared(ValidatedSoftwareLCM.objects.all()), committed_index)
@@ -0,0 +1,183 @@
+"""Tests for the software upgrade plans of the devices."""
+import csv
+import io
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from nautobot.core.testing import run_job_for_testing
+from nautobot.dcim.models import Device, DeviceType, Location
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import Job, Relationship, RelationshipAssociation, Role
+
+from nautobot_device_lifecycle_mgmt.models import SoftwareImageLCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.upgrade_plan import get_upgrade_plan, group_upgrade_plan, upgrade_plan_to_csv
+
+from .conftest import create_devices
+from .test_software import create_validated_software
+
+
+class UpgradePlanTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for the upgrade plans of the devices."""
+
+    def setUp(self):
+        self.device_1, self.device_2, self.device_3 = create_devices()
+        device_type_other = DeviceType.objects.create(manufacturer=self.device_1.device_type.manufacturer, model="ASR")
+        self.device_4 = Device.objects.create(
+            name="sw4",
+            platform=self.device_3.platform,
+            device_type=device_type_other,
+            role=self.device_3.role,
+            location=self.device_3.location,
+            status=self.device_3.status,
+        )
+        platform = self.device_1.platform
+        self.software_old = SoftwareLCM.objects.create(device_platform=platform, version="15.1(2)M")
+        self.software_new = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M3")
+        self.software_router = SoftwareLCM.objects.create(device_platform=platform, version="15.2(5)M")
+        device_soft_rel = Relationship.objects.get(key="device_soft")
+        for software, device in ((self.software_old, self.device_1), (self.software_new, self.device_2)):
+            RelationshipAssociation.objects.create(source=software, destination=device, relationship=device_soft_rel)
+
+        # The preferred rule of the device type, except for the routers preferring the rule of their role, or for
+        # the expired rule of a device, and a non preferred rule of a device ranking after the device type rule
+        device_type = self.device_1.device_type
+        router = Role.objects.get(name="router")
+        create_validated_software(self.software_new, date(2019, 1, 10), preferred=True, device_types=[device_type])
+        create_validated_software(
+            self.software_router, date(2019, 1, 10), preferred=True, device_types=[device_type], device_roles=[router]
+        )
+        create_validated_software(
+            self.software_router, date(2019, 1, 10), date(2020, 1, 10), preferred=True, devices=[self.device_2]
+        )
+        create_validated_software(self.software_old, date(2019, 1, 10), devices=[self.device_1])
+
+        SoftwareImageLCM.objects.create(image_file_name="new.bin", software=self.software_new, default_image=True)
+        image_device_type = SoftwareImageLCM.objects.create(image_file_name="new-6509.bin", software=self.software_new)
+        image_device_type.device_types.set([device_type])
+        SoftwareImageLCM.objects.create(image_file_name="router.bin", software=self.software_router, default_image=True)
+
+    def test_upgrade_plan(self):
+        self.assertEqual(
+            get_upgrade_plan(Device.objects.all()),
+            [
+                {
+                    "platform": "cisco_ios",
+                    "target_software": None,
+                    "location": "Location2",
+                    "device": "sw4",
+                    "current_software": None,
+                    "target_images": [],
+                    "status": "no-target",
+                },
+                {
+                    "platform": "cisco_ios",
+                    "target_software": "15.2(4)M3",
+                    "location": "Location1",
+                    "device": "sw1",
+                    "current_software": "15.1(2)M",
+                    "target_images": ["new-6509.bin"],
+                    "status": "upgrade",
+                },
+                {
+                    "platform": "cisco_ios",
+                    "target_software": "15.2(5)M",
+                    "location": "Location2",
+                    "device": "sw3",
+                    "current_software": None,
+                    "target_images": ["router.bin"],
+                    "status": "no-software",
+                },
+            ],
+        )
+
+    def test_include_current(self):
+        plan = get_upgrade_plan(Device.objects.filter(location__name="Location1"), include_current=True)
+
+        self.assertEqual(
+            [(row["device"], row["target_software"], row["status"]) for row in plan],
+            [("sw1", "15.2(4)M3", "upgrade"), ("sw2", "15.2(4)M3", "current")],
+        )
+
+    def test_downgrade(self):
+        software_newer = SoftwareLCM.objects.create(device_platform=self.device_1.platform, version="15.10(1)M")
+        association = RelationshipAssociation.objects.get(destination_id=self.device_1.pk)
+        association.source = software_newer
+        association.save()
+
+        plan = get_upgrade_plan(Device.objects.filter(pk=self.device_1.pk))
+
+        self.assertEqual(
+            [(row["current_software"], row["target_software"], row["status"]) for row in plan],
+            [("15.10(1)M", "15.2(4)M3", "downgrade")],
+        )
+
+    def test_queries_per_plan(self):
+        get_upgrade_plan(Device.objects.all())
+        with CaptureQueriesContext(connection) as single_device_queries:
+            get_upgrade_plan(Device.objects.filter(pk=self.device_1.pk))
+        with CaptureQueriesContext(connection) as all_devices_queries:
+            get_upgrade_plan(Device.objects.all())
+
+        self.assertEqual(len(all_devices_queries), len(single_device_queries))
+
+    def test_group_upgrade_plan(self):
+        plan = get_upgrade_plan(Device.objects.all(), include_current=True)
+
+        groups = group_upgrade_plan(plan)
+
+        self.assertEqual(
+            [(group["target_software"], group["location"], group["device_count"]) for group in groups],
+            [(None, "Location2", 1), ("15.2(4)M3", "Location1", 2), ("15.2(5)M", "Location2", 1)],
+        )
+        self.assertEqual(
+            groups[1]["devices"][0],
+            {
+                "device": "sw1",
+                "current_software": "15.1(2)M",
+                "target_images": ["new-6509.bin"],
+                "status": "upgrade",
+            },
+        )
+
+    def test_upgrade_plan_to_csv(self):
+        plan = get_upgrade_plan(Device.objects.all())
+
+        rows = list(csv.reader(io.StringIO(upgrade_plan_to_csv(plan))))
+
+        self.assertEqual(
+            rows[0],
+            ["platform", "target_software", "location", "device", "current_software", "target_images", "status"],
+        )
+        self.assertEqual(rows[2], ["cisco_ios", "15.2(4)M3", "Location1", "sw1", "15.1(2)M", "new-6509.bin", "upgrade"])
+        self.assertEqual(len(rows), 4)
+
+
+class GenerateUpgradePlanJobTestCase(TestCase):
+    """Tests for the Generate Upgrade Plan job."""
+
+    def setUp(self):
+        self.job = Job.objects.get(job_class_name="GenerateUpgradePlan")
+        self.job.enabled = True
+        self.job.validated_save()
+        self.device_1, _, self.device_3 = create_devices()
+        software = SoftwareLCM.objects.create(device_platform=self.device_1.platform, version="15.2(4)M3")
+        create_validated_software(software, date(2019, 1, 10), preferred=True, devices=[self.device_1])
+
+    def test_job(self):
+        job_result = run_job_for_testing(self.job, locations=[self.device_1.location.pk])
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(
+            [(group["target_software"], group["device_count"]) for group in job_result.result],
+            [(None, 1), ("15.2(4)M3", 1)],
+        )
+
+    def test_job_csv(self):
+        location = Location.objects.get(name="Location2")
+
+        job_result = run_job_for_testing(self.job, locations=[location.pk], output_format="csv")
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result.splitlines()[1], "cisco_ios,,Location2,sw3,,,no-target")
@@ -0,0 +1,165 @@
+"""Tests for matching the software versions to the version ranges of CVEs."""
+import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from django.test import TestCase
+from django.utils import timezone
+from nautobot.dcim.models import Platform
+
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.nvd_import import import_feed
+from nautobot_device_lifecycle_mgmt.version_matching import SoftwareVersionIndex, VersionRange, link_affected_softwares
+from nautobot_device_lifecycle_mgmt.versions import get_version_sort_key, parse_version
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class ParseVersionTestCase(TestCase):
+    """Tests for parsing the software versions into sort keys."""
+
+    def assertVersionsOrdered(self, versions, network_driver):  # pylint: disable=invalid-name
+        """Assert that the parsed and the encoded sort keys of `versions` are strictly increasing."""
+        for get_key in (parse_version, get_version_sort_key):
+            keys = [get_key(version, network_driver) for version in versions]
+            for (version, key), (next_version, next_key) in zip(zip(versions, keys), zip(versions[1:], keys[1:])):
+                self.assertLess(key, next_key, f"{version} < {next_version}")
+
+    def test_cisco_ios(self):
+        self.assertVersionsOrdered(["12.2(33)SXJ", "15.2(4)M", "15.2(4)M3", "15.2(4)M10", "15.2(5)M"], "cisco_ios")
+
+    def test_cisco_xe(self):
+        self.assertVersionsOrdered(["16.9.1", "16.9.3a", "16.12.4", "17.3.3"], "cisco_xe")
+        self.assertEqual(parse_version("16.09.03", "cisco_xe"), parse_version("16.9.3", "cisco_xe"))
+
+    def test_cisco_nxos(self):
+        self.assertVersionsOrdered(["7.0(3)I7(9)", "9.2(4)", "9.3(8)", "9.3(10)", "10.2(3)F"], "cisco_nxos")
+        self.assertEqual(parse_version("9.3(8)", "cisco_nxos"), parse_version("9.3.8", "cisco_nxos"))
+
+    def test_juniper_junos(self):
+        self.assertVersionsOrdered(["20.4R3", "20.4R3-S1", "20.4R3-S10", "21.1R1", "21.4R3-S1"], "juniper_junos")
+
+    def test_arista_eos(self):
+        self.assertVersionsOrdered(["4.27.0F", "4.28.3M", "4.28.3.1M", "4.28.10M"], "arista_eos")
+        # The release train isn't part of the version order
+        self.assertEqual(parse_version("4.28.3M", "arista_eos"), parse_version("4.28.3F", "arista_eos"))
+
+    def test_case_insensitive(self):
+        self.assertEqual(parse_version("15.2(4)M3"), parse_version("15.2(4)m3 "))
+
+    def test_sort_key_encoding(self):
+        # A version is ordered before its extensions, and letters before numbers, as in the parsed keys
+        self.assertVersionsOrdered(["1.0", "1.0a", "1.0a1", "1.0ab", "1.0.1", "15.2", "15.10"], None)
+        self.assertTrue(get_version_sort_key("15.2(4)E10", "cisco_ios").isalnum())
+        self.assertEqual(get_version_sort_key("1." * 200), get_version_sort_key("1." * 100))
+
+
+class SoftwareVersionIndexTestCase(TestCase):
+    """Tests for matching the software versions of each platform to version ranges."""
+
+    def setUp(self):
+        self.platforms = {
+            network_driver: Platform.objects.create(name=network_driver, network_driver=network_driver)
+            for network_driver in ("cisco_xe", "cisco_ios", "juniper_junos")
+        }
+        self.softwares = {
+            (network_driver, version): SoftwareLCM.objects.create(
+                device_platform=self.platforms[network_driver], version=version
+            )
+            for network_driver, versions in (
+                ("cisco_xe", ("17.6.1", "16.9.1", "17.3.3", "16.12.4")),
+                ("cisco_ios", ("15.2(4)M10", "15.2(4)M", "15.2(4)M3")),
+                ("juniper_junos", ("20.4R3", "20.4R3-S1", "21.4R3-S1", "21.4R3-S2", "22.1R1")),
+            )
+            for version in versions
+        }
+        self.xe_platform_pk = self.platforms["cisco_xe"].pk
+
+    def get_pks(self, *softwares):
+        """Return the pks of the software of `softwares` (network driver, version) pairs."""
+        return [self.softwares[software].pk for software in softwares]
+
+    def test_build_one_query(self):
+        with self.assertNumQueries(1):
+            SoftwareVersionIndex(SoftwareLCM.objects.all())
+
+    def test_match(self):
+        index = SoftwareVersionIndex(SoftwareLCM.objects.all())
+
+        self.assertEqual(
+            index.match(self.xe_platform_pk, VersionRange("16.9.1", "17.3.3", end_inclusive=False)),
+            self.get_pks(("cisco_xe", "16.9.1"), ("cisco_xe", "16.12.4")),
+        )
+        self.assertEqual(
+            index.match(self.xe_platform_pk, VersionRange("16.9.1", "17.3.3", start_inclusive=False)),
+            self.get_pks(("cisco_xe", "16.12.4"), ("cisco_xe", "17.3.3")),
+        )
+        self.assertEqual(
+            index.match(self.xe_platform_pk, VersionRange("16.09.01", "16.09.01")),
+            self.get_pks(("cisco_xe", "16.9.1")),
+        )
+
+    def test_match_unbounded(self):
+        index = SoftwareVersionIndex(SoftwareLCM.objects.all())
+
+        self.assertEqual(
+            index.match(self.xe_platform_pk, VersionRange(end="16.12.4")),
+            self.get_pks(("cisco_xe", "16.9.1"), ("cisco_xe", "16.12.4")),
+        )
+        self.assertEqual(
+            index.match(self.xe_platform_pk, VersionRange(start="17.3.3", start_inclusive=False)),
+            self.get_pks(("cisco_xe", "17.6.1")),
+        )
+        self.assertEqual(len(index.match(self.xe_platform_pk, VersionRange())), 4)
+
+    def test_match_network_driver(self):
+        index = SoftwareVersionIndex(SoftwareLCM.objects.all())
+
+        self.assertEqual(
+            index.match_network_driver("juniper_junos", VersionRange("20.4R3", "21.4R3-S1", start_inclusive=False)),
+            self.get_pks(("juniper_junos", "20.4R3-S1"), ("juniper_junos", "21.4R3-S1")),
+        )
+        self.assertEqual(index.match_network_driver("arista_eos", VersionRange()), [])
+
+    def test_link_affected_softwares(self):
+        cves = [
+            CVELCM.objects.create(name=name, published_date=datetime.date(2023, 1, 1), link="https://nvd.nist.gov")
+            for name in ("CVE-2023-0001", "CVE-2023-0002")
+        ]
+        cves[0].affected_softwares.set([self.softwares[("cisco_xe", "16.9.1")]])
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        CVELCM.objects.update(last_updated=an_hour_ago)
+        index = SoftwareVersionIndex(SoftwareLCM.objects.all())
+        links = [
+            (cves[0].pk, software_pk)
+            for software_pk in index.match(self.xe_platform_pk, VersionRange("16.9.1", "17.3.3"))
+        ]
+
+        self.assertEqual(link_affected_softwares(links), 2)
+        self.assertEqual(
+            set(cves[0].affected_softwares.all()),
+            {self.softwares[("cisco_xe", version)] for version in ("16.9.1", "16.12.4", "17.3.3")},
+        )
+        # Only the CVEs gaining software are touched, for the incremental vulnerability generation
+        self.assertEqual(set(CVELCM.objects.filter(last_updated__gt=an_hour_ago)), {cves[0]})
+        self.assertEqual(link_affected_softwares(links), 0)
+
+    def test_import_feed_links(self):
+        index = SoftwareVersionIndex(SoftwareLCM.objects.all())
+
+        with open(FIXTURES_DIR / "nvdcve-2.0-sample.json", encoding="utf-8") as file:
+            self.assertEqual(import_feed(file, software_index=index), (3, 0, 5))
+        with open(FIXTURES_DIR / "nvdcve-1.1-sample.json", encoding="utf-8") as file:
+            self.assertEqual(import_feed(file, software_index=index), (2, 1, 0))
+
+        self.assertEqual(
+            set(CVELCM.objects.get(name="CVE-2021-1435").affected_softwares.all()),
+            {
+                self.softwares[software]
+                for software in (("cisco_xe", "16.9.1"), ("cisco_xe", "16.12.4"), ("cisco_ios", "15.2(4)M3"))
+            },
+        )
+        self.assertEqual(
+            set(CVELCM.objects.get(name="CVE-2022-20695").affected_softwares.all()),
+            {self.softwares[("juniper_junos", "20.4R3-S1")], self.softwares[("juniper_junos", "21.4R3-S1")]},
+        )
@@ -1,25 +1,33 @@
 # pylint: disable=no-member
 """Unit tests for views."""
+import csv
 import datetime
 from unittest import skip
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
 from django.urls import reverse
-from nautobot.apps.testing import ViewTestCases
-from nautobot.dcim.models import DeviceType, Manufacturer
+from nautobot.apps.testing import TestCase, ViewTestCases
+from nautobot.dcim.models import Device, DeviceType, Manufacturer
 from nautobot.extras.models import Status
 from nautobot.users.models import ObjectPermission
 
+from nautobot_device_lifecycle_mgmt.choices import ValidationSummaryGroupChoices
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     DeviceSoftwareValidationResult,
     HardwareLCM,
     InventoryItemSoftwareValidationResult,
     SoftwareImageLCM,
+    SoftwareValidationSummary,
     VulnerabilityLCM,
 )
 
+from nautobot_device_lifecycle_mgmt.software import DeviceSoftwareBulkValidator
+from nautobot_device_lifecycle_mgmt.template_content import DeviceHWLCM
+
 from .conftest import create_cves, create_devices, create_inventory_items, create_softwares
 
 User = get_user_model()
@@ -219,6 +227,116 @@ class ValidatedSoftwareInventoryItemReportViewTest(ViewTestCases.ListObjectsView
         pass
 
 
+class ValidatedSoftwareReportSummaryViewTest(TestCase):
+    """Test the software validation reports served from SoftwareValidationSummary objects."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        for device in create_devices():
+            DeviceSoftwareValidationResult.objects.create(device=device, software=None, is_validated=False)
+        DeviceSoftwareBulkValidator.update_summaries(last_run=datetime.datetime.now(datetime.timezone.utc))
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+        self.url = reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report")
+
+    def test_report_from_summaries(self):
+        """The unfiltered report is served from the summaries."""
+        summary = SoftwareValidationSummary.objects.get(group_by=ValidationSummaryGroupChoices.ALL)
+        summary.total = summary.no_software = 42
+        summary.save()
+
+        response = self.client.get(self.url)
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.context["device_aggr"]["total"], 42)
+        self.assertEqual(
+            sum(row["total"] for row in response.context["table"].data.data),
+            Device.objects.count(),
+        )
+
+    def test_filtered_report_from_results(self):
+        """Filtered reports are aggregated from the validation results."""
+        device = Device.objects.first()
+
+        response = self.client.get(self.url, {"device_type_id": device.device_type.pk})
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            response.context["device_aggr"]["total"], Device.objects.filter(device_type=device.device_type).count()
+        )
+
+    def test_invalid_filter_empty_report(self):
+        """Reports with invalid filter values are empty."""
+        response = self.client.get(self.url, {"device_type_id": "invalid"})
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.context["device_aggr"]["total"], 0)
+
+
+class ValidatedSoftwareReportExportViewTest(TestCase):
+    """Test the CSV export of the software validation reports."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        self.add_permissions(
+            "nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult",
+            "nautobot_device_lifecycle_mgmt.view_inventoryitemsoftwarevalidationresult",
+        )
+
+    def get_csv_rows(self, url):
+        """Return the rows of the streamed CSV export."""
+        response = self.client.get(url, {"export": ""})
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertTrue(response.streaming)
+
+        return list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+
+    def test_device_report_export(self):
+        """The export has the global aggregation and a row per device type, with the table columns."""
+        for device in create_devices():
+            DeviceSoftwareValidationResult.objects.create(device=device, software=None, is_validated=False)
+
+        rows = self.get_csv_rows(reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report"))
+
+        self.assertEqual(rows[0], ["Type", "Total", "Valid", "Invalid", "No Software", "Compliance (%)"])
+        self.assertEqual(rows[1], ["Devices", "3", "0", "0", "3", "0.0"])
+        self.assertEqual(rows[2], [])
+        self.assertEqual(rows[3], ["Name", "Total", "Valid", "Invalid", "No software", "Compliance (%)"])
+        self.assertEqual(
+            sorted(row[0] for row in rows[4:]),
+            sorted(set(Device.objects.values_list("device_type__model", flat=True))),
+        )
+
+    def test_inventory_item_report_export(self):
+        """Values are quoted and columns without plain values are exported with their exported value."""
+        inventory_items = create_inventory_items()
+        inventory_items[0].name = 'Card "A", slot 1'
+        inventory_items[0].save()
+        for inventory_item in inventory_items:
+            InventoryItemSoftwareValidationResult.objects.create(
+                inventory_item=inventory_item, software=None, is_validated=False
+            )
+
+        rows = self.get_csv_rows(
+            reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_inventoryitem_report")
+        )
+
+        self.assertEqual(rows[1][:2], ["Inventory Items", "3"])
+        self.assertEqual(len(rows), 7)
+        self.assertIn(
+            ["VS-S2T-10G", 'Card "A", slot 1', inventory_items[0].device.name, "1", "0", "0", "1", "0.0"], rows
+        )
+
+    def test_empty_report_export(self):
+        """Reports without results are exported without rows."""
+        rows = self.get_csv_rows(reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report"))
+
+        self.assertEqual(rows[1], ["Devices", "0", "0", "0", "0", "0"])
+        self.assertEqual(len(rows), 4)
+
+
 class CVELCMViewTest(ViewTestCases.PrimaryObjectViewTestCase):
     """Test the CVELCM views."""
 
@@ -519,3 +637,77 @@ class InventoryItemSoftwareValidationResultListViewTest(ViewTestCases.ListObject
     @skip("Not implemented")
     def test_list_objects_filtered(self):
         pass
+
+
+class LifecyclePanelViewTest(TestCase):
+    """Test LifecyclePanelView."""
+
+    def setUp(self):
+        """Set up test objects."""
+        super().setUp()
+        self.device = create_devices()[0]
+        self.notice = HardwareLCM.objects.create(
+            device_type=self.device.device_type, end_of_sale=datetime.date(2021, 4, 1)
+        )
+        self.url = reverse(
+            "plugins:nautobot_device_lifecycle_mgmt:lifecycle_panel",
+            kwargs={"panel": "device-hardware", "pk": self.device.pk},
+        )
+
+    def test_panel_without_permission(self):
+        """Users without the view permission of the objects are denied."""
+        self.assertHttpStatus(self.client.get(self.url), 403)
+
+    def test_panel_anonymous(self):
+        """Anonymous users are redirected to the login page."""
+        self.client.logout()
+
+        response = self.client.get(self.url)
+
+        self.assertHttpStatus(response, 302)
+        self.assertTrue(response["Location"].startswith(reverse("login")))
+
+    def test_panel_object_not_permitted(self):
+        """Objects excluded by the constraints of the user's permission are not found."""
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_hardwarelcm")
+        permission = ObjectPermission.objects.create(
+            name="View other devices", actions=["view"], constraints={"name": "other"}
+        )
+        permission.object_types.add(ContentType.objects.get_for_model(Device))
+        permission.users.add(self.user)
+
+        self.assertHttpStatus(self.client.get(self.url), 404)
+
+    def test_panel_with_permission(self):
+        """The panel content is rendered and cacheable by the browser."""
+        self.add_permissions("dcim.view_device", "nautobot_device_lifecycle_mgmt.view_hardwarelcm")
+
+        response = self.client.get(self.url)
+
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, str(self.notice))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=60", response["Cache-Control"])
+
+    def test_unknown_panel(self):
+        """Unknown panels are not found."""
+        self.add_permissions("dcim.view_device")
+        url = reverse(
+            "plugins:nautobot_device_lifecycle_mgmt:lifecycle_panel", kwargs={"panel": "unknown", "pk": self.device.pk}
+        )
+
+        self.assertHttpStatus(self.client.get(url), 404)
+
+    def test_lazy_panel_placeholder(self):
+        """With lazy loading enabled the template extension renders a placeholder loading the panel."""
+        plugins_config = {
+            "nautobot_device_lifecycle_mgmt": {
+                **settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"],
+                "lazy_load_panels": True,
+            }
+        }
+        with override_settings(PLUGINS_CONFIG=plugins_config):
+            content = DeviceHWLCM({"object": self.device}).right_page()
+
+        self.assertIn(self.url, content)
+        self.assertNotIn(str(self.notice), content)
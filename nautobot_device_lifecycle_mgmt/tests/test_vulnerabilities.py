@@ -0,0 +1,246 @@
+"""Tests for the generation of the vulnerabilities."""
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.utils import timezone
+from nautobot.core.testing import TransactionTestCase, run_job_for_testing
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import Job, Relationship, RelationshipAssociation, Status
+
+from nautobot_device_lifecycle_mgmt.models import (
+    CVELCM,
+    DeviceSoftwareAssignment,
+    InventoryItemSoftwareAssignment,
+    VulnerabilityLCM,
+)
+from nautobot_device_lifecycle_mgmt.vulnerabilities import (
+    generate_vulnerabilities,
+    insert_vulnerabilities,
+    retire_stale_vulnerabilities,
+)
+
+from .conftest import create_cves, create_inventory_items, create_softwares
+
+
+class VulnerabilitiesTestMixin:
+    """Devices, inventory items, software and CVEs for the vulnerabilities tests."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Create the devices, inventory items, software, CVEs and the Resolved status of the vulnerabilities."""
+        super().setUp()
+        self.inventory_items = create_inventory_items()
+        self.devices = [item.device for item in self.inventory_items]
+        self.softwares = create_softwares()
+        self.cves = create_cves()
+        self.device_soft_rel = device_soft_rel = Relationship.objects.get(key="device_soft")
+        inventory_item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+        for device in self.devices[:2]:
+            RelationshipAssociation.objects.create(
+                source=self.softwares[0], destination=device, relationship=device_soft_rel
+            )
+        RelationshipAssociation.objects.create(
+            source=self.softwares[0], destination=self.inventory_items[0], relationship=inventory_item_soft_rel
+        )
+        # The third CVE affects software assigned to no device or inventory item
+        self.cves[0].affected_softwares.set([self.softwares[0]])
+        self.cves[1].affected_softwares.set([self.softwares[0]])
+        self.cves[2].affected_softwares.set([self.softwares[1]])
+        self.resolved = Status.objects.create(name="Resolved", color="4caf50")
+        self.resolved.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+
+    @staticmethod
+    def age_changes():
+        """Move the last update of the CVEs and software assignments an hour back."""
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (CVELCM, DeviceSoftwareAssignment, InventoryItemSoftwareAssignment):
+            model.objects.update(last_updated=an_hour_ago)
+
+    def make_stale_vulnerabilities(self):
+        """Generate the vulnerabilities and make 5 of them stale, returns the watermark before the changes."""
+        generate_vulnerabilities(CVELCM.objects.all())
+        self.age_changes()
+        watermark = timezone.now()
+
+        # The first CVE no longer affects the software, the second device runs other software, the inventory item none
+        self.cves[0].affected_softwares.remove(self.softwares[0])
+        RelationshipAssociation.objects.get(destination_id=self.devices[1].pk).delete()
+        RelationshipAssociation.objects.get(destination_id=self.inventory_items[0].pk).delete()
+        RelationshipAssociation.objects.create(
+            source=self.softwares[1], destination=self.devices[1], relationship=self.device_soft_rel
+        )
+        return watermark
+
+
+class GenerateVulnerabilitiesTestCase(VulnerabilitiesTestMixin, TestCase):
+    """Tests for generating the vulnerabilities of the devices and inventory items."""
+
+    def test_generate_vulnerabilities(self):
+        created = generate_vulnerabilities(CVELCM.objects.all())
+
+        self.assertEqual(created, {self.cves[0].pk: 3, self.cves[1].pk: 3})
+        self.assertEqual(
+            set(VulnerabilityLCM.objects.values_list("cve", "software", "device", "inventory_item")),
+            {
+                *(
+                    (cve.pk, self.softwares[0].pk, device.pk, None)
+                    for cve in self.cves[:2]
+                    for device in self.devices[:2]
+                ),
+                *((cve.pk, self.softwares[0].pk, None, self.inventory_items[0].pk) for cve in self.cves[:2]),
+            },
+        )
+
+    def test_existing_vulnerabilities_skipped(self):
+        VulnerabilityLCM.objects.create(cve=self.cves[0], software=self.softwares[0], device=self.devices[0])
+
+        created = generate_vulnerabilities(CVELCM.objects.all())
+
+        self.assertEqual(created, {self.cves[0].pk: 2, self.cves[1].pk: 3})
+        self.assertEqual(VulnerabilityLCM.objects.count(), 6)
+        self.assertEqual(generate_vulnerabilities(CVELCM.objects.all()), {})
+
+    def test_cves_filtered(self):
+        created = generate_vulnerabilities(CVELCM.objects.filter(pk=self.cves[1].pk))
+
+        self.assertEqual(created, {self.cves[1].pk: 3})
+        self.assertEqual(set(VulnerabilityLCM.objects.values_list("cve", flat=True)), {self.cves[1].pk})
+
+    def test_constant_number_of_queries(self):
+        # A query selecting the missing vulnerabilities, a batch inserting them and a query selecting the inserted ones,
+        # for devices and inventory items
+        with self.assertNumQueries(6):
+            generate_vulnerabilities(CVELCM.objects.all(), batch_size=10)
+
+    def test_batches(self):
+        # Two batches of the four device vulnerabilities, one of the two inventory item vulnerabilities
+        with self.assertNumQueries(2 + 2 * 2 + 1 * 2):
+            created = generate_vulnerabilities(CVELCM.objects.all(), batch_size=2)
+
+        self.assertEqual(sum(created.values()), 6)
+        self.assertEqual(VulnerabilityLCM.objects.count(), 6)
+
+    def test_conflicts_not_counted(self):
+        batch = [
+            VulnerabilityLCM(cve=self.cves[0], software=self.softwares[0], device=device) for device in self.devices[:2]
+        ]
+        # The vulnerability of the first device was created concurrently
+        VulnerabilityLCM.objects.create(cve=self.cves[0], software=self.softwares[0], device=self.devices[0])
+
+        self.assertEqual(insert_vulnerabilities(batch), {self.cves[0].pk: 1})
+        self.assertEqual(VulnerabilityLCM.objects.filter(cve=self.cves[0]).count(), 2)
+
+    def test_affected_softwares_changes_update_cves(self):
+        self.age_changes()
+        watermark = timezone.now()
+
+        self.cves[0].affected_softwares.add(self.softwares[1])
+        self.softwares[2].corresponding_cves.add(self.cves[1])
+        self.softwares[1].corresponding_cves.clear()
+
+        self.assertEqual(
+            set(CVELCM.objects.filter(last_updated__gte=watermark)), {self.cves[0], self.cves[1], self.cves[2]}
+        )
+
+    def test_incremental_generation(self):
+        generate_vulnerabilities(CVELCM.objects.all())
+        self.age_changes()
+        watermark = timezone.now()
+
+        # A software newly affected by a CVE, and a device newly running an affected software
+        self.cves[2].affected_softwares.add(self.softwares[0])
+        RelationshipAssociation.objects.create(
+            source=self.softwares[1], destination=self.devices[2], relationship=self.device_soft_rel
+        )
+        created = generate_vulnerabilities(CVELCM.objects.all(), changed_since=watermark)
+
+        self.assertEqual(created, {self.cves[2].pk: 4})
+        self.assertEqual(
+            set(VulnerabilityLCM.objects.filter(device=self.devices[2]).values_list("cve", "software")),
+            {(self.cves[2].pk, self.softwares[1].pk)},
+        )
+
+    def test_incremental_generation_skips_unchanged(self):
+        self.age_changes()
+        watermark = timezone.now()
+
+        self.assertEqual(generate_vulnerabilities(CVELCM.objects.all(), changed_since=watermark), {})
+        self.assertFalse(VulnerabilityLCM.objects.exists())
+
+    def test_retire_stale_vulnerabilities(self):
+        watermark = self.make_stale_vulnerabilities()
+
+        self.assertEqual(retire_stale_vulnerabilities(CVELCM.objects.all(), self.resolved, changed_since=watermark), 5)
+        # The stale vulnerabilities are kept
+        self.assertEqual(VulnerabilityLCM.objects.count(), 6)
+        self.assertEqual(
+            set(VulnerabilityLCM.objects.exclude(status=self.resolved).values_list("cve", "software", "device")),
+            {(self.cves[1].pk, self.softwares[0].pk, self.devices[0].pk)},
+        )
+        # The retired vulnerabilities are skipped
+        self.assertEqual(retire_stale_vulnerabilities(CVELCM.objects.all(), self.resolved), 0)
+
+    def test_vulnerabilities_without_software_kept(self):
+        vulnerability = VulnerabilityLCM.objects.create(cve=self.cves[2], device=self.devices[2])
+
+        self.assertEqual(retire_stale_vulnerabilities(CVELCM.objects.all(), self.resolved), 0)
+        vulnerability.refresh_from_db()
+        self.assertIsNone(vulnerability.status)
+
+
+class GenerateVulnerabilitiesJobTestCase(VulnerabilitiesTestMixin, TransactionTestCase):
+    """Tests for the Generate Vulnerabilities job, committing its data for the job logs database connection."""
+
+    def test_job(self):
+        job = Job.objects.get(job_class_name="GenerateVulnerabilities")
+        job.enabled = True
+        job.validated_save()
+
+        job_result = run_job_for_testing(job, published_after="2021-01-01", debug=True)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        # CVE-2020-27134 was published before 2021
+        self.assertEqual(
+            set(VulnerabilityLCM.objects.values_list("cve", flat=True)), {self.cves[0].pk, self.cves[1].pk}
+        )
+
+    def test_incremental_job(self):
+        job = Job.objects.get(job_class_name="GenerateVulnerabilities")
+        job.enabled = True
+        job.validated_save()
+        run_job_for_testing(job, published_after="1970-01-01")
+        self.age_changes()
+        VulnerabilityLCM.objects.filter(cve=self.cves[1]).delete()
+
+        # The deleted vulnerabilities of the unchanged CVE are not recreated, the new ones are created
+        RelationshipAssociation.objects.create(
+            source=self.softwares[0], destination=self.devices[2], relationship=self.device_soft_rel
+        )
+        job_result = run_job_for_testing(job, published_after="1970-01-01", incremental=True)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(
+            set(VulnerabilityLCM.objects.values_list("cve", "device")),
+            {
+                (self.cves[0].pk, self.devices[0].pk),
+                (self.cves[0].pk, self.devices[1].pk),
+                (self.cves[0].pk, None),
+                (self.cves[0].pk, self.devices[2].pk),
+                (self.cves[1].pk, self.devices[2].pk),
+            },
+        )
+
+    def test_job_retired_status(self):
+        job = Job.objects.get(job_class_name="GenerateVulnerabilities")
+        job.enabled = True
+        job.validated_save()
+        self.make_stale_vulnerabilities()
+
+        # Without a status, the stale vulnerabilities are left unchanged
+        job_result = run_job_for_testing(job, published_after="1970-01-01")
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertFalse(VulnerabilityLCM.objects.filter(status=self.resolved).exists())
+
+        job_result = run_job_for_testing(job, published_after="1970-01-01", retired_status=self.resolved.pk)
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(VulnerabilityLCM.objects.filter(status=self.resolved).count(), 5)
@@ -0,0 +1,125 @@
+"""Fleet-wide software upgrade plans, resolved for all the planned devices with a fixed number of queries."""
+import csv
+import io
+from collections import defaultdict
+from datetime import date
+
+from nautobot_device_lifecycle_mgmt.choices import UpgradePlanStatusChoices
+from nautobot_device_lifecycle_mgmt.models import SoftwareImageLCM, SoftwareLCM, ValidatedSoftwareLCM
+from nautobot_device_lifecycle_mgmt.software_filters import DeviceSoftwareImageBatchFilter
+
+# Keys of the plan groups, the plan is sorted by them
+UPGRADE_PLAN_GROUP_FIELDS = ("platform", "target_software", "location")
+UPGRADE_PLAN_DEVICE_FIELDS = ("device", "current_software", "target_images", "status")
+
+
+def get_target_software(validated_softwares, today):
+    """Return the pk of the software of the first valid rule of `validated_softwares`, ordered by weight."""
+    return next(
+        (
+            validated_soft.software_id
+            for validated_soft in validated_softwares
+            if validated_soft.start <= today and (validated_soft.end is None or validated_soft.end >= today)
+        ),
+        None,
+    )
+
+
+def get_upgrade_status(current_software, target_software):
+    """Return the `UpgradePlanStatusChoices` of a device running `current_software` planned to `target_software`.
+
+    The versions are compared by their sort keys, which only order the versions of the same platform, so moving to
+    the software of another platform is an upgrade.
+    """
+    if target_software is None:
+        return UpgradePlanStatusChoices.NO_TARGET
+    if current_software is None:
+        return UpgradePlanStatusChoices.NO_SOFTWARE
+    if current_software.pk == target_software.pk:
+        return UpgradePlanStatusChoices.CURRENT
+    if (
+        current_software.device_platform_id == target_software.device_platform_id
+        and current_software.version_sort_key > target_software.version_sort_key
+    ):
+        return UpgradePlanStatusChoices.DOWNGRADE
+
+    return UpgradePlanStatusChoices.UPGRADE
+
+
+def get_upgrade_plan(devices_qs, include_current=False):
+    """Return the upgrade plan of the devices of `devices_qs`, one dict per device sorted by group and device name.
+
+    The target of a device is the software of its preferred valid ValidatedSoftwareLCM, i.e. with the lowest weight
+    of `DeviceValidatedSoftwareFilter`, and its images are the SoftwareImageLCM resolved for the device and the
+    target software. The software, rules and images are resolved by the batch filters, so the number of queries
+    doesn't depend on the number of devices.
+
+    Args:
+        devices_qs (QuerySet): Devices to plan
+        include_current (bool): Include the devices already running their target software
+    """
+    today = date.today()
+    current_softwares = SoftwareLCM.objects.get_for_objects(devices_qs)
+    targets = {
+        device_pk: get_target_software(validated_softwares, today)
+        for device_pk, validated_softwares in ValidatedSoftwareLCM.objects.get_for_objects(devices_qs).items()
+    }
+    targets = {device_pk: target_pk for device_pk, target_pk in targets.items() if target_pk is not None}
+    target_softwares = SoftwareLCM.objects.in_bulk(set(targets.values()))
+    target_images = DeviceSoftwareImageBatchFilter(
+        qs=SoftwareImageLCM.objects.all(), items_qs=devices_qs, softwares=targets
+    ).resolve()
+
+    plan = []
+    for device_pk, device_name, platform, location in devices_qs.values_list(
+        "pk", "name", "platform__name", "location__name"
+    ):
+        current_software = current_softwares.get(device_pk)
+        target_software = target_softwares.get(targets.get(device_pk))
+        status = get_upgrade_status(current_software, target_software)
+        if status == UpgradePlanStatusChoices.CURRENT and not include_current:
+            continue
+        plan.append(
+            {
+                "platform": platform,
+                "target_software": target_software.version if target_software is not None else None,
+                "location": location,
+                "device": device_name,
+                "current_software": current_software.version if current_software is not None else None,
+                "target_images": [image.image_file_name for image in target_images.get(device_pk, [])],
+                "status": status,
+            }
+        )
+
+    return sorted(plan, key=lambda row: [row[field] or "" for field in (*UPGRADE_PLAN_GROUP_FIELDS, "device")])
+
+
+def group_upgrade_plan(plan):
+    """Return the devices of `plan` grouped by platform, target software and location, with their device count."""
+    groups = defaultdict(list)
+    for row in plan:
+        groups[tuple(row[field] for field in UPGRADE_PLAN_GROUP_FIELDS)].append(
+            {field: row[field] for field in UPGRADE_PLAN_DEVICE_FIELDS}
+        )
+
+    # The plan is sorted by group, so are the groups
+    return [
+        {**dict(zip(UPGRADE_PLAN_GROUP_FIELDS, group)), "device_count": len(devices), "devices": devices}
+        for group, devices in groups.items()
+    ]
+
+
+def upgrade_plan_to_csv(plan):
+    """Return the CSV of `plan`, one row per device with the images separated by spaces."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([*UPGRADE_PLAN_GROUP_FIELDS, *UPGRADE_PLAN_DEVICE_FIELDS])
+    for row in plan:
+        writer.writerow(
+            [
+                " ".join(row[field]) if field == "target_images" else row[field]
+                for field in (*UPGRADE_PLAN_GROUP_FIELDS, *UPGRADE_PLAN_DEVICE_FIELDS)
+            ]
+        )
+
+    return output.getvalue()
@@ -23,6 +23,11 @@ urlpatterns += [
         views.SoftwareSoftwareImagesLCMView.as_view(),
         name="software_software_images",
     ),
+    path(
+        "panels/<str:panel>/<uuid:pk>/",
+        views.LifecyclePanelView.as_view(),
+        name="lifecycle_panel",
+    ),
     path(
         "validated-software-device-report/",
         views.ValidatedSoftwareDeviceReportView.as_view(),
@@ -1,6 +1,12 @@
 """Utility functions and classes used by the app."""
-from django.db.models import Count, OuterRef, Subquery
+from django.db.models import Count, Exists, OuterRef, Subquery
 from django.db.models.functions import Coalesce
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import JobLogEntry, JobResult
+
+# Groupings of the job log entries marking the dispatch of the shards of a job, and the completion of their callback
+SHARDS_DISPATCHED_GROUPING = "shards dispatched"
+SHARDS_FINISHED_GROUPING = "shards finished"
 
 
 def count_related_m2m(model, field):
@@ -8,3 +14,21 @@ def count_related_m2m(model, field):
     subquery = Subquery(model.objects.filter(**{"pk": OuterRef("pk")}).order_by().annotate(c=Count(field)).values("c"))
 
     return Coalesce(subquery, 0)
+
+
+def get_previous_successful_runs(job_result):
+    """Return the successful JobResults of the job of `job_result`, excluding `job_result` itself, most recent first.
+
+    Jobs dispatching shards complete before their shards do, their JobResults are only final once the chord callback
+    of the shards logged its completion, so the ones still waiting for it are excluded.
+    """
+    log_entries = JobLogEntry.objects.filter(job_result=OuterRef("pk"))
+    return (
+        JobResult.objects.filter(job_model=job_result.job_model, status=JobResultStatusChoices.STATUS_SUCCESS)
+        .exclude(pk=job_result.pk)
+        .exclude(
+            Exists(log_entries.filter(grouping=SHARDS_DISPATCHED_GROUPING))
+            & ~Exists(log_entries.filter(grouping=SHARDS_FINISHED_GROUPING))
+        )
+        .order_by("-date_created")
+    )
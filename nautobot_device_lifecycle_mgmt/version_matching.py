@@ -0,0 +1,92 @@
+"""Matching of the SoftwareLCM versions of each platform to the version ranges of the software affected by CVEs."""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from nautobot_device_lifecycle_mgmt.models import CVELCM
+from nautobot_device_lifecycle_mgmt.versions import get_version_sort_key
+
+LINK_BATCH_SIZE = 1000
+
+
+class VersionRange(NamedTuple):
+    """Range of versions, unbounded where `start` or `end` is None."""
+
+    start: Optional[str] = None
+    end: Optional[str] = None
+    start_inclusive: bool = True
+    end_inclusive: bool = True
+
+
+class SoftwareVersionIndex:
+    """Sorted index of the SoftwareLCM versions of each platform.
+
+    The versions are loaded sorted by their persisted sort key. Matching a version range is two binary searches in the
+    versions of the platform, so linking CVE ranges to the software is proportional to the number of ranges and
+    matches rather than ranges times software.
+    """
+
+    def __init__(self, softwares_qs):
+        """Build the index of the `softwares_qs` versions."""
+        self.network_drivers = {}
+        self.platforms_by_network_driver = defaultdict(list)
+        self.keys = defaultdict(list)
+        self.softwares = defaultdict(list)
+        for software_pk, version_sort_key, platform_pk, network_driver in softwares_qs.order_by(
+            "device_platform", "version_sort_key"
+        ).values_list("pk", "version_sort_key", "device_platform", "device_platform__network_driver"):
+            if platform_pk not in self.network_drivers:
+                self.network_drivers[platform_pk] = network_driver
+                self.platforms_by_network_driver[network_driver].append(platform_pk)
+            self.keys[platform_pk].append(version_sort_key)
+            self.softwares[platform_pk].append(software_pk)
+
+    def match(self, platform_pk, version_range):
+        """Return the pks of the software of the platform whose version is within `version_range`."""
+        keys = self.keys.get(platform_pk)
+        if not keys:
+            return []
+        network_driver = self.network_drivers[platform_pk]
+        start, end = 0, len(keys)
+        if version_range.start is not None:
+            bisect_start = bisect_left if version_range.start_inclusive else bisect_right
+            start = bisect_start(keys, get_version_sort_key(version_range.start, network_driver))
+        if version_range.end is not None:
+            bisect_end = bisect_right if version_range.end_inclusive else bisect_left
+            end = bisect_end(keys, get_version_sort_key(version_range.end, network_driver))
+
+        return self.softwares[platform_pk][start:end]
+
+    def match_network_driver(self, network_driver, version_range):
+        """Return the pks of the software of the platforms with `network_driver` whose version is within the range."""
+        return [
+            software_pk
+            for platform_pk in self.platforms_by_network_driver.get(network_driver, [])
+            for software_pk in self.match(platform_pk, version_range)
+        ]
+
+
+def link_affected_softwares(links, batch_size=LINK_BATCH_SIZE):
+    """Add the missing (CVE pk, software pk) `links` to the software affected by the CVEs.
+
+    Returns:
+        int: Number of links added
+    """
+    links = set(links)
+    through = CVELCM.affected_softwares.through
+    cve_pks = {cve_pk for cve_pk, _ in links}
+    links -= set(through.objects.filter(cvelcm__in=cve_pks).values_list("cvelcm", "softwarelcm"))
+
+    with transaction.atomic():
+        through.objects.bulk_create(
+            [through(cvelcm_id=cve_pk, softwarelcm_id=software_pk) for cve_pk, software_pk in links],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        # Bulk inserts don't send m2m_changed, the CVEs are touched for the incremental vulnerability generation
+        CVELCM.objects.filter(pk__in={cve_pk for cve_pk, _ in links}).update(last_updated=timezone.now())
+
+    return len(links)
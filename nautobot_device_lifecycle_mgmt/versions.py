@@ -0,0 +1,48 @@
+"""Parsing of the software versions of the platforms into sort keys."""
+import re
+
+VERSION_TOKEN_RE = re.compile(r"\d+|[a-z]+")
+# Arista EOS versions end with their release train, e.g. 4.28.3M, which isn't part of the version order
+EOS_RELEASE_TRAIN_RE = re.compile(r"(?<=\d)[mf]$")
+VERSION_SORT_KEY_LENGTH = 255
+VERSION_NUMBER_WIDTH = 9
+
+
+def normalize_eos_version(version):
+    """Strip the release train of an Arista EOS version."""
+    return EOS_RELEASE_TRAIN_RE.sub("", version)
+
+
+# Normalizers of the versions of the platforms, by network driver, applied before tokenizing the versions
+VERSION_NORMALIZERS = {
+    "arista_eos": normalize_eos_version,
+}
+
+
+def parse_version(version, network_driver=None):
+    """Return the sort key of the `version` of a platform with `network_driver`.
+
+    Versions are split into their numbers, compared numerically, and their letters, compared case insensitively and
+    ordered before the numbers. Separators are ignored, so Cisco IOS 15.2(4)M3, Cisco NX-OS 9.3(8) and 9.3.8, or
+    Juniper Junos 20.4R3-S1 versions compare as expected, and a version is ordered before its extensions.
+    """
+    version = version.strip().lower()
+    normalize = VERSION_NORMALIZERS.get(network_driver)
+    if normalize is not None:
+        version = normalize(version)
+
+    return tuple((1, int(token)) if token.isdigit() else (0, token) for token in VERSION_TOKEN_RE.findall(version))
+
+
+def get_version_sort_key(version, network_driver=None):
+    """Return the `parse_version` key of `version` encoded as a string sorting in the same order.
+
+    Numbers are zero padded and every token is prefixed by a digit, which sorts before the letters, so the key
+    only holds lowercase letters and digits and sorts the same whatever the collation of the database.
+    """
+    max_number = 10**VERSION_NUMBER_WIDTH - 1
+
+    return "".join(
+        f"1{min(value, max_number):0{VERSION_NUMBER_WIDTH}d}" if kind else f"0{value}"
+        for kind, value in parse_version(version, network_driver)
+    )[:VERSION_SORT_KEY_LENGTH]
@@ -1,20 +1,39 @@
 """Views implementation for the Lifecycle Management app."""
-import base64
-import io
+import csv
 import logging
-import urllib
+from collections import defaultdict
 
-import matplotlib.pyplot as plt
-import numpy as np
+from django.apps import apps
 from django.conf import settings
+from django.contrib.auth.context_processors import PermWrapper
+from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, ExpressionWrapper, F, FloatField, Q
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from django_tables2 import RequestConfig
-from matplotlib.ticker import MaxNLocator
 from nautobot.core.views import generic
-from nautobot.core.views.mixins import ContentTypePermissionRequiredMixin
+from nautobot.core.utils.permissions import get_permission_for_model
+from nautobot.core.views.mixins import ContentTypePermissionRequiredMixin, ObjectPermissionRequiredMixin
 from nautobot.core.views.paginator import EnhancedPaginator, get_paginate_count
+from nautobot.dcim.models import Device, InventoryItem
 
 from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.compliance_history import get_trend
+from nautobot_device_lifecycle_mgmt.charts import (
+    DEVICE_BAR_CHART_ATTRS,
+    INVENTORY_ITEM_BAR_CHART_ATTRS,
+    PIE_CHART_ATTRS,
+    chart_cache,
+    get_barchart_data,
+    get_chart_key,
+    get_piechart_data,
+    get_trend_chart_data,
+    plot_barchart_visual,
+    plot_piechart_visual,
+)
 from nautobot_device_lifecycle_mgmt.filters import (
     DeviceSoftwareValidationResultFilterSet,
     InventoryItemSoftwareValidationResultFilterSet,
@@ -23,12 +42,16 @@ from nautobot_device_lifecycle_mgmt.forms import (
     DeviceSoftwareValidationResultFilterForm,
     InventoryItemSoftwareValidationResultFilterForm,
 )
+from nautobot_device_lifecycle_mgmt.instrumentation import REPORT_QUERIES, REPORT_RENDER_DURATION, observe_render
 from nautobot_device_lifecycle_mgmt.models import (
     DeviceSoftwareValidationResult,
     InventoryItemSoftwareValidationResult,
     SoftwareImageLCM,
     SoftwareLCM,
+    SoftwareValidationSnapshot,
+    SoftwareValidationSummary,
 )
+from nautobot_device_lifecycle_mgmt.report_aggregation import aggregate_validation_results
 from nautobot_device_lifecycle_mgmt.tables import (
     DeviceSoftwareValidationResultListTable,
     DeviceSoftwareValidationResultTable,
@@ -36,16 +59,18 @@ from nautobot_device_lifecycle_mgmt.tables import (
     InventoryItemSoftwareValidationResultTable,
     SoftwareImageLCMTable,
 )
+from nautobot_device_lifecycle_mgmt.template_content import template_extensions
 from nautobot_device_lifecycle_mgmt.utils import count_related_m2m
 
 PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+# Run types of the report jobs, used to find when the reports were last run
+REPORT_RUN_TYPES = (choices.ReportRunTypeChoices.REPORT_FULL_RUN, choices.ReportRunTypeChoices.REPORT_DELTA_RUN)
 
 logger = logging.getLogger("nautobot_device_lifecycle_mgmt")
 
 # ---------------------------------------------------------------------------------
 #  Hardware Lifecycle Management Views
 # ---------------------------------------------------------------------------------
-GREEN, RED, GREY = ("#D5E8D4", "#F8CECC", "#808080")
 
 
 class SoftwareSoftwareImagesLCMView(generic.ObjectView):
@@ -76,6 +101,46 @@ class SoftwareSoftwareImagesLCMView(generic.ObjectView):
         }
 
 
+class LifecyclePanelView(ObjectPermissionRequiredMixin, generic.View):
+    """Lifecycle panel of a core object detail page, loaded by the panel placeholder when lazy loading is enabled."""
+
+    panels = {template_extension.panel_name: template_extension for template_extension in template_extensions}
+    template_extension = None
+    queryset = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Resolve the template extension and the objects of the panel, before the permissions are checked."""
+        self.template_extension = self.panels.get(kwargs["panel"])
+        if self.template_extension is None:
+            raise Http404(f"Unknown lifecycle panel {kwargs['panel']}.")
+        self.queryset = apps.get_model(self.template_extension.model).objects.all()
+
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_required_permission(self):
+        """Return the view permission of the panel objects."""
+        return get_permission_for_model(self.queryset.model, "view")
+
+    def get(self, request, panel, pk):  # pylint: disable=invalid-name, unused-argument
+        """Render the panel content of the object."""
+        # The queryset is restricted to the objects the user can view by ObjectPermissionRequiredMixin
+        obj = get_object_or_404(self.queryset, pk=pk)
+        context = {
+            "object": obj,
+            "request": request,
+            "settings": settings,
+            "csrf_token": get_token(request),
+            "perms": PermWrapper(request.user),
+            "config": PLUGIN_CFG,
+        }
+        response = HttpResponse(self.template_extension(context).render_panel_instrumented(lazy=True))
+        # Panels depend on the permissions of the user, they can only be cached by the browser
+        patch_cache_control(response, private=True, max_age=PLUGIN_CFG.get("panel_cache_timeout", 60))
+        patch_vary_headers(response, ["Cookie"])
+
+        return response
+
+
 class ReportOverviewHelper(ContentTypePermissionRequiredMixin, generic.View):
     """Customized overview view for reports aggregation and filterset."""
 
@@ -85,109 +150,36 @@ class ReportOverviewHelper(ContentTypePermissionRequiredMixin, generic.View):
         return "nautobot_device_lifecycle_mgmt.view_validatedsoftwarelcm"
 
     @staticmethod
-    def url_encode_figure(figure):
-        """Save graph into string buffer and convert 64 bit code into image."""
-        buf = io.BytesIO()
-        figure.savefig(buf, format="png")
-        buf.seek(0)
-        string = base64.b64encode(buf.read())
+    def get_summaries(model):
+        """Return mapping of group to the SoftwareValidationSummary objects of `model`, None if there are none yet."""
+        summaries = defaultdict(list)
+        for summary in SoftwareValidationSummary.objects.filter(content_type=ContentType.objects.get_for_model(model)):
+            summaries[summary.group_by].append(summary)
 
-        return urllib.parse.quote(string)
+        return summaries or None
 
     @staticmethod
-    def plot_piechart_visual(aggr, pie_chart_attrs):
-        """Plot pie chart aggregation visual."""
-        if aggr[pie_chart_attrs["aggr_labels"][0]] is None:
-            return None
-
-        colors = [GREEN, RED, GREY]
-        sizes = []
-        pie_chart_labels = []
-        pie_chart_colors = []
-        for aggr_label, chart_label, color in zip(
-            pie_chart_attrs["aggr_labels"], pie_chart_attrs["chart_labels"], colors
-        ):
-            if aggr[aggr_label] == 0:
-                continue
-            sizes.append(aggr[aggr_label])
-            pie_chart_labels.append(chart_label)
-            pie_chart_colors.append(color)
-
-        explode = len(sizes) * (0.1,)
-        fig1, ax1 = plt.subplots()
-        logging.debug(fig1)
-        ax1.pie(
-            sizes,
-            explode=explode,
-            labels=pie_chart_labels,
-            autopct="%1.1f%%",
-            colors=pie_chart_colors,
-            shadow=True,
-            startangle=90,
-            normalize=True,
+    def get_trend(model):
+        """Return the compliance trend of all objects of `model`, see `get_trend`."""
+        return get_trend(
+            SoftwareValidationSnapshot.objects.filter(
+                content_type=ContentType.objects.get_for_model(model),
+                group_by=choices.ValidationSummaryGroupChoices.ALL,
+            )
         )
-        ax1.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle.
-        plt.title(aggr["name"], y=-0.1)
-        fig = plt.gcf()
-
-        return ReportOverviewHelper.url_encode_figure(fig)
 
     @staticmethod
-    def plot_barchart_visual(qs, chart_attrs):  # pylint: disable=too-many-locals, invalid-name
-        """Construct report visual from queryset."""
-        labels = [item[chart_attrs["label_accessor"]] for item in qs]
-
-        label_locations = np.arange(len(labels))  # the label locations
-
-        barchart_bar_width = PLUGIN_CFG["barchart_bar_width"]
-        barchart_width = PLUGIN_CFG["barchart_width"]
-        barchart_height = PLUGIN_CFG["barchart_height"]
-
-        width = barchart_bar_width  # the width of the bars
-
-        fig, axis = plt.subplots(figsize=(barchart_width, barchart_height))
-
-        rects = []
-        for bar_pos, chart_bar in enumerate(chart_attrs["chart_bars"]):
-            bar_label_item = [item[chart_bar["data_attr"]] for item in qs]
-            rects.append(
-                axis.bar(
-                    label_locations - width + (bar_pos * width),
-                    bar_label_item,
-                    width,
-                    label=chart_bar["label"],
-                    color=chart_bar["color"],
-                )
-            )
-
-        # Add some text for labels, title and custom x-axis tick labels, etc.
-        axis.set_ylabel(chart_attrs["ylabel"])
-        axis.set_title(chart_attrs["title"])
-        axis.set_xticks(label_locations)
-        axis.set_xticklabels(labels, rotation=0)
-        # Force integer y-axis labels
-        axis.yaxis.set_major_locator(MaxNLocator(integer=True))
-        axis.margins(0.2, 0.2)
-        axis.legend()
-
-        def autolabel(rects):
-            """Attach a text label above each bar in *rects*, displaying its height."""
-            for rect in rects:
-                height = rect.get_height()
-                axis.annotate(
-                    f"{height}",
-                    xy=(rect.get_x() + rect.get_width() / 2, 0.5),
-                    xytext=(0, 3),  # 3 points vertical offset
-                    textcoords="offset points",
-                    ha="center",
-                    va="bottom",
-                    rotation=90,
-                )
-
-        for rect in rects:
-            autolabel(rect)
+    def summary_to_aggr(summary, **fields):
+        """Return aggregation dict of the summary counts, with the same keys as the live aggregations."""
+        aggr = {
+            "total": summary.total,
+            "valid": summary.valid,
+            "invalid": summary.invalid,
+            "no_software": summary.no_software,
+        }
+        aggr.update(fields)
 
-        return ReportOverviewHelper.url_encode_figure(fig)
+        return aggr
 
     @staticmethod
     def calculate_aggr_percentage(aggr):
@@ -204,7 +196,103 @@ class ReportOverviewHelper(ContentTypePermissionRequiredMixin, generic.View):
         return aggr
 
 
-class ValidatedSoftwareDeviceReportView(generic.ObjectListView):
+class EchoBuffer:  # pylint: disable=too-few-public-methods
+    """File-like object returning the written value instead of storing it, used to stream `csv.writer` rows."""
+
+    def write(self, value):  # pylint: disable=no-self-use
+        """Return the written value."""
+        return value
+
+
+class ReportCSVExportMixin:
+    """Streams the report as CSV when requested with the `export` query parameter.
+
+    The export starts with the global aggregation of the report, followed by a row per report table row with the
+    columns of the table currently shown to the user. Rows are streamed in chunks, so exports use constant memory.
+    """
+
+    # Name of the global aggregation in `extra_content`
+    csv_aggr_name = None
+    csv_filename = None
+    # Keys of the exported values of the columns whose accessor isn't the exported value
+    csv_accessors = {}
+    csv_exclude_columns = ("pk", "actions")
+    csv_chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        """Stream the CSV export, export templates and the report page are handled by ObjectListView."""
+        if "export" in request.GET and not request.GET.get("export"):
+            return self.export_csv(request)
+
+        return super().get(request, *args, **kwargs)
+
+    def export_csv(self, request):
+        """Return streaming response with the CSV export of the filtered report."""
+        if self.filterset is not None:
+            filterset = self.filterset(self.get_filter_params(request), self.queryset)
+            self.queryset = filterset.qs if filterset.is_valid() else self.queryset.none()
+        rows = self.alter_queryset(request)
+        # The table applies the user's column configuration and the requested ordering
+        table = self.table(rows, user=request.user, order_by=request.GET.getlist("sort"))
+        columns = [
+            (str(column.header), self.csv_accessors.get(column.name, column.accessor or column.name))
+            for column in table.columns
+            if column.name not in self.csv_exclude_columns
+        ]
+        rows = table.data.data
+
+        response = StreamingHttpResponse(
+            self.iter_csv(
+                columns, rows.iterator(chunk_size=self.csv_chunk_size) if isinstance(rows, QuerySet) else rows
+            ),
+            content_type="text/csv",
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{settings.BRANDING_PREPENDED_FILENAME}{self.csv_filename}.csv"'
+
+        return response
+
+    def iter_csv(self, columns, rows):
+        """Yield the CSV lines of the global aggregation and of the `rows` with the `columns` values."""
+        writer = csv.writer(EchoBuffer())
+        aggr = self.extra_content[self.csv_aggr_name]
+        yield writer.writerow(["Type", "Total", "Valid", "Invalid", "No Software", "Compliance (%)"])
+        yield writer.writerow(
+            [aggr.get(key) for key in ("name", "total", "valid", "invalid", "no_software", "valid_percent")]
+        )
+        yield writer.writerow([])
+
+        yield writer.writerow([header for header, _ in columns])
+        for row in rows:
+            # Report rows are dicts of the queryset values or of the summaries
+            yield writer.writerow([self.csv_value(row.get(accessor)) for _, accessor in columns])
+
+    @staticmethod
+    def csv_value(value):
+        """Return the CSV representation of an exported value."""
+        if isinstance(value, float):
+            return round(value, 2)
+
+        return value
+
+
+class ReportMetricsMixin:  # pylint: disable=too-few-public-methods
+    """Observes the render time and number of database queries of the report pages.
+
+    The whole request is observed, the reports are aggregated by the `get` method of the report views.
+    """
+
+    # Value of the `report` label of the metrics
+    metrics_report_name = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Handle the report request, observing its render time and number of queries, aggregation included."""
+        with observe_render(REPORT_RENDER_DURATION, REPORT_QUERIES, self.metrics_report_name):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ValidatedSoftwareDeviceReportView(ReportCSVExportMixin, ReportMetricsMixin, generic.ObjectListView):
     """View for executive report on software Validation."""
 
     filterset = DeviceSoftwareValidationResultFilterSet
@@ -226,13 +314,24 @@ class ValidatedSoftwareDeviceReportView(generic.ObjectListView):
     action_buttons = ("export",)
     # extra content dict to be returned by self.extra_context() method
     extra_content = {}
-
-    def setup(self, request, *args, **kwargs):
-        """Using request object to perform filtering based on query params."""
-        super().setup(request, *args, **kwargs)  #
+    # aggregation of the report results, see `aggregate_validation_results`
+    aggregation = None
+    # groupings of the report, mapping of the grouping name to the fields the results are grouped by
+    report_groupings = {
+        "platform": ("device__platform__name",),
+        "device_type": ("device__device_type__model", "device__device_type__pk"),
+    }
+    csv_aggr_name = "device_aggr"
+    csv_filename = "device_software_validation_report"
+    metrics_report_name = "device"
+
+    def get(self, request, *args, **kwargs):
+        """Aggregate the report, filtered with the query params, and render it."""
+        filter_params = self.get_filter_params(request)
+        self.aggregation = self.get_aggregation(filter_params)
         try:
             report_last_run = (
-                DeviceSoftwareValidationResult.objects.filter(run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN)
+                DeviceSoftwareValidationResult.objects.filter(run_type__in=REPORT_RUN_TYPES)
                 .latest("last_updated")
                 .last_run
             )
@@ -240,101 +339,84 @@ class ValidatedSoftwareDeviceReportView(generic.ObjectListView):
             report_last_run = None
 
         device_aggr = self.get_global_aggr(request)
-        _platform_qs = (
-            DeviceSoftwareValidationResult.objects.values("device__platform__name")
-            .distinct()
-            .annotate(
-                total=Count("device__platform__name"),
-                valid=Count("device__platform__name", filter=Q(is_validated=True)),
-                invalid=Count("device__platform__name", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("device__platform__name", filter=Q(software=None)),
-            )
-            .order_by("-total")
-        )
-        platform_qs = self.filterset(request.GET, _platform_qs).qs
-        pie_chart_attrs = {
-            "aggr_labels": ["valid", "invalid", "no_software"],
-            "chart_labels": ["Valid", "Invalid", "No Software"],
-        }
-        bar_chart_attrs = {
-            "label_accessor": "device__platform__name",
-            "ylabel": "Device",
-            "title": "Valid per Platform",
-            "chart_bars": [
-                {"label": "Valid", "data_attr": "valid", "color": GREEN},
-                {"label": "Invalid", "data_attr": "invalid", "color": RED},
-                {"label": "No Software", "data_attr": "no_software", "color": GREY},
-            ],
-        }
         self.extra_content = {
-            "bar_chart": ReportOverviewHelper.plot_barchart_visual(platform_qs, bar_chart_attrs),
             "device_aggr": device_aggr,
-            "device_visual": ReportOverviewHelper.plot_piechart_visual(device_aggr, pie_chart_attrs),
             "report_last_run": report_last_run,
         }
+        if PLUGIN_CFG.get("client_side_charts", True):
+            self.extra_content["chart_data"] = {
+                "bar_chart": get_barchart_data(self.get_platform_aggr(request), DEVICE_BAR_CHART_ATTRS),
+                "pie_chart": get_piechart_data(device_aggr, PIE_CHART_ATTRS),
+            }
+            # Snapshots are only recorded for all devices
+            if not filter_params:
+                self.extra_content["chart_data"]["trend_chart"] = get_trend_chart_data(
+                    ReportOverviewHelper.get_trend(Device), "Devices"
+                )
+        else:
+            # Charts only change with a new report run
+            self.extra_content["bar_chart"] = chart_cache.get_or_render(
+                get_chart_key("device_platform_barchart", filter_params, report_last_run),
+                lambda: plot_barchart_visual(self.get_platform_aggr(request), DEVICE_BAR_CHART_ATTRS),
+            )
+            self.extra_content["device_visual"] = chart_cache.get_or_render(
+                get_chart_key("device_piechart", filter_params, report_last_run),
+                lambda: plot_piechart_visual(device_aggr, PIE_CHART_ATTRS),
+            )
 
-    def get_global_aggr(self, request):
+        return super().get(request, *args, **kwargs)
+
+    def get_aggregation(self, filter_params):
+        """Get the report aggregation, from the validation summaries when the report isn't filtered."""
+        # Summaries are only aggregated for all devices
+        summaries = None if filter_params else ReportOverviewHelper.get_summaries(Device)
+        if summaries:
+            return {
+                "all": ReportOverviewHelper.summary_to_aggr(summaries[choices.ValidationSummaryGroupChoices.ALL][0]),
+                "platform": [
+                    ReportOverviewHelper.summary_to_aggr(summary, device__platform__name=summary.group_name or None)
+                    for summary in summaries[choices.ValidationSummaryGroupChoices.PLATFORM]
+                ],
+                "device_type": [
+                    ReportOverviewHelper.summary_to_aggr(
+                        summary, device__device_type__model=summary.group_name, device__device_type__pk=summary.group_id
+                    )
+                    for summary in summaries[choices.ValidationSummaryGroupChoices.DEVICE_TYPE]
+                ],
+            }
+
+        filterset = self.filterset(filter_params, DeviceSoftwareValidationResult.objects.all())
+        results_qs = filterset.qs if filterset.is_valid() else filterset.queryset.none()
+        return aggregate_validation_results(results_qs, self.report_groupings)
+
+    def get_platform_aggr(self, request):  # pylint: disable=unused-argument
+        """Get device report per platform."""
+        return sorted(self.aggregation["platform"], key=lambda aggr: aggr["total"], reverse=True)
+
+    def get_global_aggr(self, request):  # pylint: disable=unused-argument
         """Get device and inventory global reports.
 
         Returns:
             device_aggr: device global report dict
         """
-        device_qs = DeviceSoftwareValidationResult.objects
-
-        device_aggr = {}
-        if self.filterset is not None:
-            device_aggr = self.filterset(request.GET, device_qs).qs.aggregate(
-                total=Count("device"),
-                valid=Count("device", filter=Q(is_validated=True)),
-                invalid=Count("device", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("device", filter=Q(software=None)),
-            )
-
-            device_aggr["name"] = "Devices"
+        device_aggr = dict(self.aggregation["all"], name="Devices")
 
         return ReportOverviewHelper.calculate_aggr_percentage(device_aggr)
 
+    def alter_queryset(self, request):
+        """Serve the device type rows from the report aggregation."""
+        device_type_aggr = [
+            dict(aggr, valid_percent=100 * aggr["valid"] / aggr["total"] if aggr["total"] else 0)
+            for aggr in self.aggregation["device_type"]
+        ]
+        return sorted(device_type_aggr, key=lambda aggr: aggr["valid_percent"], reverse=True)
+
     def extra_context(self):
         """Extra content method on."""
         # add global aggregations to extra context.
 
         return self.extra_content
 
-    def queryset_to_csv(self):
-        """Export queryset of objects as comma-separated value (CSV)."""
-        csv_data = []
-
-        csv_data.append(",".join(["Type", "Total", "Valid", "Invalid", "No Software", "Compliance"]))
-        csv_data.append(
-            ",".join(
-                ["Devices"]
-                + [
-                    f"{str(val)} %" if key == "valid_percent" else str(val)
-                    for key, val in self.extra_content["device_aggr"].items()
-                    if key != "name"
-                ]
-            )
-        )
-        csv_data.append(",".join([]))
-
-        qs = self.queryset.values(  # pylint: disable=invalid-name
-            "device__device_type__model", "total", "valid", "invalid", "no_software", "valid_percent"
-        )
-        csv_data.append(
-            ",".join(
-                [
-                    "Device Model" if item == "device__device_type__model" else item.replace("_", " ").title()
-                    for item in qs[0].keys()
-                ]
-            )
-        )
-        for obj in qs:
-            csv_data.append(
-                ",".join([f"{str(val)} %" if key == "valid_percent" else str(val) for key, val in obj.items()])
-            )
-
-        return "\n".join(csv_data)
-
 
 class DeviceSoftwareValidationResultListView(generic.ObjectListView):
     """DeviceSoftawareValidationResult List view."""
@@ -347,7 +429,7 @@ class DeviceSoftwareValidationResultListView(generic.ObjectListView):
     template_name = "nautobot_device_lifecycle_mgmt/devicesoftwarevalidationresult_list.html"
 
 
-class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
+class ValidatedSoftwareInventoryItemReportView(ReportCSVExportMixin, ReportMetricsMixin, generic.ObjectListView):
     """View for executive report on inventory item software validation."""
 
     filterset = InventoryItemSoftwareValidationResultFilterSet
@@ -375,15 +457,22 @@ class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
     action_buttons = ("export",)
     # extra content dict to be returned by self.extra_context() method
     extra_content = {}
-
-    def setup(self, request, *args, **kwargs):
-        """Using request object to perform filtering based on query params."""
-        super().setup(request, *args, **kwargs)
+    # aggregation of the report results, see `aggregate_validation_results`
+    aggregation = None
+    # groupings of the report, mapping of the grouping name to the fields the results are grouped by
+    report_groupings = {"manufacturer": ("inventory_item__manufacturer__name",)}
+    csv_aggr_name = "inventory_aggr"
+    csv_filename = "inventory_item_software_validation_report"
+    csv_accessors = {"device": "inventory_item__device__name"}
+    metrics_report_name = "inventoryitem"
+
+    def get(self, request, *args, **kwargs):
+        """Aggregate the report, filtered with the query params, and render it."""
+        filter_params = self.get_filter_params(request)
+        self.aggregation = self.get_aggregation(filter_params)
         try:
             report_last_run = (
-                InventoryItemSoftwareValidationResult.objects.filter(
-                    run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN
-                )
+                InventoryItemSoftwareValidationResult.objects.filter(run_type__in=REPORT_RUN_TYPES)
                 .latest("last_updated")
                 .last_run
             )
@@ -391,58 +480,62 @@ class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
             report_last_run = None
 
         inventory_aggr = self.get_global_aggr(request)
-        _platform_qs = (
-            InventoryItemSoftwareValidationResult.objects.values("inventory_item__manufacturer__name")
-            .distinct()
-            .annotate(
-                total=Count("inventory_item__manufacturer__name"),
-                valid=Count("inventory_item__manufacturer__name", filter=Q(is_validated=True)),
-                invalid=Count("inventory_item__manufacturer__name", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("inventory_item__manufacturer__name", filter=Q(software=None)),
-            )
-            .order_by("-total")
-        )
-        platform_qs = self.filterset(request.GET, _platform_qs).qs
-
-        pie_chart_attrs = {
-            "aggr_labels": ["valid", "invalid", "no_software"],
-            "chart_labels": ["Valid", "Invalid", "No Software"],
-        }
-        bar_chart_attrs = {
-            "label_accessor": "inventory_item__manufacturer__name",
-            "ylabel": "Inventory Item",
-            "title": "Valid per Manufacturer",
-            "chart_bars": [
-                {"label": "Valid", "data_attr": "valid", "color": GREEN},
-                {"label": "Invalid", "data_attr": "invalid", "color": RED},
-                {"label": "No Software", "data_attr": "no_software", "color": GREY},
-            ],
-        }
-
         self.extra_content = {
-            "bar_chart": ReportOverviewHelper.plot_barchart_visual(platform_qs, bar_chart_attrs),
             "inventory_aggr": inventory_aggr,
-            "inventory_visual": ReportOverviewHelper.plot_piechart_visual(inventory_aggr, pie_chart_attrs),
             "report_last_run": report_last_run,
         }
+        if PLUGIN_CFG.get("client_side_charts", True):
+            self.extra_content["chart_data"] = {
+                "bar_chart": get_barchart_data(self.get_manufacturer_aggr(request), INVENTORY_ITEM_BAR_CHART_ATTRS),
+                "pie_chart": get_piechart_data(inventory_aggr, PIE_CHART_ATTRS),
+            }
+            # Snapshots are only recorded for all inventory items
+            if not filter_params:
+                self.extra_content["chart_data"]["trend_chart"] = get_trend_chart_data(
+                    ReportOverviewHelper.get_trend(InventoryItem), "Inventory Items"
+                )
+        else:
+            self.extra_content["bar_chart"] = chart_cache.get_or_render(
+                get_chart_key("inventoryitem_manufacturer_barchart", filter_params, report_last_run),
+                lambda: plot_barchart_visual(self.get_manufacturer_aggr(request), INVENTORY_ITEM_BAR_CHART_ATTRS),
+            )
+            self.extra_content["inventory_visual"] = chart_cache.get_or_render(
+                get_chart_key("inventoryitem_piechart", filter_params, report_last_run),
+                lambda: plot_piechart_visual(inventory_aggr, PIE_CHART_ATTRS),
+            )
 
-    def get_global_aggr(self, request):
+        return super().get(request, *args, **kwargs)
+
+    def get_aggregation(self, filter_params):
+        """Get the report aggregation, from the validation summaries when the report isn't filtered."""
+        # Summaries are only aggregated for all inventory items
+        summaries = None if filter_params else ReportOverviewHelper.get_summaries(InventoryItem)
+        if summaries:
+            return {
+                "all": ReportOverviewHelper.summary_to_aggr(summaries[choices.ValidationSummaryGroupChoices.ALL][0]),
+                "manufacturer": [
+                    ReportOverviewHelper.summary_to_aggr(
+                        summary, inventory_item__manufacturer__name=summary.group_name or None
+                    )
+                    for summary in summaries[choices.ValidationSummaryGroupChoices.MANUFACTURER]
+                ],
+            }
+
+        filterset = self.filterset(filter_params, InventoryItemSoftwareValidationResult.objects.all())
+        results_qs = filterset.qs if filterset.is_valid() else filterset.queryset.none()
+        return aggregate_validation_results(results_qs, self.report_groupings)
+
+    def get_manufacturer_aggr(self, request):  # pylint: disable=unused-argument
+        """Get inventory item report per manufacturer."""
+        return sorted(self.aggregation["manufacturer"], key=lambda aggr: aggr["total"], reverse=True)
+
+    def get_global_aggr(self, request):  # pylint: disable=unused-argument
         """Get device and inventory global reports.
 
         Returns:
             inventory_aggr: inventory item global report dict
         """
-        inventory_item_qs = InventoryItemSoftwareValidationResult.objects
-
-        inventory_aggr = {}
-        if self.filterset is not None:
-            inventory_aggr = self.filterset(request.GET, inventory_item_qs).qs.aggregate(
-                total=Count("inventory_item"),
-                valid=Count("inventory_item", filter=Q(is_validated=True)),
-                invalid=Count("inventory_item", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("inventory_item", filter=Q(software=None)),
-            )
-            inventory_aggr["name"] = "Inventory Items"
+        inventory_aggr = dict(self.aggregation["all"], name="Inventory Items")
 
         return ReportOverviewHelper.calculate_aggr_percentage(inventory_aggr)
 
@@ -452,49 +545,6 @@ class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
 
         return self.extra_content
 
-    def queryset_to_csv(self):
-        """Export queryset of objects as comma-separated value (CSV)."""
-        csv_data = []
-
-        csv_data.append(",".join(["Type", "Total", "Valid", "Invalid", "No Software", "Compliance"]))
-        csv_data.append(
-            ",".join(
-                ["Inventory Items"]
-                + [
-                    f"{str(val)} %" if key == "valid_percent" else str(val)
-                    for key, val in self.extra_content["inventory_aggr"].items()
-                    if key != "name"
-                ]
-            )
-        )
-        csv_data.append(",".join([]))
-
-        qs = self.queryset.values(  # pylint: disable=invalid-name
-            "inventory_item__part_id",
-            "inventory_item__name",
-            "inventory_item__device__name",
-            "inventory_item__device__pk",
-            "total",
-            "valid",
-            "invalid",
-            "no_software",
-            "valid_percent",
-        )
-        csv_data.append(
-            ",".join(
-                [
-                    "Part ID" if item == "inventory_item__part_id" else item.replace("_", " ").title()
-                    for item in qs[0].keys()
-                ]
-            )
-        )
-        for obj in qs:
-            csv_data.append(
-                ",".join([f"{str(val)} %" if key == "valid_percent" else str(val) for key, val in obj.items()])
-            )
-
-        return "\n".join(csv_data)
-
 
 class InventoryItemSoftwareValidationResultListView(generic.ObjectListView):
     """InvenotryItemSoftawareValidationResult List view."""
@@ -0,0 +1,130 @@
+"""Generation of the VulnerabilityLCM objects of the devices and inventory items running software affected by CVEs."""
+from collections import Counter
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from nautobot_device_lifecycle_mgmt.models import (
+    CVELCM,
+    DeviceSoftwareAssignment,
+    InventoryItemSoftwareAssignment,
+    VulnerabilityLCM,
+)
+
+VULNERABILITY_BATCH_SIZE = 1000
+# Software assignment models, mapped to the field of the vulnerability target they assign software to
+ASSIGNMENT_TARGET_FIELDS = {
+    DeviceSoftwareAssignment: "device",
+    InventoryItemSoftwareAssignment: "inventory_item",
+}
+
+
+def get_missing_vulnerabilities(cves_qs, assignment_model, changed_since=None):
+    """Return the (cve, software, target) primary keys of the vulnerabilities missing for `cves_qs`.
+
+    The triples are computed by a single query joining the software affected by the CVEs to the software assignments
+    of `assignment_model`, excluding the existing vulnerabilities. With `changed_since` only the CVEs and the
+    assignments updated since then are joined, CVEs are updated when their affected softwares change.
+    """
+    target_field = ASSIGNMENT_TARGET_FIELDS[assignment_model]
+    existing_vulnerabilities = VulnerabilityLCM.objects.filter(
+        cve=OuterRef("software__corresponding_cves"),
+        software=OuterRef("software"),
+        **{target_field: OuterRef(target_field)},
+    )
+    assignment_filter = Q(software__corresponding_cves__in=cves_qs)
+    if changed_since is not None:
+        assignment_filter &= Q(software__corresponding_cves__last_updated__gte=changed_since) | Q(
+            last_updated__gte=changed_since
+        )
+
+    return (
+        assignment_model.objects.filter(assignment_filter)
+        .exclude(Exists(existing_vulnerabilities))
+        .order_by()
+        .values_list("software__corresponding_cves", "software", target_field)
+    )
+
+
+def get_stale_vulnerabilities(cves_qs, changed_since=None):
+    """Return the vulnerabilities of `cves_qs` whose software is no longer affected by the CVE or no longer assigned.
+
+    With `changed_since` only the CVEs updated since then are checked for unaffected software. Deleted software
+    assignments leave no trace, so the vulnerabilities of all `cves_qs` are checked for unassigned software.
+    """
+    changed_cves_qs = cves_qs if changed_since is None else cves_qs.filter(last_updated__gte=changed_since)
+    affected_software = CVELCM.affected_softwares.through.objects.filter(
+        cvelcm=OuterRef("cve"), softwarelcm=OuterRef("software")
+    )
+    stale = Q(cve__in=changed_cves_qs) & ~Exists(affected_software)
+    for assignment_model, target_field in ASSIGNMENT_TARGET_FIELDS.items():
+        assignment = assignment_model.objects.filter(
+            software=OuterRef("software"), **{target_field: OuterRef(target_field)}
+        )
+        stale |= Q(**{f"{target_field}__isnull": False}) & ~Exists(assignment)
+
+    # Vulnerabilities without software were not generated, they're left alone
+    return VulnerabilityLCM.objects.filter(cve__in=cves_qs, software__isnull=False).filter(stale)
+
+
+def insert_vulnerabilities(batch):
+    """Insert the `batch` of vulnerabilities ignoring conflicts.
+
+    Returns:
+        Counter: Number of vulnerabilities inserted per CVE primary key, without the conflicting ones
+    """
+    if not batch:
+        return Counter()
+    VulnerabilityLCM.objects.bulk_create(batch, ignore_conflicts=True)
+    # Conflicting vulnerabilities are skipped silently, only the inserted ones are stored with their primary key
+    inserted_pks = set(
+        VulnerabilityLCM.objects.filter(pk__in=[vulnerability.pk for vulnerability in batch]).values_list(
+            "pk", flat=True
+        )
+    )
+
+    return Counter(vulnerability.cve_id for vulnerability in batch if vulnerability.pk in inserted_pks)
+
+
+def generate_vulnerabilities(cves_qs, changed_since=None, batch_size=VULNERABILITY_BATCH_SIZE):
+    """Create the missing vulnerabilities of the devices and inventory items running software affected by `cves_qs`.
+
+    Vulnerabilities are inserted in batches ignoring conflicts, so vulnerabilities created concurrently are skipped
+    and not counted.
+
+    Args:
+        cves_qs (QuerySet): CVEs whose vulnerabilities are generated
+        changed_since (datetime): Only generate the vulnerabilities of the CVEs and the software assignments updated
+            since then, defaults to all of them
+        batch_size (int): Number of vulnerabilities inserted per query
+
+    Returns:
+        Counter: Number of vulnerabilities created per CVE primary key
+    """
+    created = Counter()
+    for assignment_model, target_field in ASSIGNMENT_TARGET_FIELDS.items():
+        batch = []
+        missing_vulnerabilities = get_missing_vulnerabilities(cves_qs, assignment_model, changed_since=changed_since)
+        for cve_id, software_id, target_id in missing_vulnerabilities.iterator(chunk_size=batch_size):
+            batch.append(VulnerabilityLCM(cve_id=cve_id, software_id=software_id, **{f"{target_field}_id": target_id}))
+            if len(batch) >= batch_size:
+                created += insert_vulnerabilities(batch)
+                batch = []
+        created += insert_vulnerabilities(batch)
+
+    return created
+
+
+def retire_stale_vulnerabilities(cves_qs, status, changed_since=None):
+    """Set the `status` of the stale vulnerabilities of `cves_qs`, see `get_stale_vulnerabilities`.
+
+    Stale vulnerabilities are kept with their notes and history, vulnerabilities already in `status` are skipped.
+
+    Returns:
+        int: Number of retired vulnerabilities
+    """
+    return (
+        get_stale_vulnerabilities(cves_qs, changed_since=changed_since)
+        .exclude(status=status)
+        .update(status=status, last_updated=timezone.now())
+    )
@@ -724,6 +724,37 @@ def check_migrations(context):
     run_command(context, command)
 
 
+@task(
+    help={
+        "runs": "Number of processes measured.",
+        "max_import_seconds": "Fail if the median import time of the app is higher.",
+        "max_rss_mb": "Fail if the median resident memory after startup is higher.",
+    }
+)
+def benchmark_startup(context, runs=5, max_import_seconds=0.0, max_rss_mb=0.0):
+    """Benchmark the import time and resident memory of the app on startup."""
+    command = f"python development/benchmark_startup.py --runs {runs}"
+    if max_import_seconds:
+        command += f" --max-import-seconds {max_import_seconds}"
+    if max_rss_mb:
+        command += f" --max-rss-mb {max_rss_mb}"
+
+    run_command(context, command)
+
+
+@task(
+    help={
+        "inventory_items": "Number of inventory items of the synthetic dataset.",
+        "runs": "Number of collections measured.",
+    }
+)
+def benchmark_metrics(context, inventory_items=200000, runs=5):
+    """Benchmark the collection of the hardware end of support metrics over a synthetic dataset."""
+    command = f"python development/benchmark_metrics.py --inventory-items {inventory_items} --runs {runs}"
+
+    run_command(context, command)
+
+
 @task(
     help={
         "keepdb": "save and re-use test database between test runs for faster re-testing.",